@@ -105,15 +105,6 @@ function setStatus(element, message, kind = "muted") {
   if (kind === "success") element.classList.add("success");
 }
 
-function formatPhoneDisplay(phone) {
-  if (!phone) return null;
-  const digits = phone.replace(/[^\d]/g, "");
-  if (digits.length === 11 && digits.startsWith("1")) {
-    return `(${digits.slice(1, 4)}) ${digits.slice(4, 7)}-${digits.slice(7)}`;
-  }
-  return phone;
-}
-
 // Avatar color palette (same as macOS app)
 const AVATAR_COLORS = ["#2563EB", "#4ECDC4", "#FF6B6B", "#95E1D3", "#FFE66D", "#A78BFA"];
 
@@ -474,107 +465,34 @@ function formatShortLabel(label) {
   return text.slice(0, 9) + "\u2026";
 }
 
-function generateGroupName(members, myId) {
-  const others = members.filter((m) => m.id !== myId);
-  if (others.length === 0) return "Group Chat";
-  if (others.length <= 2) return others.map((m) => m.name?.split(" ")[0] || "?").join(" & ");
-  const first = others.slice(0, 2).map((m) => m.name?.split(" ")[0] || "?");
-  return `${first.join(", ")} & ${others.length - 2} other${others.length - 2 > 1 ? "s" : ""}`;
-}
-
 async function loadGraphData() {
-  const { data: userData } = await sb.auth.getUser();
-  const authUserId = userData?.user?.id;
-  if (!authUserId) throw new Error("No authenticated user.");
-
-  const centerLabel = state.profile?.name || state.profile?.phone_number || "You";
-
-  // Single RPC call (SECURITY DEFINER function — bypasses RLS)
-  const { data: graphData, error: rpcError } = await sb.rpc("get_connection_graph");
-  if (rpcError) throw new Error(`Graph RPC failed: ${rpcError.message}`);
-  if (!graphData) return { nodes: [], links: [], stats: { directCount: 0, groupCount: 0 } };
-
-  const { chats = [], participants = [], users = [] } = graphData;
-
-  if (chats.length === 0) {
-    return { nodes: [], links: [], stats: { directCount: 0, groupCount: 0 } };
-  }
-
-  const directChats = chats.filter((c) => (c.member_count || 0) <= 2);
-  const multiGroups = chats.filter((c) => (c.member_count || 0) > 2);
-
-  // Build participant map: chat_guid → [user_id, ...]
-  const chatMembersMap = new Map();
-  for (const p of participants) {
-    if (!chatMembersMap.has(p.chat_guid)) chatMembersMap.set(p.chat_guid, []);
-    chatMembersMap.get(p.chat_guid).push(p.user_id);
-  }
-
-  // Build user name map
-  const nameMap = new Map();
-  for (const user of users) {
-    nameMap.set(user.id, { name: user.name || formatPhoneDisplay(user.phone_number) || "Unknown", id: user.id });
-  }
+  const { data: sessionData } = await sb.auth.getSession();
+  const accessToken = sessionData?.session?.access_token;
+  if (!accessToken) throw new Error("No authenticated user.");
 
-  // Build nodes & links
-  const nodes = [
-    { id: "me", type: "user", label: centerLabel, shortLabel: formatShortLabel(centerLabel), radius: 44 },
-  ];
-  const addedUserNodes = new Set(["me"]);
-  const links = [];
-
-  // 1:1 connections (member_count <= 2): direct link from me → other user
-  const directConnectionIds = new Set();
-  for (const chat of directChats) {
-    const members = chatMembersMap.get(chat.chat_guid) || [];
-    for (const uid of members) {
-      if (uid !== authUserId) directConnectionIds.add(uid);
-    }
+  // Nodes and links are built (and cached per user) by the API
+  const res = await fetch("/graph", {
+    headers: { Authorization: `Bearer ${accessToken}` },
+  });
+  if (!res.ok) {
+    const body = await res.json().catch(() => ({}));
+    throw new Error(body.detail || body.error || `Failed to load connections (${res.status}).`);
   }
+  const graph = await res.json();
 
-  for (const uid of directConnectionIds) {
-    const info = nameMap.get(uid);
-    const label = info?.name || "Unknown";
-    nodes.push({ id: String(uid), type: "user", label, shortLabel: formatShortLabel(label), radius: 34 });
-    addedUserNodes.add(String(uid));
-    links.push({ source: "me", target: String(uid), type: "direct" });
+  const { directCount, groupCount } = graph.stats;
+  if (directCount === 0 && groupCount === 0) {
+    return { nodes: [], links: [], stats: { directCount: 0, groupCount: 0 } };
   }
 
-  // Multi-person groups (member_count > 2): group node + links from each member
-  for (const group of multiGroups) {
-    const memberIds = chatMembersMap.get(group.chat_guid) || [];
-    for (const uid of memberIds) {
-      if (uid === authUserId) continue;
-      if (addedUserNodes.has(String(uid))) continue;
-      const info = nameMap.get(uid);
-      const label = info?.name || "Unknown";
-      nodes.push({ id: String(uid), type: "user", label, shortLabel: formatShortLabel(label), radius: 34 });
-      addedUserNodes.add(String(uid));
-    }
-
-    const members = memberIds.map((uid) => nameMap.get(uid) || { id: uid, name: "Unknown" });
-    const groupLabel = group.display_name || generateGroupName(members, authUserId);
-    const groupNodeId = `group-${group.chat_guid}`;
-    nodes.push({
-      id: groupNodeId,
-      type: "group",
-      label: groupLabel,
-      shortLabel: formatShortLabel(groupLabel),
-      radius: 28,
-      memberCount: group.member_count,
-    });
-
-    for (const uid of memberIds) {
-      const nodeId = uid === authUserId ? "me" : String(uid);
-      links.push({ source: nodeId, target: groupNodeId, type: "group" });
-    }
-  }
+  const centerLabel = state.profile?.name || state.profile?.phone_number || null;
+  const nodes = graph.nodes.map((node) => {
+    const label = node.id === "me" ? centerLabel || node.label : node.label;
+    const radius = node.id === "me" ? 44 : node.type === "group" ? 28 : 34;
+    return { ...node, label, shortLabel: formatShortLabel(label), radius };
+  });
 
-  return {
-    nodes,
-    links,
-    stats: { directCount: directConnectionIds.size, groupCount: multiGroups.length },
-  };
+  return { nodes, links: graph.links, stats: { directCount, groupCount } };
 }
 
 function renderGraph(nodes, links) {
@@ -598,6 +516,16 @@ function renderGraph(nodes, links) {
     centerNode.fy = height / 2;
   }
 
+  // Positions laid out by the API are relative to the center node; start
+  // there and let the simulation only settle
+  const hasLayout = nodes.length > 1 && nodes.every((d) => d.x != null && d.y != null);
+  if (hasLayout) {
+    for (const d of nodes) {
+      d.x += width / 2;
+      d.y += height / 2;
+    }
+  }
+
   // Defs
   const defs = svg.append("defs");
 
@@ -642,6 +570,7 @@ function renderGraph(nodes, links) {
       .strength(0.8))
     .force("x", d3.forceX(width / 2).strength(0.03))
     .force("y", d3.forceY(height / 2).strength(0.03))
+    .alpha(hasLayout ? 0.05 : 1)
     .alphaDecay(0.025)
     .alphaMin(0.001)
     .velocityDecay(0.35);
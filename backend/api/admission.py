@@ -0,0 +1,144 @@
+"""
+In-process admission control: token-bucket rate limits and concurrency
+limits with load shedding.
+
+Each worker enforces its own limits; nothing is shared across processes,
+so effective limits scale with the worker count. Everything runs on the
+event loop thread, so the state needs no locks.
+
+A request that can't be admitted raises ``Rejected``, which carries the
+HTTP status (429 for rate limits, 503 for shedding), a ``Retry-After``
+hint and a reason for metrics.
+"""
+
+import asyncio
+import math
+import time
+from collections import OrderedDict
+
+
+class Rejected(Exception):
+    def __init__(self, status_code: int, reason: str, retry_after: float):
+        super().__init__(f"{reason} (retry after {retry_after:.1f}s)")
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class RateLimiter:
+    """
+    Token bucket per key: ``rate`` tokens/second, up to ``burst`` saved up.
+
+    Buckets live in a bounded LRU map. Evicting an idle key only forgets a
+    bucket that would have refilled anyway, unless the map is too small for
+    the number of active keys.
+    """
+
+    def __init__(self, rate: float, burst: float, max_keys: int = 10000):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()  # key -> [tokens, updated_at]
+
+    def acquire(self, key) -> float:
+        """Take a token for key; 0.0 if allowed, else seconds until one is available."""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [self.burst, now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / self.rate
+
+
+class ConcurrencyLimiter:
+    """
+    At most ``limit`` requests in progress; the rest wait in FIFO order.
+
+    A request is shed up front if the expected wait (queue length times the
+    recent average service time, spread over the slots) is over
+    ``latency_budget``, and shed after waiting if it still hasn't got a
+    slot when the budget runs out.
+    """
+
+    # Weight of the newest sample in the service-time average
+    SMOOTHING = 0.2
+
+    def __init__(self, limit: int, latency_budget: float):
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.limit = limit
+        self.latency_budget = latency_budget
+        self.in_flight = 0
+        self.waiting = 0
+        self.avg_service_seconds = 0.0
+        self._waiters = []  # futures, FIFO
+
+    def expected_wait(self) -> float:
+        if self.in_flight < self.limit:
+            return 0.0
+        return (self.waiting + 1) * self.avg_service_seconds / self.limit
+
+    async def acquire(self) -> float:
+        """Wait for a slot; returns the time waited. Raises Rejected when shed."""
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return 0.0
+
+        expected = self.expected_wait()
+        if expected > self.latency_budget:
+            raise Rejected(503, "queue_full", expected)
+
+        started = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.latency_budget)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # Granted just as the budget ran out; take the slot
+                return time.monotonic() - started
+            waiter.cancel()
+            raise Rejected(503, "queue_timeout", max(self.expected_wait(), self.avg_service_seconds))
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release_slot()
+            else:
+                waiter.cancel()
+            raise
+        finally:
+            self.waiting -= 1
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+        return time.monotonic() - started
+
+    def release(self, service_seconds: float) -> None:
+        if self.avg_service_seconds:
+            self.avg_service_seconds += self.SMOOTHING * (service_seconds - self.avg_service_seconds)
+        else:
+            self.avg_service_seconds = service_seconds
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        # Hand the slot straight to the next live waiter, if any
+        while self._waiters:
+            waiter = self._waiters.pop(0)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
@@ -0,0 +1,97 @@
+"""
+In-process caches for the API.
+
+Each worker keeps its own cache; nothing here is shared across processes.
+"""
+
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries expire after a TTL.
+
+    An entry is *fresh* for ``ttl`` seconds after it was stored. For a further
+    ``stale_ttl`` seconds it is still returned (flagged as stale) so callers
+    can serve it immediately while refreshing it in the background. After
+    that it is dropped.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float = 0.0):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries = OrderedDict()  # key -> (value, stored_at)
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return self.lookup(key, count=False) is not None
+
+    def lookup(self, key, count: bool = True):
+        """
+        Return ``(value, fresh)`` for ``key``, or ``None`` if it is missing
+        or past its stale window.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            if count:
+                self.misses += 1
+            return None
+
+        value, stored_at = entry
+        age = time.monotonic() - stored_at
+        if age > self.ttl + self.stale_ttl:
+            del self._entries[key]
+            if count:
+                self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        fresh = age <= self.ttl
+        if count:
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+        return value, fresh
+
+    def get(self, key, default=None):
+        """Return the value for ``key`` if it is still fresh."""
+        found = self.lookup(key)
+        if found is None or not found[1]:
+            return default
+        return found[0]
+
+    def set(self, key, value) -> None:
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key, default=None):
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,39 @@
+"""
+Data-access helpers that keep blocking client calls off the event loop.
+
+The supabase-py/postgrest clients and google-auth-oauthlib's token exchange
+are synchronous and network-bound. Calling them directly inside an
+``async def`` route freezes the whole uvicorn event loop for a full round
+trip, so every call goes through a bounded thread pool instead.
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from . import metrics
+except ImportError:
+    import metrics
+
+# Upper bound on concurrently in-flight blocking calls per worker. Requests
+# beyond this queue for a thread instead of opening more connections.
+BLOCKING_IO_THREADS = int(os.getenv("BLOCKING_IO_THREADS", "16"))
+
+_executor = ThreadPoolExecutor(
+    max_workers=BLOCKING_IO_THREADS,
+    thread_name_prefix="blocking-io",
+)
+
+
+async def run_blocking(fn, *args, **kwargs):
+    """Run a blocking callable in the shared pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+
+async def execute(query):
+    """Execute a supabase/postgrest query builder without blocking the loop."""
+    with metrics.track("supabase", metrics.postgrest_operation(query)):
+        return await run_blocking(query.execute)
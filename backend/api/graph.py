@@ -0,0 +1,95 @@
+"""
+Connection graph: turns the ``get_connection_graph_for`` RPC result into
+ready-to-draw nodes and links.
+
+The shape matches what the account and dashboard pages draw with d3:
+
+    nodes: {"id", "type": "user" | "group", "label", "memberCount"?}
+    links: {"source", "target", "type": "direct" | "group"}
+
+The signed-in user is the node ``"me"``. Chats with at most two members
+are 1:1 connections (a direct link from me); larger chats become a group
+node linked to each member. Output is sorted, so the same data always
+serializes to the same bytes (and ETag).
+"""
+
+import re
+
+ME = "me"
+
+
+def format_phone_display(phone: str | None) -> str | None:
+    """+1XXXXXXXXXX -> (XXX) XXX-XXXX; other numbers unchanged."""
+    if not phone:
+        return None
+    digits = re.sub(r"\D", "", phone)
+    if len(digits) == 11 and digits.startswith("1"):
+        return f"({digits[1:4]}) {digits[4:7]}-{digits[7:]}"
+    return phone
+
+
+def display_name(user: dict | None) -> str:
+    if not user:
+        return "Unknown"
+    return user.get("name") or format_phone_display(user.get("phone_number")) or "Unknown"
+
+
+def group_name(member_names: list[str]) -> str:
+    """Fallback label for a group without a display name, from the other members."""
+    if not member_names:
+        return "Group Chat"
+    first_names = [name.split(" ")[0] or "?" for name in member_names]
+    if len(first_names) <= 2:
+        return " & ".join(first_names)
+    others = len(first_names) - 2
+    return f"{', '.join(first_names[:2])} & {others} other{'s' if others > 1 else ''}"
+
+
+def build_graph(data: dict | None, user_id: str) -> dict:
+    """Nodes, links and counts for user_id from the RPC's chats/participants/users."""
+    data = data or {}
+    users = {str(u["id"]): u for u in data.get("users") or []}
+    members = {}
+    for p in data.get("participants") or []:
+        members.setdefault(p["chat_guid"], []).append(str(p["user_id"]))
+    chats = sorted(data.get("chats") or [], key=lambda c: str(c["chat_guid"]))
+
+    me = users.get(user_id) or {}
+    me_label = me.get("name") or format_phone_display(me.get("phone_number")) or "You"
+    nodes = [{"id": ME, "type": "user", "label": me_label}]
+    links = []
+    user_nodes = set()
+
+    direct = set()
+    groups = []
+    for chat in chats:
+        if (chat.get("member_count") or 0) <= 2:
+            direct.update(uid for uid in members.get(chat["chat_guid"], ()) if uid != user_id)
+        else:
+            groups.append(chat)
+
+    for uid in sorted(direct):
+        nodes.append({"id": uid, "type": "user", "label": display_name(users.get(uid))})
+        links.append({"source": ME, "target": uid, "type": "direct"})
+        user_nodes.add(uid)
+
+    for chat in groups:
+        member_ids = sorted(set(members.get(chat["chat_guid"], ())))
+        for uid in member_ids:
+            if uid != user_id and uid not in user_nodes:
+                nodes.append({"id": uid, "type": "user", "label": display_name(users.get(uid))})
+                user_nodes.add(uid)
+
+        group_id = f"group-{chat['chat_guid']}"
+        label = chat.get("display_name") or group_name(
+            [display_name(users.get(uid)) for uid in member_ids if uid != user_id]
+        )
+        nodes.append({"id": group_id, "type": "group", "label": label, "memberCount": chat.get("member_count")})
+        for uid in member_ids:
+            links.append({"source": ME if uid == user_id else uid, "target": group_id, "type": "group"})
+
+    return {
+        "nodes": nodes,
+        "links": links,
+        "stats": {"directCount": len(direct), "groupCount": len(groups)},
+    }
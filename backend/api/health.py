@@ -0,0 +1,103 @@
+"""
+Background readiness probe with a cached result.
+
+``/health/ready`` must answer instantly even when a dependency is slow, so
+it never checks anything itself: it reads the last result of a probe that
+runs on a schedule. The probe loop is started by the FastAPI lifespan; on
+runtimes that skip lifespan events, a read of a stale result schedules a
+single refresh in the background and still returns the cached value.
+"""
+
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ReadinessProbe:
+    """
+    Runs ``check`` (an async callable that raises on failure) periodically.
+
+    Ready means the last success is at most ``max_age`` seconds old, so one
+    failed probe between two good ones doesn't flap the result.
+    """
+
+    def __init__(self, name: str, check, interval: float, timeout: float, max_age: float):
+        self.name = name
+        self.check = check
+        self.interval = interval
+        self.timeout = timeout
+        self.max_age = max_age
+
+        self.last_checked = None     # time.time() of the last completed probe
+        self.last_success = None     # time.time() of the last successful probe
+        self.latency_seconds = None  # of the last completed probe
+        self.last_error = None
+        self.consecutive_failures = 0
+
+        self._task = None
+        self._refreshing = None
+
+    async def probe_once(self) -> None:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.check(), timeout=self.timeout)
+        except Exception as e:
+            self.consecutive_failures += 1
+            self.last_error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+            if self.consecutive_failures == 1:
+                logger.warning(f"Readiness probe {self.name} failed: {self.last_error}")
+        else:
+            if self.consecutive_failures:
+                logger.info(f"Readiness probe {self.name} recovered after {self.consecutive_failures} failures")
+            self.consecutive_failures = 0
+            self.last_error = None
+            self.last_success = time.time()
+        finally:
+            self.latency_seconds = time.perf_counter() - started
+            self.last_checked = time.time()
+
+    async def _run(self) -> None:
+        while True:
+            await self.probe_once()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"readiness-probe-{self.name}")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def refresh_if_stale(self) -> None:
+        """Without a running loop, schedule one background probe when the result is old."""
+        if self._task is not None and not self._task.done():
+            return
+        if self._refreshing is not None and not self._refreshing.done():
+            return
+        if self.last_checked is not None and time.time() - self.last_checked < self.interval:
+            return
+        self._refreshing = asyncio.create_task(self.probe_once(), name=f"readiness-refresh-{self.name}")
+
+    @property
+    def ready(self) -> bool:
+        return self.last_success is not None and time.time() - self.last_success <= self.max_age
+
+    def snapshot(self) -> dict:
+        now = time.time()
+        return {
+            "ready": self.ready,
+            "last_checked_seconds_ago": None if self.last_checked is None else round(now - self.last_checked, 3),
+            "last_success_seconds_ago": None if self.last_success is None else round(now - self.last_success, 3),
+            "last_success_at": self.last_success,
+            "latency_ms": None if self.latency_seconds is None else round(self.latency_seconds * 1000, 3),
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,139 @@
+"""
+Application-wide pooled HTTP client for outbound calls (Supabase Admin API).
+
+One ``httpx.AsyncClient`` is shared by every request so connections (and
+their TLS sessions) are kept alive and reused instead of paying a fresh
+TCP + TLS handshake per call. It is opened/closed by the FastAPI lifespan
+and created lazily on first use for runtimes that skip lifespan events.
+
+httpx itself is imported on first use too, to keep it out of cold starts
+that never make an outbound call. ``http_client.HTTPError`` resolves to
+``httpx.HTTPError`` (importing httpx at that point) for except clauses.
+"""
+
+import importlib.util
+import logging
+import os
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "50"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "5"))
+HTTP2 = os.getenv("HTTP2", "false").lower() in ("1", "true", "yes")
+
+_client: "httpx.AsyncClient | None" = None
+
+
+class PoolStats:
+    """
+    Connection-pool counters.
+
+    Pool wait is the time from handing a request to the pool until it gets
+    a connection: either a new connection starts connecting or an idle one
+    starts sending. High values mean the pool limits are too tight.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float, new_connection: bool) -> None:
+        self.requests += 1
+        self.wait_seconds_total += seconds
+        if seconds > self.wait_seconds_max:
+            self.wait_seconds_max = seconds
+        if new_connection:
+            self.new_connections += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.requests - self.new_connections,
+            "pool_wait_seconds_total": round(self.wait_seconds_total, 6),
+            "pool_wait_seconds_max": round(self.wait_seconds_max, 6),
+            "http2": _http2_enabled(),
+        }
+
+
+pool_stats = PoolStats()
+
+
+class _PoolWaitTracer:
+    """httpcore trace hook that measures the wait for a pooled connection."""
+
+    __slots__ = ("started", "done")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.done = False
+
+    async def __call__(self, event_name: str, info: dict) -> None:
+        if self.done:
+            return
+        if event_name == "connection.connect_tcp.started":
+            new_connection = True
+        elif event_name.endswith(".send_request_headers.started"):
+            new_connection = False
+        else:
+            return
+        self.done = True
+        pool_stats.record_wait(time.perf_counter() - self.started, new_connection)
+
+
+async def _trace_pool_wait(request: "httpx.Request") -> None:
+    request.extensions["trace"] = _PoolWaitTracer()
+
+
+def _http2_enabled() -> bool:
+    return HTTP2 and importlib.util.find_spec("h2") is not None
+
+
+def get_client() -> "httpx.AsyncClient":
+    """Return the shared client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        import httpx
+
+        if HTTP2 and not _http2_enabled():
+            logger.warning("HTTP2 requested but the 'h2' package is not installed; using HTTP/1.1")
+        _client = httpx.AsyncClient(
+            http2=_http2_enabled(),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                HTTP_TIMEOUT,
+                connect=HTTP_CONNECT_TIMEOUT,
+                pool=HTTP_POOL_TIMEOUT,
+            ),
+            event_hooks={"request": [_trace_pool_wait]},
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def __getattr__(name: str):
+    if name == "HTTPError":
+        import httpx
+        return httpx.HTTPError
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
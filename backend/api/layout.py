@@ -0,0 +1,267 @@
+"""
+Force-directed layout for the connection graph, vectorized with NumPy.
+
+Positions are computed once per graph version on the server, so the pages
+start the d3 simulation at (near) equilibrium instead of from scratch. The
+forces mirror the account page's simulation: springs along links (160px to
+a 1:1 connection, 120px to a group), many-body repulsion, collision with
+32px padding and a weak pull to the centre, where ``me`` is pinned at
+(0, 0).
+
+Each iteration moves every node at once along the sum of its forces,
+capped by a temperature that cools to zero (Fruchterman-Reingold). Small
+graphs use all pairs for repulsion. Larger ones split it: exact forces
+between nodes in neighbouring grid cells one collision diameter wide, and
+a coarse grid whose cells act on each other through their centroids, so
+an iteration stays roughly linear in the node count.
+
+Given the previous layout of the same graph, existing nodes keep their
+positions and only new nodes (and their neighbours) move. Results are
+deterministic for the same input.
+
+NumPy is imported on first use.
+"""
+
+import hashlib
+import math
+
+ME = "me"
+RADIUS = {"me": 44.0, "user": 34.0, "group": 28.0}
+LINK_DISTANCE = {"direct": 160.0, "group": 120.0}
+CHARGE = {"me": 400.0, "user": 400.0, "group": 300.0}
+COLLIDE_PADDING = 32.0
+SPRING_STRENGTH = 0.4
+GRAVITY = 0.03
+
+COLD_ITERATIONS = 150
+WARM_ITERATIONS = 50
+# Largest step, in px, on the first iteration
+COLD_TEMPERATURE = 160.0
+WARM_TEMPERATURE = 80.0
+# Warm-start only while at most this share of the nodes is new
+WARM_START_MAX_NEW = 0.25
+# Up to this many nodes, every pair repels exactly
+ALL_PAIRS_MAX_NODES = 64
+# Springs to a hub with more links than this weaken as 1/sqrt(degree), or a
+# big network's hundreds of springs would crush the disc around it
+SPRING_FULL_DEGREE = 16
+KEY_STRIDE = 1 << 32
+FULL_NEIGHBOURHOOD = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+HALF_NEIGHBOURHOOD = [(0, 0), (0, 1), (1, -1), (1, 0), (1, 1)]
+# Coarse cells for the far field (cell-to-cell, so this squared per iteration)
+FAR_FIELD_CELLS = 256
+# Disc spacing for initial positions: about one collision diameter apart
+INITIAL_SPACING = 2 * (RADIUS["user"] + COLLIDE_PADDING) / math.sqrt(math.pi) * 1.2
+
+
+def _seed(node_ids: list[str]) -> int:
+    return int.from_bytes(hashlib.sha256("\0".join(node_ids).encode("utf-8")).digest()[:8], "little")
+
+
+def _sunflower(np, count: int, start: int):
+    """Evenly spread points on a disc around the origin, continuing from index start."""
+    i = np.arange(start, start + count, dtype=np.float64) + 0.5
+    r = INITIAL_SPACING * np.sqrt(i)
+    theta = i * math.pi * (3 - math.sqrt(5))
+    return np.column_stack((r * np.cos(theta), r * np.sin(theta)))
+
+
+def _segments(np, starts, counts):
+    """Concatenated ranges start .. start + count, vectorized."""
+    total = int(counts.sum())
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(starts, counts) + offsets
+
+
+def _pair_forces(np, pos, i, j, charges, reach, symmetric: bool):
+    """Repulsion and collision between node pairs, summed per node as an (n, 2) array."""
+    n = len(pos)
+    delta = pos[i] - pos[j]
+    dist2 = np.einsum("ij,ij->i", delta, delta) + 1e-6
+    dist = np.sqrt(dist2)
+    # Overlapping circles push apart by half the overlap each
+    collide = np.maximum(reach[i] + reach[j] - dist, 0.0) * (0.5 / dist)
+    on_i = charges[j] / dist2 + collide
+    disp = np.column_stack([np.bincount(i, delta[:, axis] * on_i, minlength=n) for axis in (0, 1)])
+    if symmetric:
+        on_j = charges[i] / dist2 + collide
+        disp -= np.column_stack([np.bincount(j, delta[:, axis] * on_j, minlength=n) for axis in (0, 1)])
+    return disp
+
+
+def _cells(np, pos, cell_size: float):
+    """Bucket nodes into square cells: (cell coords, keys, occupied keys, order, starts, counts)."""
+    cells = np.floor(pos / cell_size).astype(np.int64)
+    keys = cells[:, 0] * KEY_STRIDE + cells[:, 1]
+    order = np.argsort(keys, kind="stable")
+    occupied, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+    return cells, keys, occupied, order, starts, counts
+
+
+def _repulsion(np, pos, rows, charges, reach):
+    """Many-body plus collision displacement, as an (n, 2) array (only rows are meaningful)."""
+    n = len(pos)
+    if n <= ALL_PAIRS_MAX_NODES:
+        i = np.repeat(rows, n)
+        j = np.tile(np.arange(n), len(rows))
+        keep = i != j
+        return _pair_forces(np, pos, i[keep], j[keep], charges, reach, symmetric=False)
+
+    # Near field: exact pairs between nodes in neighbouring cells one
+    # collision diameter wide. When every node moves, each unordered pair is
+    # visited once and applied both ways.
+    _, keys, occupied, order, starts, counts = _cells(np, pos, 2 * reach.max())
+    symmetric = len(rows) == n
+    found_i, found_j = [], []
+    for dx, dy in HALF_NEIGHBOURHOOD if symmetric else FULL_NEIGHBOURHOOD:
+        wanted = keys[rows] + dx * KEY_STRIDE + dy
+        slot = np.minimum(np.searchsorted(occupied, wanted), len(occupied) - 1)
+        hit = occupied[slot] == wanted
+        found_i.append(np.repeat(rows[hit], counts[slot[hit]]))
+        found_j.append(order[_segments(np, starts[slot[hit]], counts[slot[hit]])])
+    i = np.concatenate(found_i)
+    j = np.concatenate(found_j)
+    keep = i < j if symmetric else i != j
+    disp = _pair_forces(np, pos, i[keep], j[keep], charges, reach, symmetric)
+
+    # Far field: coarse cells act on each other as their total charge at
+    # their centroid, and every node takes its cell's field. Softening by the
+    # cell size keeps the near pairs, already counted, from counting twice.
+    span = np.ptp(pos, axis=0) + 1.0
+    coarse = math.sqrt(span[0] * span[1] / FAR_FIELD_CELLS)
+    _, keys, occupied, order, starts, counts = _cells(np, pos, coarse)
+    cell_of = np.searchsorted(occupied, keys)
+    mass = np.bincount(cell_of, charges)
+    centroid = np.column_stack([np.bincount(cell_of, charges * pos[:, axis]) for axis in (0, 1)]) / mass[:, None]
+    dx = centroid[:, 0, None] - centroid[None, :, 0]
+    dy = centroid[:, 1, None] - centroid[None, :, 1]
+    weight = mass[None, :] / (dx * dx + dy * dy + coarse * coarse)
+    field = np.column_stack((np.einsum("ij,ij->i", dx, weight), np.einsum("ij,ij->i", dy, weight)))
+    disp += field[cell_of]
+    return disp
+
+
+def force_layout(edges, lengths, strengths, radii, charges, positions, movable, iterations: int,
+                 temperature: float):
+    """
+    Run the simulation from the given positions; returns the new (n, 2) array.
+
+    edges is an (m, 2) index array with a target length and spring
+    strength per edge; only nodes where movable is True move.
+    """
+    import numpy as np
+
+    pos = np.array(positions, dtype=np.float64)
+    n = len(pos)
+    rows = np.flatnonzero(movable)
+    if n < 2 or iterations <= 0 or not len(rows):
+        return pos
+    reach = radii + COLLIDE_PADDING
+    # Only springs that can move something
+    active = movable[edges[:, 0]] | movable[edges[:, 1]]
+    src, dst = edges[active, 0], edges[active, 1]
+    lengths, strengths = lengths[active], strengths[active]
+
+    for step in range(iterations):
+        disp = _repulsion(np, pos, rows, charges, reach)
+
+        if len(src):
+            delta = pos[src] - pos[dst]
+            dist = np.sqrt((delta * delta).sum(axis=1)) + 1e-9
+            pull = delta * (strengths * (dist - lengths) / dist)[:, None]
+            for axis in (0, 1):
+                disp[:, axis] -= np.bincount(src, pull[:, axis], minlength=n)
+                disp[:, axis] += np.bincount(dst, pull[:, axis], minlength=n)
+
+        disp -= GRAVITY * pos
+
+        # Cap each step at the current temperature
+        limit = temperature * (1 - step / iterations)
+        step_disp = disp[rows]
+        length = np.sqrt((step_disp * step_disp).sum(axis=1)) + 1e-9
+        pos[rows] += step_disp * np.minimum(1.0, limit / length)[:, None]
+    return pos
+
+
+def layout_graph(nodes: list[dict], links: list[dict], previous: dict | None = None) -> dict:
+    """
+    Positions for a /graph payload, relative to ``me`` at (0, 0).
+
+    previous is the result of an earlier call for the same user; it is
+    the starting point when few nodes are new. Returns {node id: [x, y]}.
+    """
+    import numpy as np
+
+    ids = [node["id"] for node in nodes]
+    index = {node_id: i for i, node_id in enumerate(ids)}
+    n = len(ids)
+    kinds = [ME if node_id == ME else node.get("type", "user") for node_id, node in zip(ids, nodes)]
+    radii = np.array([RADIUS.get(kind, RADIUS["user"]) for kind in kinds])
+    charges = np.array([CHARGE.get(kind, CHARGE["user"]) for kind in kinds])
+
+    pairs = [
+        (index[link["source"]], index[link["target"]], LINK_DISTANCE.get(link.get("type"), LINK_DISTANCE["direct"]))
+        for link in links if link["source"] in index and link["target"] in index
+    ]
+    edges = np.array([(s, t) for s, t, _ in pairs], dtype=np.intp).reshape(-1, 2)
+    lengths = np.array([length for _, _, length in pairs], dtype=np.float64)
+    neighbours = [[] for _ in range(n)]
+    for s, t, _ in pairs:
+        neighbours[s].append(t)
+        neighbours[t].append(s)
+    degree = np.array([len(linked) for linked in neighbours], dtype=np.float64)
+    hub_degree = np.maximum(degree[edges[:, 0]], degree[edges[:, 1]]) if len(edges) else degree[:0]
+    strengths = SPRING_STRENGTH * np.minimum(1.0, np.sqrt(SPRING_FULL_DEGREE / np.maximum(hub_degree, 1.0)))
+
+    rng = np.random.default_rng(_seed(ids))
+    pos = np.zeros((n, 2))
+    placed = np.zeros(n, dtype=bool)
+    previous = previous or {}
+    for i, node_id in enumerate(ids):
+        if node_id in previous:
+            pos[i] = previous[node_id]
+            placed[i] = True
+    new = [i for i in range(n) if not placed[i] and ids[i] != ME]
+    warm = bool(previous) and len(new) <= WARM_START_MAX_NEW * n
+
+    if warm:
+        movable = np.zeros(n, dtype=bool)
+        for i in new:
+            movable[i] = True
+            movable[neighbours[i]] = True
+    else:
+        # Connections and groups on a disc around me; group-only members
+        # are placed next to their group below
+        placed[:] = False
+        hubs = [i for i in range(n) if ids[i] != ME and (kinds[i] == "group" or ME in (ids[j] for j in neighbours[i]))]
+        pos[hubs] = _sunflower(np, len(hubs), 1)
+        placed[hubs] = True
+        movable = np.ones(n, dtype=bool)
+
+    if ME in index:
+        pos[index[ME]] = 0.0
+        placed[index[ME]] = True
+        movable[index[ME]] = False
+
+    # Unplaced nodes start a link's length from their placed neighbours, or
+    # on the rim of the disc if they only link to me
+    next_slot = n if warm else int(placed.sum())
+    for i in np.flatnonzero(~placed):
+        anchors = [j for j in neighbours[i] if placed[j] and ids[j] != ME]
+        if anchors:
+            angle = rng.uniform(0, 2 * math.pi)
+            pos[i] = pos[anchors].mean(axis=0) + LINK_DISTANCE["group"] * np.array([math.cos(angle), math.sin(angle)])
+        else:
+            pos[i] = _sunflower(np, 1, next_slot)[0]
+            next_slot += 1
+        placed[i] = True
+
+    pos = force_layout(
+        edges, lengths, strengths, radii, charges, pos, movable,
+        iterations=WARM_ITERATIONS if warm else COLD_ITERATIONS,
+        temperature=WARM_TEMPERATURE if warm else COLD_TEMPERATURE,
+    )
+    if ME in index:
+        pos -= pos[index[ME]]
+    pos = np.round(pos, 1)
+    return {node_id: [float(x), float(y)] for node_id, (x, y) in zip(ids, pos)}
@@ -1,26 +1,90 @@
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Request, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import JSONResponse, HTMLResponse, Response, StreamingResponse
 from pydantic import BaseModel
+from pathlib import Path
 import os
 import logging
-import httpx
-from dotenv import load_dotenv
-from supabase import create_client, Client
-from google_auth_oauthlib.flow import Flow
 from datetime import datetime
+import asyncio
 import base64
+import functools
+import hashlib
+import importlib.util
 import json
-import html
+import random
+import secrets
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from google_auth_oauthlib.flow import Flow
+    from requests.adapters import HTTPAdapter
+    from supabase import Client
+
+try:
+    from . import templates
+    from . import admission
+    from . import db
+    from . import graph
+    from . import health
+    from . import http_client
+    from . import layout
+    from . import metrics
+    from . import oauth_state
+    from . import tracing
+    from .cache import TTLCache
+except ImportError:
+    import templates
+    import admission
+    import db
+    import graph
+    import health
+    import http_client
+    import layout
+    import metrics
+    import oauth_state
+    import tracing
+    from cache import TTLCache
+
+
+def load_env_file() -> None:
+    """
+    Load the nearest .env (searching up from this file, like load_dotenv()).
+
+    Deployments set real environment variables and have no .env, so they
+    skip importing python-dotenv at all.
+    """
+    here = Path(__file__).resolve().parent
+    for directory in (here, *here.parents):
+        env_file = directory / ".env"
+        if env_file.is_file():
+            from dotenv import load_dotenv
+            load_dotenv(env_file)
+            return
+
 
 # Load environment variables
-load_dotenv()
+load_env_file()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Franklink API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the shared outbound HTTP pool up front so the first provisioning
+    # request doesn't pay for creating it
+    http_client.get_client()
+    readiness_probe.start()
+    yield
+    await readiness_probe.stop()
+    await http_client.close_client()
+
+
+app = FastAPI(title="Franklink API", lifespan=lifespan)
 
 # CORS Configuration
 origins = [
@@ -38,6 +102,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Added last so they are outermost: timings cover CORS handling and error
+# responses too
+app.add_middleware(tracing.TracingMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Supabase Configuration
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")  # Must be SERVICE_ROLE_KEY to write to other users
@@ -46,19 +115,34 @@ SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
 if not SUPABASE_URL or not SUPABASE_KEY:
     logger.warning("Supabase credentials not found. Database updates will fail.")
 
-try:
-    supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-except Exception as e:
-    logger.error(f"Failed to initialize Supabase client: {e}")
-    supabase = None
-
-# Admin client (service role) for provisioning auth records
-supabase_admin: Client = None
-if SUPABASE_URL and SUPABASE_SERVICE_KEY:
+# Clients are created on first use rather than at import: supabase-py and
+# its HTTP stack are a large share of cold-start time, and most cold starts
+# (link-preview crawlers on /c/{slug} with a warm page cache, health checks)
+# never query the database.
+
+
+@functools.cache
+def get_supabase() -> "Client | None":
+    """Client for app queries; None if it can't be created."""
+    try:
+        from supabase import create_client
+        return create_client(SUPABASE_URL, SUPABASE_KEY)
+    except Exception as e:
+        logger.error(f"Failed to initialize Supabase client: {e}")
+        return None
+
+
+@functools.cache
+def get_supabase_admin() -> "Client | None":
+    """Admin client (service role) for provisioning auth records; None if not configured."""
+    if not (SUPABASE_URL and SUPABASE_SERVICE_KEY):
+        return None
     try:
-        supabase_admin = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        from supabase import create_client
+        return create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
     except Exception as e:
         logger.error(f"Failed to initialize Supabase admin client: {e}")
+        return None
 
 PRESET_PASSWORD = "franklinkuser"
 
@@ -67,6 +151,8 @@ GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 GOOGLE_REDIRECT_URI = os.getenv("REDIRECT_URI", "https://api.franklink.ai/oauth/google/callback")
 GOOGLE_PROJECT_ID = os.getenv("GOOGLE_PROJECT_ID", "franklink-career-bot")
+# Overridable so load tests can point the token exchange at a local stand-in
+GOOGLE_TOKEN_URI = os.getenv("GOOGLE_TOKEN_URI", "https://oauth2.googleapis.com/token")
 
 # OAuth Scopes
 OAUTH_SCOPES = [
@@ -78,6 +164,70 @@ OAUTH_SCOPES = [
     "https://www.googleapis.com/auth/calendar.events"
 ]
 
+# Franklink logo used by the success page. Loaded once at import and served
+# from a content-fingerprinted URL so browsers can cache it indefinitely
+# instead of receiving it inline (base64) on every OAuth callback.
+LOGO_BYTES = (Path(__file__).parent / "franklink_logo.png").read_bytes()
+LOGO_FINGERPRINT = hashlib.sha256(LOGO_BYTES).hexdigest()[:16]
+LOGO_MEDIA_TYPE = "image/jpeg" if LOGO_BYTES.startswith(b"\xff\xd8\xff") else "image/png"
+LOGO_URL = f"/static/franklink_logo.{LOGO_FINGERPRINT}"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+GOOGLE_CLIENT_CONFIG = {
+    "web": {
+        "client_id": GOOGLE_CLIENT_ID,
+        "client_secret": GOOGLE_CLIENT_SECRET,
+        "redirect_uris": [GOOGLE_REDIRECT_URI],
+        "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+        "token_uri": GOOGLE_TOKEN_URI
+    }
+}
+
+
+
+@functools.cache
+def get_oauth_start_flow() -> "Flow":
+    """
+    Flow used to build authorization URLs, created once on first use.
+
+    authorization_url() only reads the client config, scopes and redirect
+    URI (it runs synchronously, so requests can't interleave on it). PKCE
+    stays off: the callback exchanges the code with the client secret, and
+    a verifier generated here would be shared by every user.
+    """
+    from google_auth_oauthlib.flow import Flow
+
+    flow = Flow.from_client_config(
+        GOOGLE_CLIENT_CONFIG,
+        scopes=OAUTH_SCOPES,
+        autogenerate_code_verifier=False,
+    )
+    flow.redirect_uri = GOOGLE_REDIRECT_URI
+    return flow
+
+
+@functools.cache
+def get_google_http_adapter() -> "HTTPAdapter":
+    """
+    Shared connection pool for the token exchange. Each callback builds its
+    own Flow (and requests session); mounting this adapter lets them reuse
+    kept-alive connections to Google instead of a new TLS handshake each time.
+    """
+    from requests.adapters import HTTPAdapter
+
+    return HTTPAdapter(pool_connections=1, pool_maxsize=db.BLOCKING_IO_THREADS)
+
+# OAuth state signing. Tokens must verify on every worker/instance, so set a
+# shared OAUTH_STATE_SECRET in production; the client secret is a fallback.
+_state_secret = os.getenv("OAUTH_STATE_SECRET") or GOOGLE_CLIENT_SECRET
+if not _state_secret:
+    logger.warning("OAUTH_STATE_SECRET not set; using a per-process secret (OAuth will break across workers)")
+    _state_secret = secrets.token_urlsafe(32)
+OAUTH_STATE_SECRET = _state_secret.encode("utf-8")
+OAUTH_STATE_TTL = int(os.getenv("OAUTH_STATE_TTL", "600"))
+OAUTH_STATE_REPLAY_CHECK = os.getenv("OAUTH_STATE_REPLAY_CHECK", "true").lower() in ("1", "true", "yes")
+oauth_state_replays = oauth_state.ReplayGuard(max_age=OAUTH_STATE_TTL)
+
 class OAuthCallback(BaseModel):
     code: str
     state: str | None = None
@@ -87,460 +237,81 @@ class ProvisionRequest(BaseModel):
     identity: str
     password: str
 
+# iMessage redirect target for the success page
+IMESSAGE_URL = "sms:+13027242007"
+
+# Fixed values are folded into the template once at import
+SUCCESS_PAGE = templates.SUCCESS_PAGE.bind(logo_url=LOGO_URL, imessage_url=IMESSAGE_URL)
+
+# Speaker color palette for conversation pages: (background, accent)
+CONVERSATION_COLORS = [
+    ("#E8F0FE", "#1A73E8"),  # Blue
+    ("#FEF3E8", "#E87A1A"),  # Orange
+    ("#E8FEF0", "#1AE87A"),  # Green
+    ("#F3E8FE", "#7A1AE8"),  # Purple
+    ("#FEE8E8", "#E81A1A"),  # Red
+    ("#E8FEFE", "#1AE8E8"),  # Teal
+]
+
+
 def render_success_page(email: str) -> HTMLResponse:
     """Render Franklink success page with logo pattern background and iMessage redirect"""
-    import base64
-    from pathlib import Path
-
-    # Load Franklink logo for background
-    logo_path = Path(__file__).parent / "franklink_logo.png"
-    try:
-        with open(logo_path, 'rb') as f:
-            logo_base64 = base64.b64encode(f.read()).decode('utf-8')
-    except Exception as e:
-        logger.error(f"Failed to load logo from {logo_path}: {e}")
-        logo_base64 = ""  # Fallback to no logo
-
-    # iMessage redirect URL
-    imessage_url = "sms:+13027242007"
-
-    html_content = f"""
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Authorization Successful - Franklink</title>
-        <link href="https://fonts.googleapis.com/css2?family=Figtree:ital,wght@0,300..900;1,300..900&display=swap" rel="stylesheet">
-        <style>
-            * {{
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }}
-
-            body {{
-                font-family: 'Figtree', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                background: #FAFBFC;
-                min-height: 100vh;
-                display: flex;
-                flex-direction: column;
-                color: #1a1a1a;
-                position: relative;
-                overflow-x: hidden;
-            }}
-
-            /* Decorative background with logo patterns */
-            .bg-pattern {{
-                position: fixed;
-                top: 0;
-                left: 0;
-                width: 100%;
-                height: 100%;
-                pointer-events: none;
-                z-index: 0;
-            }}
-
-            .bg-logo {{
-                position: absolute;
-                opacity: 0.08;
-                background-size: contain;
-                background-repeat: no-repeat;
-                background-position: center;
-                background-image: url('data:image/png;base64,{logo_base64}');
-                transition: opacity 0.3s ease;
-            }}
-
-            /* Large logos for corners */
-            .bg-logo.large-1 {{
-                width: 400px;
-                height: 400px;
-                top: -5%;
-                right: -5%;
-                opacity: 0.12;
-                transform: rotate(-15deg);
-            }}
-
-            .bg-logo.large-2 {{
-                width: 450px;
-                height: 450px;
-                bottom: -8%;
-                left: -8%;
-                opacity: 0.10;
-                transform: rotate(20deg);
-            }}
-
-            .bg-logo.large-3 {{
-                width: 380px;
-                height: 380px;
-                top: 50%;
-                right: -10%;
-                opacity: 0.06;
-                transform: translateY(-50%) rotate(-25deg);
-            }}
-
-            /* Medium logos for mid-sections */
-            .bg-logo.medium-1 {{
-                width: 280px;
-                height: 280px;
-                top: 15%;
-                left: 20%;
-                opacity: 0.09;
-                transform: rotate(10deg);
-            }}
-
-            .bg-logo.medium-2 {{
-                width: 250px;
-                height: 250px;
-                bottom: 20%;
-                right: 25%;
-                opacity: 0.08;
-                transform: rotate(-12deg);
-            }}
-
-            .bg-logo.medium-3 {{
-                width: 260px;
-                height: 260px;
-                top: 45%;
-                left: 5%;
-                opacity: 0.07;
-                transform: rotate(18deg);
-            }}
-
-            /* Small logos for scattered effect */
-            .bg-logo.small-1 {{
-                width: 150px;
-                height: 150px;
-                top: 25%;
-                right: 40%;
-                opacity: 0.10;
-            }}
-
-            .bg-logo.small-2 {{
-                width: 140px;
-                height: 140px;
-                top: 70%;
-                left: 35%;
-                opacity: 0.08;
-                transform: rotate(-8deg);
-            }}
-
-            .bg-logo.small-3 {{
-                width: 160px;
-                height: 160px;
-                bottom: 35%;
-                right: 15%;
-                opacity: 0.09;
-                transform: rotate(15deg);
-            }}
-
-            .bg-logo.small-4 {{
-                width: 130px;
-                height: 130px;
-                top: 55%;
-                right: 50%;
-                opacity: 0.06;
-                transform: rotate(-20deg);
-            }}
-
-            .header {{
-                padding: 20px 40px;
-                background: white;
-                border-bottom: 1px solid #F0F0F0;
-                position: relative;
-                z-index: 10;
-            }}
-
-            .logo-container {{
-                display: flex;
-                align-items: center;
-                gap: 12px;
-            }}
-
-            .logo {{
-                width: 45px;
-                height: 45px;
-                position: relative;
-            }}
-
-            .logo img {{
-                width: 100%;
-                height: 100%;
-                object-fit: contain;
-            }}
-
-            .logo-text {{
-                font-size: 24px;
-                font-weight: 700;
-                color: #0A1F44;
-                letter-spacing: -0.5px;
-            }}
-
-            .main-content {{
-                flex: 1;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                padding: 48px 24px;
-                position: relative;
-                z-index: 1;
-            }}
-
-            .container {{
-                background: white;
-                border-radius: 16px;
-                border: 1px solid #E5E7EB;
-                box-shadow: 0 1px 3px rgba(0, 0, 0, 0.05);
-                max-width: 480px;
-                width: 100%;
-                padding: 48px 40px;
-                text-align: center;
-            }}
-
-            .success-icon {{
-                width: 72px;
-                height: 72px;
-                margin: 0 auto 24px;
-                background: linear-gradient(135deg, #0066FF 0%, #6B8EFF 100%);
-                border-radius: 50%;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-            }}
-
-            .success-icon svg {{
-                width: 40px;
-                height: 40px;
-                stroke: white;
-                stroke-width: 3;
-                fill: none;
-                stroke-linecap: round;
-                stroke-linejoin: round;
-            }}
-
-            h1 {{
-                font-size: 28px;
-                font-weight: 700;
-                color: #1a1a1a;
-                margin-bottom: 12px;
-                letter-spacing: -0.5px;
-            }}
-
-            .subtitle {{
-                font-size: 16px;
-                color: #6B7280;
-                line-height: 1.6;
-                margin-bottom: 24px;
-            }}
-
-            .email-badge {{
-                display: inline-block;
-                background: #F3F4F6;
-                color: #374151;
-                padding: 12px 20px;
-                border-radius: 10px;
-                font-size: 15px;
-                font-weight: 500;
-                margin: 8px 0 24px;
-                word-break: break-all;
-            }}
-
-            .redirect-message {{
-                font-size: 14px;
-                color: #0066FF;
-                margin-top: 20px;
-                font-weight: 500;
-            }}
-
-            .footer {{
-                padding: 24px 32px;
-                background: white;
-                border-top: 1px solid #E5E7EB;
-                text-align: center;
-                position: relative;
-                z-index: 10;
-            }}
-
-            .footer-links {{
-                font-size: 13px;
-                color: #6B7280;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                gap: 12px;
-                flex-wrap: wrap;
-            }}
-
-            .footer-links a {{
-                color: #0066FF;
-                text-decoration: none;
-                transition: color 0.2s;
-            }}
-
-            .footer-links a:hover {{
-                color: #1E48D9;
-            }}
-
-            .footer-links .separator {{
-                color: #D1D5DB;
-            }}
-
-            @media (max-width: 640px) {{
-                .header, .footer {{
-                    padding: 20px 24px;
-                }}
-
-                .container {{
-                    padding: 36px 28px;
-                }}
-
-                h1 {{
-                    font-size: 24px;
-                }}
-
-                .subtitle {{
-                    font-size: 15px;
-                }}
-            }}
-        </style>
-    </head>
-    <body>
-        <!-- Background decorative pattern with logos -->
-        <div class="bg-pattern">
-            <div class="bg-logo large-1"></div>
-            <div class="bg-logo large-2"></div>
-            <div class="bg-logo large-3"></div>
-            <div class="bg-logo medium-1"></div>
-            <div class="bg-logo medium-2"></div>
-            <div class="bg-logo medium-3"></div>
-            <div class="bg-logo small-1"></div>
-            <div class="bg-logo small-2"></div>
-            <div class="bg-logo small-3"></div>
-            <div class="bg-logo small-4"></div>
-        </div>
-
-        <header class="header">
-            <div class="logo-container">
-                <div class="logo">
-                    <img src="data:image/png;base64,{logo_base64}" alt="Franklink Logo">
-                </div>
-                <div class="logo-text">Franklink</div>
-            </div>
-        </header>
-
-        <div class="main-content">
-            <div class="container">
-                <div class="success-icon">
-                    <svg viewBox="0 0 24 24">
-                        <polyline points="20 6 9 17 4 12"></polyline>
-                    </svg>
-                </div>
-                <h1>Great! You're all set!</h1>
-                <p class="subtitle">We've successfully and securely connected your account.</p>
-                <div class="email-badge">{email}</div>
-                <p class="redirect-message" id="redirect-message">
-                    Redirecting to iMessage in <span id="countdown">2</span> seconds...
-                </p>
-            </div>
-        </div>
-
-        <footer class="footer">
-            <div class="footer-links">
-                <a href="https://franklink.ai">franklink.ai</a>
-                <span class="separator">•</span>
-                <a href="https://franklink.ai/privacy">Privacy</a>
-                <span class="separator">•</span>
-                <a href="https://franklink.ai/terms.html">Terms of Service</a>
-            </div>
-        </footer>
-
-        <script>
-            // Auto-redirect to iMessage after 2 seconds
-            let countdown = 2;
-            const redirectMessage = document.getElementById('redirect-message');
-            const countdownSpan = document.getElementById('countdown');
-
-            const interval = setInterval(() => {{
-                countdown--;
-                countdownSpan.textContent = countdown;
-
-                if (countdown === 0) {{
-                    clearInterval(interval);
-                    redirectMessage.textContent = 'Redirecting now...';
-                    window.location.href = '{imessage_url}';
-                }}
-            }}, 1000);
-        </script>
-    </body>
-    </html>
-    """
-    return HTMLResponse(content=html_content, status_code=200)
+    return HTMLResponse(content=SUCCESS_PAGE.render(email=email), status_code=200)
 
 
 def render_error_page(title: str, message: str) -> HTMLResponse:
     """Render error page with white background"""
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>{title}</title>
-        <meta name="viewport" content="width=device-width, initial-scale=1">
-        <style>
-            body {{
-                font-family: 'Figtree', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-                display: flex;
-                justify-content: center;
-                align-items: center;
-                min-height: 100vh;
-                margin: 0;
-                background: #f0f2f5;
-            }}
-            .container {{
-                background: white;
-                padding: 40px;
-                border-radius: 12px;
-                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-                max-width: 400px;
-                text-align: center;
-            }}
-            .error-icon {{
-                width: 80px;
-                height: 80px;
-                margin: 0 auto 20px;
-                background: #f44336;
-                border-radius: 50%;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                font-size: 50px;
-                color: white;
-            }}
-            h1 {{
-                color: #333;
-                font-size: 24px;
-                margin-bottom: 10px;
-            }}
-            p {{
-                color: #666;
-                line-height: 1.6;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="error-icon">✕</div>
-            <h1>{title}</h1>
-            <p>{message}</p>
-            <p>You can close this page and try again.</p>
-        </div>
-    </body>
-    </html>
-    """
-    return HTMLResponse(content=html_content, status_code=400)
+    return HTMLResponse(
+        content=templates.ERROR_PAGE.render(title=title, message=message),
+        status_code=400,
+    )
+
+
+# Conversation page head (header + teaser) and tail around the bubbles, so
+# the head can be flushed before any bubble is rendered
+CONVERSATION_HEAD, CONVERSATION_TAIL = templates.CONVERSATION_PAGE.split("bubbles")
+CONVERSATION_TAIL_BYTES = CONVERSATION_TAIL.render()
+
+# Turns escaped and emitted per streamed chunk
+CONVERSATION_STREAM_BATCH = 64
+
+
+def _conversation_bubble_parts(idx: int) -> tuple[bytes, bytes, bytes]:
+    """Bubble markup for speaker idx as (before name, name to content, after content)."""
+    bg, accent = CONVERSATION_COLORS[idx % len(CONVERSATION_COLORS)]
+    align = "left" if idx % 2 == 0 else "right"
+    margin = "margin-right: 40px;" if align == "left" else "margin-left: 40px;"
+    head, tail = templates.CONVERSATION_BUBBLE.bind(
+        align=align, bg=bg, accent=accent, margin=margin
+    ).split("content")
+    before_name, after_name = head.split("speaker")
+    return before_name.render(), after_name.render(), tail.render()
+
+
+# Styling cycles with the palette (its length is even, so alignment does too):
+# a render only escapes each speaker's name once and concatenates
+CONVERSATION_BUBBLE_PARTS = [_conversation_bubble_parts(idx) for idx in range(len(CONVERSATION_COLORS))]
 
 
 def render_conversation_page(conversation: dict) -> HTMLResponse:
     """Render a discovery conversation as a mobile-friendly chat page."""
+    return HTMLResponse(content=render_conversation_html(conversation), status_code=200)
+
+
+def render_conversation_html(conversation: dict) -> bytes:
+    """Render a discovery conversation page to UTF-8 bytes."""
+    return b"".join(iter_conversation_html(conversation))
+
+
+def iter_conversation_html(conversation: dict):
+    """
+    Render a discovery conversation page as a stream of UTF-8 chunks.
+
+    The first chunk is the complete head (meta tags, header, teaser), so
+    link-preview crawlers get everything they need immediately. Bubbles
+    follow in batches of CONVERSATION_STREAM_BATCH turns, each batch escaped
+    in a single pass.
+    """
     turns = conversation.get("turns") or []
     if not isinstance(turns, list):
         turns = []
@@ -569,139 +340,112 @@ def render_conversation_page(conversation: dict) -> HTMLResponse:
     else:
         title_names = display_names[0] if display_names else "Agents"
 
-    # Color palette
-    colors = [
-        ("#E8F0FE", "#1A73E8"),  # Blue
-        ("#FEF3E8", "#E87A1A"),  # Orange
-        ("#E8FEF0", "#1AE87A"),  # Green
-        ("#F3E8FE", "#7A1AE8"),  # Purple
-        ("#FEE8E8", "#E81A1A"),  # Red
-        ("#E8FEFE", "#1AE8E8"),  # Teal
-    ]
-
-    # Build chat bubbles HTML
-    bubbles_html = ""
-    for turn in turns:
-        name = turn.get("speaker_name", "Agent")
-        raw_content = turn.get("content", "")
-        # Skip empty messages
-        if not raw_content or not str(raw_content).strip():
+    yield CONVERSATION_HEAD.render(
+        title=f"Why {title_names} should connect",
+        teaser=teaser,
+    )
+
+    # Per-speaker bubble markup before/after the content, with the escaped
+    # speaker name folded into the precomputed styling
+    bubble_wrappers = {}
+    escaped_names = templates.escape_many([str(name) for name in speakers])
+    for idx, (name, escaped_name) in enumerate(zip(speakers, escaped_names)):
+        before_name, after_name, tail = CONVERSATION_BUBBLE_PARTS[idx % len(CONVERSATION_BUBBLE_PARTS)]
+        bubble_wrappers[name] = (before_name + escaped_name + after_name, tail)
+
+    for start in range(0, len(turns), CONVERSATION_STREAM_BATCH):
+        names = []
+        contents = []
+        for turn in turns[start:start + CONVERSATION_STREAM_BATCH]:
+            raw_content = turn.get("content", "")
+            # Skip empty messages
+            if not raw_content:
+                continue
+            raw_content = str(raw_content)
+            if not raw_content.strip():
+                continue
+            names.append(turn.get("speaker_name", "Agent"))
+            contents.append(raw_content)
+
+        if not contents:
             continue
-        content = html.escape(str(raw_content))
-        idx = speaker_indices.get(name, 0)
-        bg, accent = colors[idx % len(colors)]
-        align = "left" if idx % 2 == 0 else "right"
-        margin = "margin-right: 40px;" if align == "left" else "margin-left: 40px;"
-
-        bubbles_html += f'''
-        <div class="bubble" style="text-align: {align};">
-            <div class="bubble-inner" style="background: {bg}; border-left: 3px solid {accent}; {margin}">
-                <div class="speaker" style="color: {accent};">{html.escape(name)}</div>
-                <div class="content">{content}</div>
-            </div>
-        </div>
-        '''
-
-    # Escape teaser for both HTML and OG tag
-    teaser_escaped = html.escape(teaser)
-    title_escaped = html.escape(f"Why {title_names} should connect")
-
-    html_content = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no">
-    <title>{title_escaped}</title>
-    <meta property="og:title" content="{title_escaped}">
-    <meta property="og:description" content="{teaser_escaped}">
-    <meta property="og:type" content="article">
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Text', 'Helvetica Neue', sans-serif;
-            background: #f5f5f7;
-            color: #1a1a1a;
-            -webkit-font-smoothing: antialiased;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
-            padding: 24px 20px 20px;
-            text-align: center;
-        }}
-        .header-logo {{
-            font-size: 13px;
-            font-weight: 700;
-            letter-spacing: 1.5px;
-            text-transform: uppercase;
-            color: rgba(255,255,255,0.5);
-            margin-bottom: 8px;
-        }}
-        .header-title {{
-            font-size: 20px;
-            font-weight: 700;
-            color: #fff;
-            line-height: 1.3;
-        }}
-        .teaser {{
-            background: #fff;
-            padding: 16px 20px;
-            font-size: 14px;
-            line-height: 1.5;
-            color: #555;
-            border-bottom: 1px solid #e5e5e7;
-        }}
-        .conversation {{
-            max-width: 600px;
-            margin: 0 auto;
-            padding: 20px 16px 40px;
-        }}
-        .bubble {{
-            margin-bottom: 16px;
-        }}
-        .bubble-inner {{
-            display: inline-block;
-            max-width: 85%;
-            padding: 12px 16px;
-            border-radius: 16px;
-        }}
-        .speaker {{
-            font-size: 12px;
-            font-weight: 600;
-            margin-bottom: 4px;
-        }}
-        .content {{
-            font-size: 15px;
-            line-height: 1.5;
-            white-space: pre-wrap;
-        }}
-        .footer {{
-            text-align: center;
-            padding: 20px;
-            font-size: 12px;
-            color: #999;
-        }}
-        .footer a {{
-            color: #1A73E8;
-            text-decoration: none;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <div class="header-logo">FRANKLINK</div>
-        <h1 class="header-title">{title_escaped}</h1>
-    </div>
-    <div class="teaser">{teaser_escaped}</div>
-    <div class="conversation">
-        {bubbles_html}
-    </div>
-    <footer class="footer">
-        Conversation generated by <a href="https://franklink.ai">Franklink</a> AI agents
-    </footer>
-</body>
-</html>'''
-
-    return HTMLResponse(content=html_content, status_code=200)
+
+        chunk = []
+        for name, content in zip(names, templates.escape_many(contents)):
+            before, after = bubble_wrappers[name]
+            chunk.append(before)
+            chunk.append(content)
+            chunk.append(after)
+        yield b"".join(chunk)
+
+    yield CONVERSATION_TAIL_BYTES
+
+
+@app.get("/static/franklink_logo.{fingerprint}")
+async def franklink_logo(fingerprint: str):
+    """Serve the success-page logo under its content fingerprint."""
+    if fingerprint != LOGO_FINGERPRINT:
+        raise HTTPException(status_code=404, detail="Not found")
+
+    return Response(
+        content=LOGO_BYTES,
+        media_type=LOGO_MEDIA_TYPE,
+        headers={
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+            "ETag": f'"{LOGO_FINGERPRINT}"',
+        },
+    )
+
+
+# Readiness: a background probe checks Supabase on a schedule and
+# /health/ready serves its last result, so orchestrator polling never waits
+# on (or adds load to) the database
+HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "15"))
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "3"))
+HEALTH_READY_MAX_AGE = float(os.getenv("HEALTH_READY_MAX_AGE", str(HEALTH_PROBE_INTERVAL * 3)))
+HEALTH_NO_STORE = {"Cache-Control": "no-store"}
+
+
+async def check_supabase() -> None:
+    """Raise unless Supabase's REST API answers with our key."""
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise RuntimeError("Supabase credentials not configured")
+    with metrics.track("supabase", "health_probe") as timer:
+        resp = await http_client.get_client().head(
+            f"{SUPABASE_URL}/rest/v1/",
+            headers={"apikey": SUPABASE_KEY, "Authorization": f"Bearer {SUPABASE_KEY}"},
+        )
+        if resp.status_code >= 400:
+            timer.outcome = f"http_{resp.status_code // 100}xx"
+    if resp.status_code >= 400:
+        raise RuntimeError(f"HTTP {resp.status_code}")
+
+
+readiness_probe = health.ReadinessProbe(
+    "supabase",
+    check_supabase,
+    interval=HEALTH_PROBE_INTERVAL,
+    timeout=HEALTH_PROBE_TIMEOUT,
+    max_age=HEALTH_READY_MAX_AGE,
+)
+
+
+@app.get("/health/live")
+async def health_live():
+    """Liveness: the worker is serving requests. No dependency work."""
+    return JSONResponse({"status": "alive"}, headers=HEALTH_NO_STORE)
+
+
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness: the cached result of the background Supabase probe."""
+    readiness_probe.refresh_if_stale()
+    ready = readiness_probe.ready
+    return JSONResponse(
+        {"status": "ready" if ready else "not_ready", "supabase": readiness_probe.snapshot()},
+        status_code=200 if ready else 503,
+        headers=HEALTH_NO_STORE,
+    )
 
 
 @app.get("/health")
@@ -711,25 +455,162 @@ async def health_check():
         "SUPABASE_KEY": "PRESENT" if os.getenv("SUPABASE_KEY") else "MISSING",
     }
 
-    initialization_error = None
-    if supabase is None:
-        # Re-try initialization to capture the error
-        try:
-            create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
-        except Exception as e:
-            initialization_error = str(e)
+    # Served from the readiness probe's cache; nothing is created or
+    # contacted on this path
+    readiness_probe.refresh_if_stale()
+    probe = readiness_probe.snapshot()
 
     return {
         "status": "healthy",
         "version": "1.0.0",
         "environment": os.getenv("ENVIRONMENT", "development"),
-        "supabase_connected": supabase is not None,
+        "supabase_connected": probe["ready"],
+        "supabase_probe": probe,
+        "conversation_cache": conversation_cache.stats(),
+        "http_pool": http_client.pool_stats.snapshot(),
         "env_vars_check": env_vars,
-        "initialization_error": initialization_error
+        "initialization_error": probe["last_error"]
     }
 
+conversation_cache_events = metrics.Counter(
+    "franklink_conversation_cache_events_total", "Conversation page cache lookups and evictions.", ("event",),
+)
+conversation_cache_size = metrics.Gauge(
+    "franklink_conversation_cache_entries", "Rendered conversation pages currently cached.",
+)
+graph_cache_events = metrics.Counter(
+    "franklink_graph_cache_events_total", "Connection graph cache lookups and evictions.", ("event",),
+)
+graph_cache_size = metrics.Gauge(
+    "franklink_graph_cache_entries", "Built connection graphs currently cached.",
+)
+http_pool_requests = metrics.Counter(
+    "franklink_http_pool_requests_total", "Outbound pooled HTTP requests, by connection reuse.", ("connection",),
+)
+http_pool_wait = metrics.Counter(
+    "franklink_http_pool_wait_seconds_total", "Time spent waiting for a pooled outbound connection.",
+)
+
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus scrape target for this worker."""
+    cache = conversation_cache.stats()
+    for event in ("hits", "stale_hits", "misses", "evictions"):
+        conversation_cache_events.set_total(event, value=cache[event])
+    conversation_cache_size.set(value=cache["size"])
+    graphs = graph_cache.stats()
+    for event in ("hits", "misses", "evictions"):
+        graph_cache_events.set_total(event, value=graphs[event])
+    graph_cache_size.set(value=graphs["size"])
+    pool = http_client.pool_stats.snapshot()
+    http_pool_requests.set_total("new", value=pool["new_connections"])
+    http_pool_requests.set_total("reused", value=pool["reused_connections"])
+    http_pool_wait.set_total(value=pool["pool_wait_seconds_total"])
+
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+# ==================== ADMISSION CONTROL ====================
+
+# Longest a request may wait for a concurrency slot before it is shed
+ADMISSION_LATENCY_BUDGET = float(os.getenv("ADMISSION_LATENCY_BUDGET", "2"))
+ADMISSION_IP_RATE = float(os.getenv("ADMISSION_IP_RATE", "5"))
+ADMISSION_IP_BURST = float(os.getenv("ADMISSION_IP_BURST", "20"))
+ADMISSION_IDENTITY_RATE = float(os.getenv("ADMISSION_IDENTITY_RATE", "0.2"))
+ADMISSION_IDENTITY_BURST = float(os.getenv("ADMISSION_IDENTITY_BURST", "5"))
+# nginx and Vercel set X-Real-IP to the connecting client. Only turn this
+# on when uvicorn is reachable through the proxy alone (deploy/api.service
+# binds to 127.0.0.1); otherwise clients could pick their own key.
+TRUST_PROXY_HEADERS = os.getenv("TRUST_PROXY_HEADERS", "false").lower() in ("1", "true", "yes")
+
+# Routes that hold Supabase/Admin API/Google calls open, by limit
+route_limiters = {
+    "oauth_callback": admission.ConcurrencyLimiter(
+        int(os.getenv("ADMISSION_OAUTH_CALLBACK_CONCURRENCY", "32")), ADMISSION_LATENCY_BUDGET),
+    "provision": admission.ConcurrencyLimiter(
+        int(os.getenv("ADMISSION_PROVISION_CONCURRENCY", "32")), ADMISSION_LATENCY_BUDGET),
+    "provision_batch": admission.ConcurrencyLimiter(
+        int(os.getenv("ADMISSION_PROVISION_BATCH_CONCURRENCY", "2")), ADMISSION_LATENCY_BUDGET),
+}
+# Buckets are keyed by (route, ip) and (route, identity)
+ip_rate_limiter = admission.RateLimiter(ADMISSION_IP_RATE, ADMISSION_IP_BURST)
+identity_rate_limiter = admission.RateLimiter(ADMISSION_IDENTITY_RATE, ADMISSION_IDENTITY_BURST)
+
+admission_rejections = metrics.Counter(
+    "franklink_admission_rejected_total", "Requests rate limited (429) or shed (503), by reason.",
+    ("route", "reason"),
+)
+admission_queue_wait = metrics.Histogram(
+    "franklink_admission_queue_wait_seconds", "Time admitted requests waited for a concurrency slot.",
+    ("route",),
+)
+
+
+def client_ip(request: Request) -> str:
+    if TRUST_PROXY_HEADERS:
+        real_ip = request.headers.get("x-real-ip")
+        if real_ip:
+            return real_ip.strip()
+    return request.client.host if request.client else "unknown"
+
+
+def check_rate_limits(route: str, request: Request, identity: str | None = None) -> None:
+    """Raise admission.Rejected (429) if the client or identity is over its rate."""
+    retry_after = ip_rate_limiter.acquire((route, client_ip(request)))
+    reason = "ip_rate"
+    if not retry_after and identity:
+        retry_after = identity_rate_limiter.acquire((route, identity))
+        reason = "identity_rate"
+    if retry_after:
+        admission_rejections.inc(route, reason)
+        raise admission.Rejected(429, reason, retry_after)
+
+
+async def acquire_slot(route: str) -> float:
+    """Wait for a concurrency slot on route; returns the monotonic start time."""
+    try:
+        waited = await route_limiters[route].acquire()
+    except admission.Rejected as e:
+        admission_rejections.inc(route, e.reason)
+        raise
+    admission_queue_wait.observe(route, value=waited)
+    return time.monotonic()
+
+
+def release_slot(route: str, started: float) -> None:
+    route_limiters[route].release(time.monotonic() - started)
+
+
+@asynccontextmanager
+async def admitted(route: str, request: Request, identity: str | None = None):
+    """Rate-limit, then hold a concurrency slot on route for the block."""
+    check_rate_limits(route, request, identity)
+    started = await acquire_slot(route)
+    try:
+        yield
+    finally:
+        release_slot(route, started)
+
+
+@app.exception_handler(admission.Rejected)
+async def admission_rejected(request: Request, exc: admission.Rejected):
+    headers = {"Retry-After": exc.retry_after_header, "Cache-Control": "no-store"}
+    if "text/html" in request.headers.get("accept", ""):
+        # Browser redirects (the OAuth callback) get a page, not JSON
+        response = render_error_page(
+            "Please Try Again",
+            "We're handling a lot of requests right now. Please try again in a moment.",
+        )
+        response.status_code = exc.status_code
+        response.headers.update(headers)
+        return response
+    error = "Too many requests" if exc.status_code == 429 else "Service busy"
+    return JSONResponse({"error": error, "reason": exc.reason}, status_code=exc.status_code, headers=headers)
+
+
 @app.get("/oauth/google/start")
-async def oauth_google_start(user_id: str):
+async def oauth_google_start(user_id: str, request: Request):
     """
     Initiate OAuth flow - generate authorization URL.
 
@@ -742,57 +623,22 @@ async def oauth_google_start(user_id: str):
     if not user_id:
         raise HTTPException(status_code=400, detail="user_id parameter is required")
 
-    try:
-        # Create OAuth flow
-        flow = Flow.from_client_config(
-            {
-                "web": {
-                    "client_id": GOOGLE_CLIENT_ID,
-                    "client_secret": GOOGLE_CLIENT_SECRET,
-                    "redirect_uris": [GOOGLE_REDIRECT_URI],
-                    "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                    "token_uri": "https://oauth2.googleapis.com/token"
-                }
-            },
-            scopes=OAUTH_SCOPES
-        )
+    # No concurrency limit: building the URL is local work
+    check_rate_limits("oauth_start", request, identity=user_id)
 
-        flow.redirect_uri = GOOGLE_REDIRECT_URI
+    try:
+        # Signed state carrying user_id, a nonce and a timestamp; verified
+        # locally in the callback, so nothing is written to the database here
+        state = oauth_state.sign_state(user_id, OAUTH_STATE_SECRET)
 
-        # Generate authorization URL with user_id as state
-        authorization_url, state = flow.authorization_url(
+        authorization_url, _ = get_oauth_start_flow().authorization_url(
             access_type='offline',
             include_granted_scopes='true',
             prompt='consent',
-            state=user_id  # Pass user_id as state
+            state=state
         )
 
-        # Store state temporarily in personal_facts for validation
-        if supabase:
-            try:
-                # Fetch current personal_facts
-                response = supabase.table("users").select("personal_facts").eq("id", user_id).execute()
-
-                if not response.data:
-                    logger.error(f"User not found: {user_id}")
-                    raise HTTPException(status_code=404, detail="User not found")
-
-                current_facts = response.data[0].get("personal_facts") or {}
-
-                # Add OAuth state for validation
-                current_facts["oauth_state"] = state
-                current_facts["oauth_state_created_at"] = datetime.utcnow().isoformat()
-                current_facts["oauth_scopes"] = OAUTH_SCOPES
-
-                # Update user record
-                supabase.table("users").update({
-                    "personal_facts": current_facts
-                }).eq("id", user_id).execute()
-
-                logger.info(f"Initiated OAuth flow for user {user_id}")
-            except Exception as e:
-                logger.error(f"Failed to store OAuth state: {e}")
-                # Continue anyway - state validation is optional
+        logger.info(f"Initiated OAuth flow for user {user_id}")
 
         return {
             "success": True,
@@ -805,8 +651,37 @@ async def oauth_google_start(user_id: str):
         raise HTTPException(status_code=500, detail=f"Failed to initiate OAuth flow: {str(e)}")
 
 
+def id_token_email(id_token: str | None) -> str | None:
+    """
+    Read the email claim from a Google ID token's payload.
+
+    The token comes straight from Google's token endpoint over TLS, so the
+    payload is decoded without verifying the signature.
+    """
+    if not id_token:
+        return None
+    try:
+        # Split JWT and decode payload
+        parts = id_token.split('.')
+        if len(parts) < 2:
+            return None
+        # Add padding if needed
+        payload = parts[1]
+        payload += '=' * (4 - len(payload) % 4)
+        decoded = base64.urlsafe_b64decode(payload)
+        return json.loads(decoded).get('email')
+    except Exception as e:
+        logger.error(f"Failed to extract email from ID token: {e}")
+        return None
+
+
 @app.get("/oauth/google/callback")
-async def oauth_google_callback(code: str = None, state: str = None, error: str = None):
+async def oauth_google_callback(request: Request, code: str = None, state: str = None, error: str = None):
+    async with admitted("oauth_callback", request):
+        return await complete_oauth_callback(code=code, state=state, error=error)
+
+
+async def complete_oauth_callback(code: str = None, state: str = None, error: str = None):
     """
     Handle Google OAuth callback.
 
@@ -815,6 +690,9 @@ async def oauth_google_callback(code: str = None, state: str = None, error: str
     2. Store in gmail_authentication_access column
     3. Clean up OAuth fields from personal_facts
     4. Only store email in personal_facts
+
+    Steps 2-4 are a single atomic write (complete_google_oauth RPC, see
+    supabase/oauth.sql).
     """
     try:
         # Handle errors
@@ -832,60 +710,48 @@ async def oauth_google_callback(code: str = None, state: str = None, error: str
         if not code or not state:
             raise HTTPException(status_code=400, detail="Missing code or state")
 
-        user_id = state  # state contains user_id
+        # The user comes from the signed state rather than a database lookup
+        try:
+            with tracing.span("user_lookup", "signed state"):
+                verified_state = oauth_state.verify_state(state, OAUTH_STATE_SECRET, OAUTH_STATE_TTL)
+                if OAUTH_STATE_REPLAY_CHECK:
+                    oauth_state_replays.consume(verified_state)
+        except oauth_state.InvalidStateError as e:
+            logger.warning(f"Rejected OAuth state: {e}")
+            return render_error_page(
+                "Authorization Expired",
+                "This authorization link is invalid or has expired. Please start again."
+            )
+
+        user_id = verified_state.user_id
 
-        # ===== STEP 1: Complete OAuth flow with Google =====
-        # Retrieve stored OAuth state for validation
+        supabase = get_supabase()
         if not supabase:
             raise Exception("Supabase client not initialized")
 
-        user_response = supabase.table("users").select("personal_facts").eq("id", user_id).execute()
-        if not user_response.data:
-            raise HTTPException(status_code=404, detail="User not found")
-
-        personal_facts = user_response.data[0].get("personal_facts", {})
-        stored_state = personal_facts.get("oauth_state")
-
-        if not stored_state:
-            logger.warning(f"No OAuth state found for user {user_id}, continuing anyway")
-
-        # Create flow WITHOUT specifying scopes for token exchange
-        # IMPORTANT: Don't validate scopes - Google may return additional scopes
-        flow = Flow.from_client_config(
-            {
-                "web": {
-                    "client_id": GOOGLE_CLIENT_ID,
-                    "client_secret": GOOGLE_CLIENT_SECRET,
-                    "redirect_uris": [GOOGLE_REDIRECT_URI],
-                    "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                    "token_uri": "https://oauth2.googleapis.com/token"
-                }
-            },
-            scopes=None  # DON'T specify scopes - accept whatever Google granted
-        )
+        # ===== STEP 1: Complete OAuth flow with Google =====
+        with tracing.span("token_exchange"):
+            from google_auth_oauthlib.flow import Flow
+
+            # Create flow WITHOUT specifying scopes for token exchange
+            # IMPORTANT: Don't validate scopes - Google may return additional scopes
+            flow = Flow.from_client_config(
+                GOOGLE_CLIENT_CONFIG,
+                scopes=None  # DON'T specify scopes - accept whatever Google granted
+            )
 
-        flow.redirect_uri = GOOGLE_REDIRECT_URI
+            flow.redirect_uri = GOOGLE_REDIRECT_URI
+            # Reuse kept-alive connections to Google's token endpoint
+            flow.oauth2session.mount("https://", get_google_http_adapter())
 
-        # Exchange authorization code for token
-        flow.fetch_token(code=code)
-        credentials = flow.credentials
+            # Exchange authorization code for token (blocking HTTP, off the loop)
+            with metrics.track("google", "fetch_token"):
+                await db.run_blocking(flow.fetch_token, code=code)
+            credentials = flow.credentials
 
         # ===== STEP 2: Extract email from ID token =====
-        email = None
-        try:
-            if hasattr(credentials, 'id_token') and credentials.id_token:
-                # Decode JWT to extract email
-                # Split JWT and decode payload
-                parts = credentials.id_token.split('.')
-                if len(parts) >= 2:
-                    # Add padding if needed
-                    payload = parts[1]
-                    payload += '=' * (4 - len(payload) % 4)
-                    decoded = base64.urlsafe_b64decode(payload)
-                    id_token_data = json.loads(decoded)
-                    email = id_token_data.get('email')
-        except Exception as e:
-            logger.error(f"Failed to extract email from ID token: {e}")
+        with tracing.span("jwt_decode"):
+            email = id_token_email(getattr(credentials, 'id_token', None))
 
         # Validate email exists
         if not email:
@@ -894,7 +760,12 @@ async def oauth_google_callback(code: str = None, state: str = None, error: str
                 "We couldn't find your email address. Please try again."
             )
 
-        # ===== STEP 3: Store credentials in gmail_authentication_access =====
+        # ===== STEP 3: Store credentials and clean up personal_facts =====
+        # One atomic statement: credentials go to gmail_authentication_access,
+        # OAuth fields are removed from personal_facts and ONLY the email is
+        # added there. That covers both the credentials and the facts update,
+        # so they share one span.
+        now = datetime.utcnow().isoformat()
         credentials_dict = {
             "token": credentials.token,
             "refresh_token": credentials.refresh_token,
@@ -903,44 +774,31 @@ async def oauth_google_callback(code: str = None, state: str = None, error: str
             "client_secret": credentials.client_secret,
             "scopes": credentials.scopes,
             "email": email,
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat()
+            "created_at": now,
+            "updated_at": now
         }
 
-        # Store in dedicated gmail_authentication_access column
-        result = supabase.table("users").update({
-            "gmail_authentication_access": credentials_dict,
-            "updated_at": datetime.utcnow().isoformat()
-        }).eq("id", user_id).execute()
+        with tracing.span("credentials_facts_update"):
+            result = await db.execute(supabase.rpc("complete_google_oauth", {
+                "p_user_id": user_id,
+                "p_credentials": credentials_dict,
+                "p_email": email,
+            }))
 
         if not result.data:
-            raise Exception("Failed to store OAuth credentials")
-
-        # ===== STEP 4: Clean up personal_facts =====
-        # Remove ALL OAuth-related fields from personal_facts
-        cleaned_facts = {
-            k: v for k, v in personal_facts.items()
-            if k not in [
-                'oauth_state',
-                'oauth_state_created_at',
-                'oauth_scopes',
-                'google_oauth_token',
-                'google_oauth_refresh_token',
-                'google_oauth_completed'
-            ]
-        }
-
-        # Add ONLY the email to personal_facts
-        cleaned_facts["google_oauth_email"] = email
-
-        supabase.table("users").update({
-            "personal_facts": cleaned_facts
-        }).eq("id", user_id).execute()
+            raise HTTPException(status_code=404, detail="User not found")
 
         logger.info(f"Successfully stored OAuth credentials for user {user_id}")
 
-        # ===== STEP 5: Return success page =====
-        return render_success_page(email)
+        # ===== STEP 4: Return success page =====
+        with tracing.span("render"):
+            response = render_success_page(email)
+
+        logger.info(
+            f"OAuth callback timings for user {user_id}: "
+            + " ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in tracing.finished_spans().items())
+        )
+        return response
 
     except Exception as e:
         logger.error(f"OAuth callback error: {e}", exc_info=True)
@@ -950,12 +808,117 @@ async def oauth_google_callback(code: str = None, state: str = None, error: str
         )
 
 @app.post("/oauth/google/callback")
-async def oauth_google_callback_post(callback: OAuthCallback):
-    return await oauth_google_callback(code=callback.code, state=callback.state, error=callback.error)
+async def oauth_google_callback_post(callback: OAuthCallback, request: Request):
+    async with admitted("oauth_callback", request):
+        return await complete_oauth_callback(code=callback.code, state=callback.state, error=callback.error)
+
+
+# ==================== CONVERSATION PAGES ====================
+
+# Rendered conversation pages, keyed by slug. Conversations are effectively
+# immutable once generated, and link previews/shares hit the same slug many
+# times in a burst, so most requests can skip Supabase and rendering.
+CONVERSATION_CACHE_TTL = int(os.getenv("CONVERSATION_CACHE_TTL", "300"))
+CONVERSATION_CACHE_STALE_TTL = int(os.getenv("CONVERSATION_CACHE_STALE_TTL", "3600"))
+conversation_cache = TTLCache(
+    maxsize=int(os.getenv("CONVERSATION_CACHE_SIZE", "512")),
+    ttl=CONVERSATION_CACHE_TTL,
+    stale_ttl=CONVERSATION_CACHE_STALE_TTL,
+)
+_conversations_revalidating: set[str] = set()
+
+CONVERSATION_CACHE_CONTROL = (
+    f"public, max-age={CONVERSATION_CACHE_TTL}, "
+    f"stale-while-revalidate={CONVERSATION_CACHE_STALE_TTL}"
+)
+
+
+# Changes whenever the conversation markup does, so ETags issued before a
+# template change stop matching
+CONVERSATION_TEMPLATE_VERSION = hashlib.sha256(
+    CONVERSATION_HEAD.render(title="", teaser="")
+    + CONVERSATION_TAIL_BYTES
+    + templates.CONVERSATION_BUBBLE.render(
+        align="", bg="", accent="", margin="", speaker="", content=""
+    )
+).digest()
+
+
+class CachedPage(NamedTuple):
+    body: bytes
+    etag: str
+
+
+def conversation_etag(conversation: dict) -> str:
+    """
+    Strong ETag for a conversation page, derived from the source row.
+
+    Computed before rendering so a streamed response can carry it in its
+    headers; the output is a pure function of the row and the templates.
+    """
+    digest = hashlib.sha256(CONVERSATION_TEMPLATE_VERSION)
+    digest.update(json.dumps(conversation, sort_keys=True, default=str).encode("utf-8"))
+    return '"' + digest.hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Evaluate an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+async def fetch_conversation(slug: str) -> dict | None:
+    """Load a conversation row from Supabase. None if it doesn't exist."""
+    response = await db.execute(
+        get_supabase().table("discovery_conversations")
+        .select("slug,turns,teaser_summary")
+        .eq("slug", slug)
+        .limit(1)
+        .maybe_single()
+    )
+
+    if not response or not response.data:
+        return None
+    return response.data
+
+
+async def revalidate_conversation(slug: str) -> None:
+    """Refresh a stale cache entry (runs as a background task)."""
+    try:
+        conversation = await fetch_conversation(slug)
+        if conversation is None:
+            conversation_cache.pop(slug)
+        else:
+            conversation_cache.set(slug, CachedPage(
+                body=render_conversation_html(conversation),
+                etag=conversation_etag(conversation),
+            ))
+    except Exception as e:
+        # Keep serving the stale copy; the next stale hit will retry
+        logger.warning(f"Failed to revalidate conversation {slug}: {e}")
+    finally:
+        _conversations_revalidating.discard(slug)
+
+
+async def stream_conversation(slug: str, conversation: dict, etag: str):
+    """Stream a freshly fetched page, caching the full body once it completes."""
+    chunks = []
+    for chunk in iter_conversation_html(conversation):
+        chunks.append(chunk)
+        yield chunk
+    # Only reached if the client read the whole page
+    conversation_cache.set(slug, CachedPage(body=b"".join(chunks), etag=etag))
 
 
 @app.get("/c/{slug}")
-async def get_conversation(slug: str):
+async def get_conversation(slug: str, request: Request, background_tasks: BackgroundTasks):
     """
     Render a discovery conversation page for iMessage rich link previews.
     """
@@ -963,25 +926,181 @@ async def get_conversation(slug: str):
     if not slug or len(slug) > 100 or not slug.isalnum():
         return render_error_page("Not Found", "This conversation doesn't exist.")
 
-    if not supabase:
+    if_none_match = request.headers.get("if-none-match")
+
+    cached = conversation_cache.lookup(slug)
+    if cached is not None:
+        page, fresh = cached
+        if not fresh and slug not in _conversations_revalidating:
+            _conversations_revalidating.add(slug)
+            background_tasks.add_task(revalidate_conversation, slug)
+
+        headers = {"ETag": page.etag, "Cache-Control": CONVERSATION_CACHE_CONTROL}
+        if etag_matches(if_none_match, page.etag):
+            return Response(status_code=304, headers=headers)
+        return HTMLResponse(content=page.body, status_code=200, headers=headers)
+
+    if not get_supabase():
         return render_error_page("Error", "Database unavailable. Please try again later.")
 
     # Fetch conversation from Supabase
     try:
-        response = supabase.table("discovery_conversations") \
-            .select("slug,turns,teaser_summary") \
-            .eq("slug", slug) \
-            .limit(1) \
-            .single() \
-            .execute()
+        conversation = await fetch_conversation(slug)
     except Exception as e:
         logger.error(f"Failed to fetch conversation for slug {slug}: {e}", exc_info=True)
         return render_error_page("Not Found", "This conversation doesn't exist.")
 
-    if not response.data:
+    if conversation is None:
         return render_error_page("Not Found", "This conversation doesn't exist.")
 
-    return render_conversation_page(response.data)
+    etag = conversation_etag(conversation)
+    headers = {"ETag": etag, "Cache-Control": CONVERSATION_CACHE_CONTROL}
+    if etag_matches(if_none_match, etag):
+        conversation_cache.set(slug, CachedPage(body=render_conversation_html(conversation), etag=etag))
+        return Response(status_code=304, headers=headers)
+
+    return StreamingResponse(
+        stream_conversation(slug, conversation, etag),
+        status_code=200,
+        media_type="text/html",
+        headers=headers,
+    )
+
+
+# ==================== CONNECTION GRAPH ====================
+
+# Built graphs, keyed by (user id, version stamp). The stamp is bumped by
+# triggers on group chats, participants and names (supabase/account.sql),
+# so a change makes the next request miss; superseded entries age out.
+graph_cache = TTLCache(
+    maxsize=int(os.getenv("GRAPH_CACHE_SIZE", "1024")),
+    ttl=int(os.getenv("GRAPH_CACHE_TTL", "3600")),
+)
+# Access token digest -> user id, so repeat requests skip the Auth API. A
+# signed-out token keeps working here for at most this long.
+session_cache = TTLCache(maxsize=4096, ttl=int(os.getenv("SESSION_CACHE_TTL", "60")))
+GRAPH_CACHE_CONTROL = "private, no-cache"
+
+# Server-side node positions (needs NumPy). Without them the pages lay the
+# graph out themselves. The last layout per user seeds the next version's.
+GRAPH_LAYOUT = (
+    os.getenv("GRAPH_LAYOUT", "true").lower() in ("1", "true", "yes")
+    and importlib.util.find_spec("numpy") is not None
+)
+GRAPH_LAYOUT_MAX_NODES = int(os.getenv("GRAPH_LAYOUT_MAX_NODES", "5000"))
+graph_layouts = TTLCache(maxsize=graph_cache.maxsize, ttl=graph_cache.ttl)
+
+
+class CachedGraph(NamedTuple):
+    version: int
+    body: bytes
+    etag: str
+
+
+async def authenticated_user_id(request: Request) -> str:
+    """User id for the request's Supabase access token; 401 if there is none."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(status_code=401, detail="Sign in required")
+
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    user_id = session_cache.get(key)
+    if user_id is not None:
+        return user_id
+
+    with metrics.track("supabase_auth", "get_user") as timer:
+        resp = await http_client.get_client().get(
+            f"{SUPABASE_URL}/auth/v1/user",
+            headers={"apikey": SUPABASE_KEY, "Authorization": f"Bearer {token}"},
+        )
+        if resp.status_code != 200:
+            timer.outcome = f"http_{resp.status_code // 100}xx"
+    if resp.status_code in (401, 403):
+        raise HTTPException(status_code=401, detail="Session expired")
+    if resp.status_code != 200:
+        logger.error(f"Auth API returned {resp.status_code} for /auth/v1/user")
+        raise HTTPException(status_code=502, detail="Service unavailable")
+
+    user_id = resp.json().get("id")
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Session expired")
+    session_cache.set(key, user_id)
+    return user_id
+
+
+async def fetch_graph_version(user_id: str) -> int:
+    """Current version stamp of a user's graph (0 before the first bump)."""
+    response = await db.execute(
+        get_supabase().table("connection_graph_versions")
+        .select("version")
+        .eq("user_id", user_id)
+        .limit(1)
+    )
+    rows = response.data or []
+    return rows[0]["version"] if rows else 0
+
+
+async def build_user_graph(user_id: str) -> CachedGraph:
+    """
+    Load, build and lay out a user's graph. The version comes from the same
+    snapshot as the data.
+    """
+    response = await db.execute(get_supabase().rpc("get_connection_graph_for", {"p_user_id": user_id}))
+    data = response.data or {}
+    version = data.get("version") or 0
+    built = graph.build_graph(data, user_id)
+
+    if GRAPH_LAYOUT and len(built["nodes"]) <= GRAPH_LAYOUT_MAX_NODES:
+        with tracing.span("graph_layout"):
+            positions = await db.run_blocking(
+                layout.layout_graph, built["nodes"], built["links"], graph_layouts.get(user_id)
+            )
+        graph_layouts.set(user_id, positions)
+        for node in built["nodes"]:
+            node["x"], node["y"] = positions[node["id"]]
+
+    body = json.dumps(
+        {"version": version, **built},
+        separators=(",", ":"), ensure_ascii=False,
+    ).encode("utf-8")
+    return CachedGraph(version=version, body=body, etag='"' + hashlib.sha256(body).hexdigest()[:32] + '"')
+
+
+@app.get("/graph")
+async def connection_graph(request: Request):
+    """
+    The signed-in user's connection graph as drawable nodes and links.
+
+    Authenticated with the Supabase access token (Authorization: Bearer).
+    The whole network is returned; nothing is truncated.
+    """
+    if not get_supabase():
+        raise HTTPException(status_code=500, detail="Service not configured")
+    check_rate_limits("graph", request)
+
+    with tracing.span("auth"):
+        try:
+            user_id = await authenticated_user_id(request)
+        except http_client.HTTPError as e:
+            logger.error(f"HTTP error verifying session: {e}")
+            raise HTTPException(status_code=502, detail="Service unavailable")
+
+    try:
+        with tracing.span("graph_version"):
+            version = await fetch_graph_version(user_id)
+        cached = graph_cache.get((user_id, version))
+        if cached is None:
+            with tracing.span("graph_build"):
+                cached = await build_user_graph(user_id)
+            graph_cache.set((user_id, cached.version), cached)
+    except Exception as e:
+        logger.error(f"Failed to load connection graph for {user_id}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to load connections")
+
+    headers = {"ETag": cached.etag, "Cache-Control": GRAPH_CACHE_CONTROL, "Vary": "Authorization"}
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
 
 
 # ==================== ACCOUNT PROVISIONING ====================
@@ -1001,24 +1120,108 @@ def normalize_phone(raw: str) -> str:
     return trimmed
 
 
-@app.post("/account/provision")
-async def provision_account(req: ProvisionRequest):
+# Short-lived cache of identity lookups for provisioning (search value ->
+# public user id). Unknown identities are cached separately with a shorter
+# TTL so retries don't reach the database but new signups appear quickly.
+identity_cache = TTLCache(
+    maxsize=int(os.getenv("IDENTITY_CACHE_SIZE", "4096")),
+    ttl=int(os.getenv("IDENTITY_CACHE_TTL", "300")),
+)
+unknown_identity_cache = TTLCache(
+    maxsize=int(os.getenv("IDENTITY_CACHE_SIZE", "4096")),
+    ttl=int(os.getenv("IDENTITY_NEGATIVE_CACHE_TTL", "30")),
+)
+
+
+# Postgres undefined_column, as PostgREST reports it
+UNDEFINED_COLUMN = "42703"
+
+
+def is_missing_email_column(error: Exception) -> bool:
+    """True if a users lookup failed only because the email column doesn't exist yet."""
+    return getattr(error, "code", None) == UNDEFINED_COLUMN and "email" in str(error)
+
+
+def postgrest_quote(value: str) -> str:
+    """Quote a value for use inside a PostgREST or=(...) filter."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+async def lookup_public_user_id(search_value: str, is_real_email: bool) -> str | None:
     """
-    Auto-provision an auth record for a user who exists in public.users
-    but doesn't yet have a corresponding auth.users record.
-    Only works with the preset password.
+    Resolve an identity to a public.users id in one round trip.
+
+    iMessage identifiers can be emails stored in the phone_number column, so
+    real emails are matched against phone_number OR email in a single query,
+    preferring a phone_number match. Returns None if no user matches.
     """
-    if not supabase_admin:
-        raise HTTPException(status_code=500, detail="Service not configured")
+    cached = identity_cache.get(search_value)
+    if cached is not None:
+        return cached
+    if unknown_identity_cache.get(search_value):
+        return None
+
+    if is_real_email:
+        quoted = postgrest_quote(search_value)
+        try:
+            result = await db.execute(
+                get_supabase_admin().table("users")
+                .select("id,phone_number")
+                .or_(f"phone_number.eq.{quoted},email.eq.{quoted}")
+                .limit(2)
+            )
+        except Exception as e:
+            # Only a missing email column means "match by phone_number only";
+            # anything else must not end up cached as an unknown identity
+            if not is_missing_email_column(e):
+                raise
+            logger.warning(f"users.email does not exist, retrying by phone_number: {e}")
+            is_real_email = False
+
+    if not is_real_email:
+        result = await db.execute(
+            get_supabase_admin().table("users")
+            .select("id,phone_number")
+            .eq("phone_number", search_value)
+            .limit(1)
+        )
+
+    rows = result.data or []
+    if not rows:
+        unknown_identity_cache.set(search_value, True)
+        return None
+
+    row = next((r for r in rows if r.get("phone_number") == search_value), rows[0])
+    public_user_id = str(row["id"])
+    identity_cache.set(search_value, public_user_id)
+    return public_user_id
+
+
+class AdminAPIError(Exception):
+    """The Supabase Admin API rejected an auth-user creation."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"{status_code} {message}")
+        self.status_code = status_code
+
+    @property
+    def retryable(self) -> bool:
+        return self.status_code == 429 or self.status_code >= 500
 
-    if req.password != PRESET_PASSWORD:
-        return JSONResponse(status_code=403, content={"error": "Invalid credentials"})
 
-    identity = req.identity.strip()
+class ResolvedIdentity(NamedTuple):
+    identity: str
+    auth_email: str
+    search_value: str
+    is_real_email: bool
+
+
+def resolve_identity(raw: str) -> ResolvedIdentity | None:
+    """Derive the auth email and public.users search value for an identity."""
+    identity = raw.strip()
     if not identity:
-        raise HTTPException(status_code=400, detail="Identity required")
+        return None
 
-    # Determine auth email and DB search value
     is_real_email = "@" in identity and not identity.endswith("@users.franklink.ai")
     if "@" in identity:
         auth_email = identity
@@ -1029,69 +1232,272 @@ async def provision_account(req: ProvisionRequest):
         auth_email = f"{digits}@users.franklink.ai"
         search_value = normalized
 
-    # Look up user in public.users by phone_number
-    # (iMessage identifiers can be emails stored in phone_number column)
+    return ResolvedIdentity(identity, auth_email, search_value, is_real_email)
+
+
+async def create_auth_user(public_user_id: str, auth_email: str) -> str:
+    """
+    Create an auth.users record via the Supabase Admin API.
+
+    Returns "provisioned" or "already_exists". Raises AdminAPIError if the
+    API rejects the request and http_client.HTTPError on transport failures.
+    """
+    with metrics.track("supabase_admin", "create_user") as timer:
+        resp = await http_client.get_client().post(
+            f"{SUPABASE_URL}/auth/v1/admin/users",
+            headers={
+                "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
+                "apikey": SUPABASE_SERVICE_KEY,
+                "Content-Type": "application/json",
+            },
+            json={
+                "id": public_user_id,
+                "email": auth_email,
+                "password": PRESET_PASSWORD,
+                "email_confirm": True,
+            },
+        )
+        if resp.status_code not in (200, 201):
+            timer.outcome = f"http_{resp.status_code // 100}xx"
+
+    if resp.status_code in (200, 201):
+        logger.info(f"Provisioned auth record for user {public_user_id} ({auth_email})")
+        return "provisioned"
+
+    body = {}
     try:
-        result = supabase_admin.table("users") \
-            .select("id") \
-            .eq("phone_number", search_value) \
-            .limit(1) \
-            .execute()
-    except Exception as e:
-        logger.error(f"Provision lookup failed: {e}")
-        raise HTTPException(status_code=500, detail="Database error")
+        body = resp.json()
+    except Exception:
+        pass
+    error_msg = body.get("msg", "") or body.get("message", "") or resp.text
+
+    if "already" in error_msg.lower():
+        return "already_exists"
+
+    raise AdminAPIError(resp.status_code, error_msg)
+
 
-    # If not found and identity is a real email, also try the email column
-    if not result.data and is_real_email:
+@app.post("/account/provision")
+async def provision_account(req: ProvisionRequest, request: Request):
+    """
+    Auto-provision an auth record for a user who exists in public.users
+    but doesn't yet have a corresponding auth.users record.
+    Only works with the preset password.
+    """
+    if not get_supabase_admin():
+        raise HTTPException(status_code=500, detail="Service not configured")
+
+    if req.password != PRESET_PASSWORD:
+        return JSONResponse(status_code=403, content={"error": "Invalid credentials"})
+
+    resolved = resolve_identity(req.identity)
+    if resolved is None:
+        raise HTTPException(status_code=400, detail="Identity required")
+
+    async with admitted("provision", request, identity=resolved.search_value):
         try:
-            result = supabase_admin.table("users") \
-                .select("id") \
-                .eq("email", search_value) \
-                .limit(1) \
-                .execute()
-        except Exception:
-            pass  # email column may not exist yet
+            public_user_id = await lookup_public_user_id(resolved.search_value, resolved.is_real_email)
+        except Exception as e:
+            logger.error(f"Provision lookup failed: {e}")
+            raise HTTPException(status_code=500, detail="Database error")
+
+        if public_user_id is None:
+            return JSONResponse(status_code=404, content={"error": "No account found"})
 
-    if not result.data:
-        return JSONResponse(status_code=404, content={"error": "No account found"})
+        # Create auth record via Supabase Admin API
+        try:
+            outcome = await create_auth_user(public_user_id, resolved.auth_email)
+        except AdminAPIError as e:
+            logger.error(f"Auth provision API error: {e}")
+            raise HTTPException(status_code=500, detail="Failed to provision account")
+        except http_client.HTTPError as e:
+            logger.error(f"HTTP error during provisioning: {e}")
+            raise HTTPException(status_code=500, detail="Service unavailable")
 
-    public_user_id = str(result.data[0]["id"])
+    if outcome == "already_exists":
+        return {"provisioned": False, "reason": "already_exists"}
+    return {"provisioned": True}
 
-    # Create auth record via Supabase Admin API
-    try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{SUPABASE_URL}/auth/v1/admin/users",
-                headers={
-                    "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
-                    "apikey": SUPABASE_SERVICE_KEY,
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "id": public_user_id,
-                    "email": auth_email,
-                    "password": PRESET_PASSWORD,
-                    "email_confirm": True,
-                },
+
+# ==================== BATCH PROVISIONING ====================
+
+PROVISION_BATCH_MAX_SIZE = int(os.getenv("PROVISION_BATCH_MAX_SIZE", "5000"))
+PROVISION_BATCH_CONCURRENCY = int(os.getenv("PROVISION_BATCH_CONCURRENCY", "8"))
+PROVISION_BATCH_MAX_RETRIES = int(os.getenv("PROVISION_BATCH_MAX_RETRIES", "3"))
+PROVISION_BATCH_BACKOFF = float(os.getenv("PROVISION_BATCH_BACKOFF", "0.5"))
+# Values per bulk lookup query (keeps the in.(...) filter within URL limits)
+PROVISION_LOOKUP_CHUNK = 200
+
+
+class BatchProvisionRequest(BaseModel):
+    identities: list[str]
+    password: str
+
+
+async def lookup_public_user_ids(resolved: list[ResolvedIdentity]) -> tuple[dict[str, str], set[str]]:
+    """
+    Bulk version of lookup_public_user_id.
+
+    Matches phone_number first, then the email column for real emails that
+    are still unmatched, preserving the single-lookup precedence. Returns
+    (search value -> public user id, search values whose email lookup
+    failed). Failed values are neither matched nor cached as unknown.
+    """
+    found = {}
+    pending_phone = []
+    for r in resolved:
+        cached = identity_cache.get(r.search_value)
+        if cached is not None:
+            found[r.search_value] = cached
+        elif not unknown_identity_cache.get(r.search_value):
+            pending_phone.append(r.search_value)
+    pending_phone = list(dict.fromkeys(pending_phone))
+
+    for start in range(0, len(pending_phone), PROVISION_LOOKUP_CHUNK):
+        chunk = pending_phone[start:start + PROVISION_LOOKUP_CHUNK]
+        result = await db.execute(
+            get_supabase_admin().table("users")
+            .select("id,phone_number")
+            .in_("phone_number", chunk)
+        )
+        for row in result.data or []:
+            found.setdefault(row["phone_number"], str(row["id"]))
+
+    looked_up = set(pending_phone)
+    pending_email = list(dict.fromkeys(
+        r.search_value for r in resolved
+        if r.is_real_email and r.search_value in looked_up and r.search_value not in found
+    ))
+    failed = set()
+    for start in range(0, len(pending_email), PROVISION_LOOKUP_CHUNK):
+        chunk = pending_email[start:start + PROVISION_LOOKUP_CHUNK]
+        try:
+            result = await db.execute(
+                get_supabase_admin().table("users")
+                .select("id,email")
+                .in_("email", chunk)
             )
+        except Exception as e:
+            if is_missing_email_column(e):
+                # No email column: phone_number was the only possible match
+                logger.warning(f"users.email does not exist, matched by phone_number only: {e}")
+                break
+            logger.error(f"Bulk email lookup failed for {len(chunk)} identities: {e}")
+            failed.update(chunk)
+            continue
+        for row in result.data or []:
+            found.setdefault(row["email"], str(row["id"]))
 
-        if resp.status_code in (200, 201):
-            logger.info(f"Provisioned auth record for user {public_user_id} ({auth_email})")
-            return {"provisioned": True}
+    for value in pending_phone:
+        if value in found:
+            identity_cache.set(value, found[value])
+        elif value not in failed:
+            unknown_identity_cache.set(value, True)
+    return found, failed
 
-        body = {}
+
+async def create_auth_user_with_retry(public_user_id: str, auth_email: str) -> str:
+    """create_auth_user with exponential backoff on transient failures."""
+    attempt = 0
+    while True:
         try:
-            body = resp.json()
-        except Exception:
-            pass
-        error_msg = body.get("msg", "") or body.get("message", "") or resp.text
+            return await create_auth_user(public_user_id, auth_email)
+        except (AdminAPIError, http_client.HTTPError) as e:
+            transient = not isinstance(e, AdminAPIError) or e.retryable
+            if not transient or attempt >= PROVISION_BATCH_MAX_RETRIES:
+                raise
+            delay = PROVISION_BATCH_BACKOFF * (2 ** attempt) * (0.5 + random.random())
+            logger.warning(f"Retrying provisioning for {public_user_id} in {delay:.2f}s: {e}")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+async def stream_batch_provisioning(identities: list[str]):
+    """Provision a batch of identities, yielding one NDJSON line per identity."""
+    resolved = []
+    for raw in identities:
+        r = resolve_identity(raw)
+        if r is None:
+            yield json.dumps({"identity": raw, "status": "invalid"}) + "\n"
+        else:
+            resolved.append(r)
 
-        if "already" in error_msg.lower():
-            return {"provisioned": False, "reason": "already_exists"}
+    try:
+        user_ids, failed = await lookup_public_user_ids(resolved)
+    except Exception as e:
+        logger.error(f"Batch provision lookup failed: {e}")
+        for r in resolved:
+            yield json.dumps({"identity": r.identity, "status": "error", "error": "Database error"}) + "\n"
+        return
+
+    semaphore = asyncio.Semaphore(PROVISION_BATCH_CONCURRENCY)
+
+    async def provision_one(r: ResolvedIdentity) -> dict:
+        public_user_id = user_ids.get(r.search_value)
+        if public_user_id is None:
+            if r.search_value in failed:
+                return {"identity": r.identity, "status": "error", "error": "Database error"}
+            return {"identity": r.identity, "status": "not_found"}
+        async with semaphore:
+            try:
+                status = await create_auth_user_with_retry(public_user_id, r.auth_email)
+            except (AdminAPIError, http_client.HTTPError) as e:
+                logger.error(f"Batch provisioning failed for user {public_user_id}: {e}")
+                return {"identity": r.identity, "status": "error", "error": "Failed to provision account"}
+        return {"identity": r.identity, "status": status}
 
-        logger.error(f"Auth provision API error: {resp.status_code} {error_msg}")
-        raise HTTPException(status_code=500, detail="Failed to provision account")
+    tasks = [asyncio.create_task(provision_one(r)) for r in resolved]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield json.dumps(await next_done) + "\n"
+    finally:
+        # Client went away mid-stream: stop issuing Admin API calls
+        for task in tasks:
+            task.cancel()
+
+
+class SlotStreamingResponse(StreamingResponse):
+    """StreamingResponse that releases a concurrency slot once sent or abandoned."""
+
+    def __init__(self, *args, route: str, slot_started: float, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.route = route
+        self.slot_started = slot_started
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            release_slot(self.route, self.slot_started)
+
+
+@app.post("/account/provision/batch")
+async def provision_account_batch(req: BatchProvisionRequest, request: Request):
+    """
+    Provision auth records for many public.users rows at once (backfills).
+
+    Identities are resolved with bulk queries and auth records are created
+    with bounded concurrency and retries. Streams one NDJSON object per
+    identity with status provisioned, already_exists, not_found, invalid
+    or error. Only works with the preset password.
+    """
+    if not get_supabase_admin():
+        raise HTTPException(status_code=500, detail="Service not configured")
+
+    if req.password != PRESET_PASSWORD:
+        return JSONResponse(status_code=403, content={"error": "Invalid credentials"})
+
+    if len(req.identities) > PROVISION_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {PROVISION_BATCH_MAX_SIZE} identities per batch",
+        )
 
-    except httpx.HTTPError as e:
-        logger.error(f"HTTP error during provisioning: {e}")
-        raise HTTPException(status_code=500, detail="Service unavailable")
+    # The slot is held until the whole stream has been sent
+    check_rate_limits("provision_batch", request)
+    return SlotStreamingResponse(
+        stream_batch_provisioning(req.identities),
+        media_type="application/x-ndjson",
+        route="provision_batch",
+        slot_started=await acquire_slot("provision_batch"),
+    )
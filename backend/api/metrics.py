@@ -0,0 +1,274 @@
+"""
+In-process request and dependency metrics, exposed in Prometheus text format.
+
+Counters, gauges and histograms are plain per-worker dicts. Every update
+happens on the event loop thread (the middleware, and timers around awaited
+calls), so they need no locks and cost a dict lookup and an add each.
+
+Each uvicorn worker keeps its own numbers and answers ``/metrics`` with
+them. Every sample carries a ``worker`` label (the process id) so series
+from different workers don't overwrite each other; aggregate with
+``sum without (worker) (...)`` in queries.
+"""
+
+import os
+import time
+from bisect import bisect_left
+
+try:
+    from . import tracing
+except ImportError:
+    import tracing
+
+# Seconds; roughly the Prometheus client defaults, plus a 25 s bucket for
+# slow token exchanges
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0)
+
+# Starlette appends "; charset=utf-8" to text/* media types
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+WORKER = str(os.getpid())
+
+_registry = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    pairs.append(f'worker="{WORKER}"')
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        _registry.append(self)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines += self._samples()
+        return lines
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def set_total(self, *labels, value: float) -> None:
+        """Mirror a running total kept elsewhere (e.g. cache hit counters)."""
+        self._values[labels] = value
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def set(self, *labels, value: float) -> None:
+        self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._series = {}
+
+    def observe(self, *labels, value: float) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def _samples(self) -> list[str]:
+        lines = []
+        bounds = [_format_value(b) for b in self.buckets] + ["+Inf"]
+        for labels, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames, labels, 'le="' + bound + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+def render() -> str:
+    """All registered metrics in Prometheus text exposition format."""
+    lines = []
+    for metric in _registry:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+
+# ------------------------------------------------------------
+# HTTP requests
+# ------------------------------------------------------------
+
+http_requests = Counter(
+    "franklink_http_requests_total", "HTTP requests handled, by route template.",
+    ("method", "route", "status"),
+)
+http_requests_in_flight = Gauge(
+    "franklink_http_requests_in_flight", "HTTP requests currently being handled.",
+    ("method", "route"),
+)
+http_request_duration = Histogram(
+    "franklink_http_request_duration_seconds",
+    "Time from receiving a request until the last byte of its response is sent.",
+    ("method", "route"),
+)
+
+# ------------------------------------------------------------
+# Outbound dependencies
+# ------------------------------------------------------------
+
+dependency_duration = Histogram(
+    "franklink_dependency_duration_seconds",
+    "Latency of calls to Supabase and Google, including the wait for a worker thread.",
+    ("dependency", "operation", "outcome"),
+)
+
+
+class DependencyTimer:
+    """
+    Times one dependency call: ``with track("google", "fetch_token"):``.
+
+    The outcome label is "error" if the block raises and "ok" otherwise,
+    unless the caller sets ``timer.outcome`` (e.g. for a non-2xx response).
+    The call also shows up as a span in the current request's trace.
+    """
+
+    __slots__ = ("dependency", "operation", "outcome", "started", "_span")
+
+    def __init__(self, dependency: str, operation: str):
+        self.dependency = dependency
+        self.operation = operation
+        self.outcome = None
+        self._span = tracing.span(dependency, operation)
+
+    def __enter__(self) -> "DependencyTimer":
+        self._span.__enter__()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        elapsed = time.perf_counter() - self.started
+        self._span.__exit__(exc_type, exc, tb)
+        if exc_type is not None:
+            outcome = "timeout" if "Timeout" in exc_type.__name__ else "error"
+        else:
+            outcome = self.outcome or "ok"
+        dependency_duration.observe(self.dependency, self.operation, outcome, value=elapsed)
+
+
+def track(dependency: str, operation: str) -> DependencyTimer:
+    return DependencyTimer(dependency, operation)
+
+
+def postgrest_operation(query) -> str:
+    """Low-cardinality operation label for a postgrest request builder."""
+    path = getattr(query, "path", "") or ""
+    if path.startswith("/rpc/"):
+        return f"rpc {path[5:]}"
+    verb = {"GET": "select", "POST": "insert", "PATCH": "update", "DELETE": "delete"}.get(
+        getattr(query, "http_method", ""), "query"
+    )
+    return f"{verb} {path.lstrip('/') or 'unknown'}"
+
+
+# ------------------------------------------------------------
+# Middleware
+# ------------------------------------------------------------
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording count, in-flight and latency per route template.
+
+    Routes are labelled by their template (``/c/{slug}``), never the raw path,
+    so a scan of random URLs can't create unbounded series; anything that
+    matches no route is labelled "unmatched". Latency runs until the final
+    body chunk is sent, so streamed responses are measured in full.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._routes = None
+
+    def _route_template(self, scope) -> str:
+        from starlette.routing import Match
+
+        if self._routes is None:
+            # The middleware stack is built on first request, after all
+            # routes are registered
+            self._routes = [route for route in scope["app"].router.routes if hasattr(route, "path")]
+        for route in self._routes:
+            match, _ = route.matches(scope)
+            if match is Match.FULL:
+                return route.path
+        return "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = self._route_template(scope)
+        status = 500
+        finished = None
+        started = time.perf_counter()
+        http_requests_in_flight.inc(method, route)
+
+        async def send_with_metrics(message):
+            nonlocal status, finished
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                # Background tasks run after this; they aren't request latency
+                finished = time.perf_counter()
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            http_requests_in_flight.dec(method, route)
+            http_requests.inc(method, route, str(status))
+            http_request_duration.observe(method, route, value=(finished or time.perf_counter()) - started)
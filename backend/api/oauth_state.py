@@ -0,0 +1,101 @@
+"""
+Stateless, signed OAuth ``state`` tokens.
+
+The token carries everything the callback needs (user id, nonce, issue
+time) and an HMAC-SHA256 signature, so starting an OAuth flow needs no
+database write and the callback can verify the state locally:
+
+    base64url(json payload) "." base64url(hmac)
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import time
+from typing import NamedTuple
+
+try:
+    from .cache import TTLCache
+except ImportError:
+    from cache import TTLCache
+
+
+class InvalidStateError(ValueError):
+    """The state token is malformed, forged, expired or already used."""
+
+
+class OAuthState(NamedTuple):
+    user_id: str
+    nonce: str
+    issued_at: int
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _utf8(text: str) -> bytes:
+    # surrogatepass: any str encodes, so garbage in a forged token can't raise
+    return text.encode("utf-8", "surrogatepass")
+
+
+def _signature(payload: str, secret: bytes) -> str:
+    return _b64encode(hmac.new(secret, _utf8(payload), hashlib.sha256).digest())
+
+
+def sign_state(user_id: str, secret: bytes, now: float | None = None) -> str:
+    """Create a signed state token for ``user_id``."""
+    issued_at = int(time.time() if now is None else now)
+    payload = _b64encode(json.dumps(
+        {"u": user_id, "n": secrets.token_urlsafe(16), "t": issued_at},
+        separators=(",", ":"),
+    ).encode("utf-8"))
+    return f"{payload}.{_signature(payload, secret)}"
+
+
+def verify_state(token: str, secret: bytes, max_age: float, now: float | None = None) -> OAuthState:
+    """Check a state token's signature and age. Raises InvalidStateError."""
+    payload, sep, signature = token.partition(".")
+    if not sep or not payload or not signature:
+        raise InvalidStateError("Malformed state")
+
+    # compare_digest only accepts ASCII str, so compare bytes
+    if not hmac.compare_digest(_utf8(signature), _utf8(_signature(payload, secret))):
+        raise InvalidStateError("Bad state signature")
+
+    try:
+        data = json.loads(_b64decode(payload))
+        state = OAuthState(user_id=str(data["u"]), nonce=str(data["n"]), issued_at=int(data["t"]))
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidStateError("Malformed state payload") from e
+
+    age = (time.time() if now is None else now) - state.issued_at
+    if age > max_age:
+        raise InvalidStateError("State expired")
+    if age < -60:
+        raise InvalidStateError("State issued in the future")
+    return state
+
+
+class ReplayGuard:
+    """
+    Remembers consumed nonces until their tokens would have expired anyway.
+
+    In-memory and per worker: it catches a replay that lands on the same
+    instance, and Google's single-use authorization codes cover the rest.
+    """
+
+    def __init__(self, max_age: float, maxsize: int = 10000):
+        self._seen = TTLCache(maxsize=maxsize, ttl=max_age)
+
+    def consume(self, state: OAuthState) -> None:
+        """Mark the state's nonce as used. Raises InvalidStateError on reuse."""
+        if self._seen.get(state.nonce):
+            raise InvalidStateError("State already used")
+        self._seen.set(state.nonce, True)
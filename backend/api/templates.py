@@ -0,0 +1,654 @@
+"""
+Precompiled HTML templates for the pages rendered by the API.
+
+Each page is parsed once at import time into a list of pre-encoded static
+byte segments and named slots (``{{ name }}``). Rendering only escapes the
+slot values and joins the chunks, so the large static CSS/markup blocks are
+never rebuilt or re-encoded per request.
+"""
+
+import html
+import re
+
+_SLOT_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class Template:
+    """A page split into static byte segments and dynamic slots.
+
+    ``str`` values are HTML-escaped before insertion. ``bytes`` values are
+    treated as already-rendered markup (e.g. the output of another template)
+    and inserted as-is.
+    """
+
+    __slots__ = ("_chunks", "_slots", "slot_names")
+
+    def __init__(self, source: str):
+        parts = []
+        pos = 0
+        for match in _SLOT_RE.finditer(source):
+            parts.append(source[pos:match.start()].encode("utf-8"))
+            parts.append(match.group(1))
+            pos = match.end()
+        parts.append(source[pos:].encode("utf-8"))
+        self._compile(parts)
+
+    def _compile(self, parts):
+        # Adjacent static parts are merged so render() joins as few chunks
+        # as possible; each slot gets an empty placeholder filled per render.
+        chunks = []
+        slots = []
+        pending = b""
+        for part in parts:
+            if not isinstance(part, str):
+                pending += part
+                continue
+            if pending:
+                chunks.append(pending)
+                pending = b""
+            slots.append((len(chunks), part))
+            chunks.append(b"")
+        if pending or not chunks:
+            chunks.append(pending)
+
+        self._chunks = chunks
+        self._slots = tuple(slots)
+        self.slot_names = frozenset(name for _, name in slots)
+
+    def _parts(self) -> list:
+        parts = list(self._chunks)
+        for index, name in self._slots:
+            parts[index] = name
+        return parts
+
+    @classmethod
+    def _from_parts(cls, parts) -> "Template":
+        template = cls.__new__(cls)
+        template._compile(parts)
+        return template
+
+    def bind(self, **values) -> "Template":
+        """Return a new template with some slots folded into static bytes.
+
+        Use this for values that are fixed for the lifetime of the process
+        (asset URLs, phone numbers) so they cost nothing per render.
+        """
+        parts = [
+            _encode(values[part]) if isinstance(part, str) and part in values else part
+            for part in self._parts()
+        ]
+        return Template._from_parts(parts)
+
+    def split(self, name: str) -> tuple["Template", "Template"]:
+        """Split the template around its (single) slot ``name``.
+
+        Used for streaming: render and send the head, stream the slot's
+        content in pieces, then send the tail.
+        """
+        parts = self._parts()
+        index = parts.index(name)
+        return Template._from_parts(parts[:index]), Template._from_parts(parts[index + 1:])
+
+    def render(self, **values) -> bytes:
+        """Render the template to UTF-8 bytes."""
+        chunks = self._chunks.copy()
+        for index, name in self._slots:
+            chunks[index] = _encode(values[name])
+        return b"".join(chunks)
+
+
+def escape_many(values: list[str]) -> list[bytes]:
+    """HTML-escape and encode many strings with a single escape/encode pass."""
+    if not values:
+        return []
+    joined = "\x00".join(values)
+    if joined.count("\x00") != len(values) - 1:
+        # A value contains the separator itself; escape one by one
+        return [html.escape(value).encode("utf-8") for value in values]
+    return html.escape(joined).encode("utf-8").split(b"\x00")
+
+
+def _encode(value) -> bytes:
+    if type(value) is str:
+        return html.escape(value).encode("utf-8")
+    if isinstance(value, bytes):
+        return value
+    return html.escape(str(value)).encode("utf-8")
+
+
+# ==================== PAGES ====================
+
+SUCCESS_PAGE = Template("""\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Authorization Successful - Franklink</title>
+    <link href="https://fonts.googleapis.com/css2?family=Figtree:ital,wght@0,300..900;1,300..900&display=swap" rel="stylesheet">
+    <style>
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+
+        body {
+            font-family: 'Figtree', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            background: #FAFBFC;
+            min-height: 100vh;
+            display: flex;
+            flex-direction: column;
+            color: #1a1a1a;
+            position: relative;
+            overflow-x: hidden;
+        }
+
+        /* Decorative background with logo patterns */
+        .bg-pattern {
+            position: fixed;
+            top: 0;
+            left: 0;
+            width: 100%;
+            height: 100%;
+            pointer-events: none;
+            z-index: 0;
+        }
+
+        .bg-logo {
+            position: absolute;
+            opacity: 0.08;
+            background-size: contain;
+            background-repeat: no-repeat;
+            background-position: center;
+            background-image: url('{{ logo_url }}');
+            transition: opacity 0.3s ease;
+        }
+
+        /* Large logos for corners */
+        .bg-logo.large-1 {
+            width: 400px;
+            height: 400px;
+            top: -5%;
+            right: -5%;
+            opacity: 0.12;
+            transform: rotate(-15deg);
+        }
+
+        .bg-logo.large-2 {
+            width: 450px;
+            height: 450px;
+            bottom: -8%;
+            left: -8%;
+            opacity: 0.10;
+            transform: rotate(20deg);
+        }
+
+        .bg-logo.large-3 {
+            width: 380px;
+            height: 380px;
+            top: 50%;
+            right: -10%;
+            opacity: 0.06;
+            transform: translateY(-50%) rotate(-25deg);
+        }
+
+        /* Medium logos for mid-sections */
+        .bg-logo.medium-1 {
+            width: 280px;
+            height: 280px;
+            top: 15%;
+            left: 20%;
+            opacity: 0.09;
+            transform: rotate(10deg);
+        }
+
+        .bg-logo.medium-2 {
+            width: 250px;
+            height: 250px;
+            bottom: 20%;
+            right: 25%;
+            opacity: 0.08;
+            transform: rotate(-12deg);
+        }
+
+        .bg-logo.medium-3 {
+            width: 260px;
+            height: 260px;
+            top: 45%;
+            left: 5%;
+            opacity: 0.07;
+            transform: rotate(18deg);
+        }
+
+        /* Small logos for scattered effect */
+        .bg-logo.small-1 {
+            width: 150px;
+            height: 150px;
+            top: 25%;
+            right: 40%;
+            opacity: 0.10;
+        }
+
+        .bg-logo.small-2 {
+            width: 140px;
+            height: 140px;
+            top: 70%;
+            left: 35%;
+            opacity: 0.08;
+            transform: rotate(-8deg);
+        }
+
+        .bg-logo.small-3 {
+            width: 160px;
+            height: 160px;
+            bottom: 35%;
+            right: 15%;
+            opacity: 0.09;
+            transform: rotate(15deg);
+        }
+
+        .bg-logo.small-4 {
+            width: 130px;
+            height: 130px;
+            top: 55%;
+            right: 50%;
+            opacity: 0.06;
+            transform: rotate(-20deg);
+        }
+
+        .header {
+            padding: 20px 40px;
+            background: white;
+            border-bottom: 1px solid #F0F0F0;
+            position: relative;
+            z-index: 10;
+        }
+
+        .logo-container {
+            display: flex;
+            align-items: center;
+            gap: 12px;
+        }
+
+        .logo {
+            width: 45px;
+            height: 45px;
+            position: relative;
+        }
+
+        .logo img {
+            width: 100%;
+            height: 100%;
+            object-fit: contain;
+        }
+
+        .logo-text {
+            font-size: 24px;
+            font-weight: 700;
+            color: #0A1F44;
+            letter-spacing: -0.5px;
+        }
+
+        .main-content {
+            flex: 1;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            padding: 48px 24px;
+            position: relative;
+            z-index: 1;
+        }
+
+        .container {
+            background: white;
+            border-radius: 16px;
+            border: 1px solid #E5E7EB;
+            box-shadow: 0 1px 3px rgba(0, 0, 0, 0.05);
+            max-width: 480px;
+            width: 100%;
+            padding: 48px 40px;
+            text-align: center;
+        }
+
+        .success-icon {
+            width: 72px;
+            height: 72px;
+            margin: 0 auto 24px;
+            background: linear-gradient(135deg, #0066FF 0%, #6B8EFF 100%);
+            border-radius: 50%;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+        }
+
+        .success-icon svg {
+            width: 40px;
+            height: 40px;
+            stroke: white;
+            stroke-width: 3;
+            fill: none;
+            stroke-linecap: round;
+            stroke-linejoin: round;
+        }
+
+        h1 {
+            font-size: 28px;
+            font-weight: 700;
+            color: #1a1a1a;
+            margin-bottom: 12px;
+            letter-spacing: -0.5px;
+        }
+
+        .subtitle {
+            font-size: 16px;
+            color: #6B7280;
+            line-height: 1.6;
+            margin-bottom: 24px;
+        }
+
+        .email-badge {
+            display: inline-block;
+            background: #F3F4F6;
+            color: #374151;
+            padding: 12px 20px;
+            border-radius: 10px;
+            font-size: 15px;
+            font-weight: 500;
+            margin: 8px 0 24px;
+            word-break: break-all;
+        }
+
+        .redirect-message {
+            font-size: 14px;
+            color: #0066FF;
+            margin-top: 20px;
+            font-weight: 500;
+        }
+
+        .footer {
+            padding: 24px 32px;
+            background: white;
+            border-top: 1px solid #E5E7EB;
+            text-align: center;
+            position: relative;
+            z-index: 10;
+        }
+
+        .footer-links {
+            font-size: 13px;
+            color: #6B7280;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            gap: 12px;
+            flex-wrap: wrap;
+        }
+
+        .footer-links a {
+            color: #0066FF;
+            text-decoration: none;
+            transition: color 0.2s;
+        }
+
+        .footer-links a:hover {
+            color: #1E48D9;
+        }
+
+        .footer-links .separator {
+            color: #D1D5DB;
+        }
+
+        @media (max-width: 640px) {
+            .header, .footer {
+                padding: 20px 24px;
+            }
+
+            .container {
+                padding: 36px 28px;
+            }
+
+            h1 {
+                font-size: 24px;
+            }
+
+            .subtitle {
+                font-size: 15px;
+            }
+        }
+    </style>
+</head>
+<body>
+    <!-- Background decorative pattern with logos -->
+    <div class="bg-pattern">
+        <div class="bg-logo large-1"></div>
+        <div class="bg-logo large-2"></div>
+        <div class="bg-logo large-3"></div>
+        <div class="bg-logo medium-1"></div>
+        <div class="bg-logo medium-2"></div>
+        <div class="bg-logo medium-3"></div>
+        <div class="bg-logo small-1"></div>
+        <div class="bg-logo small-2"></div>
+        <div class="bg-logo small-3"></div>
+        <div class="bg-logo small-4"></div>
+    </div>
+
+    <header class="header">
+        <div class="logo-container">
+            <div class="logo">
+                <img src="{{ logo_url }}" alt="Franklink Logo">
+            </div>
+            <div class="logo-text">Franklink</div>
+        </div>
+    </header>
+
+    <div class="main-content">
+        <div class="container">
+            <div class="success-icon">
+                <svg viewBox="0 0 24 24">
+                    <polyline points="20 6 9 17 4 12"></polyline>
+                </svg>
+            </div>
+            <h1>Great! You're all set!</h1>
+            <p class="subtitle">We've successfully and securely connected your account.</p>
+            <div class="email-badge">{{ email }}</div>
+            <p class="redirect-message" id="redirect-message">
+                Redirecting to iMessage in <span id="countdown">2</span> seconds...
+            </p>
+        </div>
+    </div>
+
+    <footer class="footer">
+        <div class="footer-links">
+            <a href="https://franklink.ai">franklink.ai</a>
+            <span class="separator">•</span>
+            <a href="https://franklink.ai/privacy">Privacy</a>
+            <span class="separator">•</span>
+            <a href="https://franklink.ai/terms.html">Terms of Service</a>
+        </div>
+    </footer>
+
+    <script>
+        // Auto-redirect to iMessage after 2 seconds
+        let countdown = 2;
+        const redirectMessage = document.getElementById('redirect-message');
+        const countdownSpan = document.getElementById('countdown');
+
+        const interval = setInterval(() => {
+            countdown--;
+            countdownSpan.textContent = countdown;
+
+            if (countdown === 0) {
+                clearInterval(interval);
+                redirectMessage.textContent = 'Redirecting now...';
+                window.location.href = '{{ imessage_url }}';
+            }
+        }, 1000);
+    </script>
+</body>
+</html>
+""")
+
+ERROR_PAGE = Template("""\
+<!DOCTYPE html>
+<html>
+<head>
+    <title>{{ title }}</title>
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+    <style>
+        body {
+            font-family: 'Figtree', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            min-height: 100vh;
+            margin: 0;
+            background: #f0f2f5;
+        }
+        .container {
+            background: white;
+            padding: 40px;
+            border-radius: 12px;
+            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+            max-width: 400px;
+            text-align: center;
+        }
+        .error-icon {
+            width: 80px;
+            height: 80px;
+            margin: 0 auto 20px;
+            background: #f44336;
+            border-radius: 50%;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            font-size: 50px;
+            color: white;
+        }
+        h1 {
+            color: #333;
+            font-size: 24px;
+            margin-bottom: 10px;
+        }
+        p {
+            color: #666;
+            line-height: 1.6;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="error-icon">✕</div>
+        <h1>{{ title }}</h1>
+        <p>{{ message }}</p>
+        <p>You can close this page and try again.</p>
+    </div>
+</body>
+</html>
+""")
+
+CONVERSATION_BUBBLE = Template("""\
+<div class="bubble" style="text-align: {{ align }};">
+    <div class="bubble-inner" style="background: {{ bg }}; border-left: 3px solid {{ accent }}; {{ margin }}">
+        <div class="speaker" style="color: {{ accent }};">{{ speaker }}</div>
+        <div class="content">{{ content }}</div>
+    </div>
+</div>
+""")
+
+CONVERSATION_PAGE = Template("""\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no">
+    <title>{{ title }}</title>
+    <meta property="og:title" content="{{ title }}">
+    <meta property="og:description" content="{{ teaser }}">
+    <meta property="og:type" content="article">
+    <style>
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Text', 'Helvetica Neue', sans-serif;
+            background: #f5f5f7;
+            color: #1a1a1a;
+            -webkit-font-smoothing: antialiased;
+        }
+        .header {
+            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
+            padding: 24px 20px 20px;
+            text-align: center;
+        }
+        .header-logo {
+            font-size: 13px;
+            font-weight: 700;
+            letter-spacing: 1.5px;
+            text-transform: uppercase;
+            color: rgba(255,255,255,0.5);
+            margin-bottom: 8px;
+        }
+        .header-title {
+            font-size: 20px;
+            font-weight: 700;
+            color: #fff;
+            line-height: 1.3;
+        }
+        .teaser {
+            background: #fff;
+            padding: 16px 20px;
+            font-size: 14px;
+            line-height: 1.5;
+            color: #555;
+            border-bottom: 1px solid #e5e5e7;
+        }
+        .conversation {
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px 16px 40px;
+        }
+        .bubble {
+            margin-bottom: 16px;
+        }
+        .bubble-inner {
+            display: inline-block;
+            max-width: 85%;
+            padding: 12px 16px;
+            border-radius: 16px;
+        }
+        .speaker {
+            font-size: 12px;
+            font-weight: 600;
+            margin-bottom: 4px;
+        }
+        .content {
+            font-size: 15px;
+            line-height: 1.5;
+            white-space: pre-wrap;
+        }
+        .footer {
+            text-align: center;
+            padding: 20px;
+            font-size: 12px;
+            color: #999;
+        }
+        .footer a {
+            color: #1A73E8;
+            text-decoration: none;
+        }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <div class="header-logo">FRANKLINK</div>
+        <h1 class="header-title">{{ title }}</h1>
+    </div>
+    <div class="teaser">{{ teaser }}</div>
+    <div class="conversation">
+        {{ bubbles }}
+    </div>
+    <footer class="footer">
+        Conversation generated by <a href="https://franklink.ai">Franklink</a> AI agents
+    </footer>
+</body>
+</html>
+""")
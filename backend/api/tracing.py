@@ -0,0 +1,180 @@
+"""
+Per-request span trees, reported as Server-Timing and in a slow-request log.
+
+``TracingMiddleware`` opens a trace for every HTTP request; code inside the
+request marks phases with ``with span("token_exchange"):``. Spans nest by
+context (a contextvar), so dependency timers inside a phase become its
+children, and tasks spawned by the request inherit its trace.
+
+Finished spans go out in the ``Server-Timing`` response header, so browser
+devtools show the breakdown per request. A request slower than
+SLOW_REQUEST_THRESHOLD_MS is logged as one JSON line with the full tree on
+the ``franklink.slow_requests`` logger.
+
+Outside a request (background scripts, startup) ``span`` does nothing.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING", "true").lower() in ("1", "true", "yes")
+SLOW_REQUEST_THRESHOLD_MS = float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "1000"))
+# Bounds per request, so a large batch can't build an unbounded tree/header
+MAX_SPANS = 256
+MAX_SERVER_TIMING_ENTRIES = 32
+
+slow_request_logger = logging.getLogger("franklink.slow_requests")
+
+_current_span: ContextVar["Span | None"] = ContextVar("franklink_current_span", default=None)
+
+_TOKEN_RE = re.compile(r"[^!#$%&'*+\-.^_`|~0-9A-Za-z]")
+
+
+class Trace:
+    """Span budget shared by one request's tree."""
+
+    __slots__ = ("spans", "dropped")
+
+    def __init__(self):
+        self.spans = 0
+        self.dropped = 0
+
+
+class Span:
+    __slots__ = ("name", "description", "started", "ended", "children", "trace")
+
+    def __init__(self, name: str, description: str, trace: Trace):
+        self.name = name
+        self.description = description
+        self.started = time.perf_counter()
+        self.ended = None
+        self.children = []
+        self.trace = trace
+
+    @property
+    def duration(self) -> float:
+        return (self.ended if self.ended is not None else time.perf_counter()) - self.started
+
+    def to_dict(self, origin: float) -> dict:
+        node = {
+            "name": self.name,
+            "start_ms": round((self.started - origin) * 1000, 3),
+            "duration_ms": round(self.duration * 1000, 3),
+        }
+        if self.description:
+            node["desc"] = self.description
+        if self.ended is None:
+            node["unfinished"] = True
+        if self.children:
+            node["children"] = [child.to_dict(origin) for child in self.children]
+        return node
+
+
+@contextmanager
+def span(name: str, description: str = ""):
+    """Record a phase of the current request as a child of the enclosing span."""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    trace = parent.trace
+    if trace.spans >= MAX_SPANS:
+        trace.dropped += 1
+        yield None
+        return
+    trace.spans += 1
+
+    current = Span(name, description, trace)
+    parent.children.append(current)
+    token = _current_span.set(current)
+    try:
+        yield current
+    finally:
+        current.ended = time.perf_counter()
+        _current_span.reset(token)
+
+
+def finished_spans() -> dict:
+    """Name -> seconds for the finished child spans of the current span."""
+    parent = _current_span.get()
+    if parent is None:
+        return {}
+    return {child.name: child.duration for child in parent.children if child.ended is not None}
+
+
+def _server_timing_entry(s: Span) -> str:
+    entry = f"{_TOKEN_RE.sub('_', s.name)};dur={s.duration * 1000:.1f}"
+    if s.description:
+        entry += ';desc="' + s.description.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return entry
+
+
+def server_timing(root: Span) -> str:
+    """Header value for the finished spans under root, depth first."""
+    entries = []
+    pending = list(reversed(root.children))
+    while pending and len(entries) < MAX_SERVER_TIMING_ENTRIES:
+        s = pending.pop()
+        if s.ended is not None:
+            entries.append(_server_timing_entry(s))
+        pending.extend(reversed(s.children))
+    entries.append(f"total;dur={root.duration * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class TracingMiddleware:
+    """ASGI middleware that owns the per-request trace."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        root = Span("request", "", Trace())
+        token = _current_span.set(root)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if SERVER_TIMING_ENABLED:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", server_timing(root).encode("latin-1")))
+                    message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                root.ended = time.perf_counter()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_span.reset(token)
+            if root.ended is None:
+                root.ended = time.perf_counter()
+            if root.duration * 1000 >= SLOW_REQUEST_THRESHOLD_MS:
+                log_slow_request(scope, status, root)
+
+
+def log_slow_request(scope, status: int, root: Span) -> None:
+    # Path only: query strings carry OAuth codes and state tokens
+    record = {
+        "event": "slow_request",
+        "method": scope["method"],
+        "path": scope["path"],
+        "status": status,
+        "duration_ms": round(root.duration * 1000, 3),
+        "threshold_ms": SLOW_REQUEST_THRESHOLD_MS,
+        "spans": [child.to_dict(root.started) for child in root.children],
+    }
+    if root.trace.dropped:
+        record["dropped_spans"] = root.trace.dropped
+    slow_request_logger.warning(json.dumps(record, separators=(",", ":")))
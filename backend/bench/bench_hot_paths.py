@@ -0,0 +1,214 @@
+"""
+Micro-benchmarks for the API's pure hot paths, checked against a baseline.
+
+Measures time per call (best of several timing runs) and peak traced memory
+per call (tracemalloc) for:
+
+    render_success_page, render_error_page,
+    render_conversation_page (10 .. 2000 turns),
+    normalize_phone, id_token_email
+
+and compares each with ``baseline_hot_paths.json``. Exits non-zero if any
+case is slower or allocates more than the threshold allows, so a change can
+be measured before it is accepted.
+
+Each case is timed next to a fixed calibration workload and compared by its
+ratio to it, which absorbs most of the difference between machines and
+between a quiet and a busy host. A case that looks slow is re-measured
+before it counts as a regression. Re-record the baseline after an
+intentional change.
+
+Usage (from the repository root):
+    python -m backend.bench.bench_hot_paths                    # compare
+    python -m backend.bench.bench_hot_paths --update-baseline  # record
+    python -m backend.bench.bench_hot_paths --only conversation
+"""
+
+import argparse
+import base64
+import gc
+import json
+import logging
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+
+logging.disable(logging.WARNING)
+
+from backend.api import main  # noqa: E402
+from backend.bench.bench_templates import sample_turns  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_hot_paths.json")
+DEFAULT_TIME_THRESHOLD = 0.25    # fail if >25% slower than baseline
+DEFAULT_MEMORY_THRESHOLD = 0.10  # fail if >10% more peak memory
+MEMORY_SLACK_BYTES = 1024        # ignore allocator noise on tiny cases
+TIME_BUDGET = 0.1                # seconds per timing run
+REPEAT = 9                       # timing runs per case; the fastest counts
+CONFIRM_RUNS = 3                 # re-measure a slow case before calling it a regression
+
+
+def calibration_workload():
+    """Fixed pure-Python work that the case timings are normalized against."""
+    data = {"turns": [{"speaker_name": f"agent {i}", "content": "x" * (i % 50)} for i in range(40)]}
+    return sorted(json.dumps(data)).count("x")
+
+
+def _id_token(claims: dict) -> str:
+    def segment(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+    signature = base64.urlsafe_b64encode(os.urandom(256)).rstrip(b"=").decode()
+    return f"{segment({'alg': 'RS256', 'kid': 'bench', 'typ': 'JWT'})}.{segment(claims)}.{signature}"
+
+
+def build_cases() -> dict:
+    """Case name -> zero-argument callable."""
+    id_token = _id_token({
+        "iss": "https://accounts.google.com",
+        "aud": "bench.apps.googleusercontent.com",
+        "sub": "109876543210987654321",
+        "email": "student@example.edu",
+        "email_verified": True,
+        "iat": 1700000000,
+        "exp": 1700003600,
+    })
+    cases = {
+        "render_success_page": lambda: main.render_success_page("student@example.edu"),
+        "render_error_page": lambda: main.render_error_page(
+            "Authorization Failed", "Something went wrong. Please try again."),
+        "normalize_phone[formatted]": lambda: main.normalize_phone("(503) 741-0940"),
+        "normalize_phone[e164]": lambda: main.normalize_phone("+15037410940"),
+        "id_token_email": lambda: main.id_token_email(id_token),
+    }
+    for n in (10, 100, 500, 2000):
+        conversation = {"turns": sample_turns(n), "teaser_summary": "Why they should meet"}
+        cases[f"render_conversation_page[{n}]"] = (
+            lambda conversation=conversation: main.render_conversation_page(conversation)
+        )
+    return cases
+
+
+def time_per_call(fn) -> float:
+    """Best-of-REPEAT seconds per call."""
+    fn()  # warm caches and lazy imports
+    number, elapsed = 1, 0.0
+    while elapsed < TIME_BUDGET / 5:
+        number *= 2
+        elapsed = timeit.timeit(fn, number=number)
+    number = max(1, int(number * TIME_BUDGET / elapsed))
+    return min(timeit.repeat(fn, number=number, repeat=REPEAT)) / number
+
+
+def measure(fn) -> dict:
+    """Seconds per call, adjacent calibration time and peak traced bytes for one call."""
+    calibration = time_per_call(calibration_workload)
+    seconds = time_per_call(fn)
+    calibration = min(calibration, time_per_call(calibration_workload))
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline_current, _ = tracemalloc.get_traced_memory()
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        del result
+    finally:
+        tracemalloc.stop()
+    return {"seconds": seconds, "calibration_seconds": calibration, "peak_bytes": peak - baseline_current}
+
+
+def load_baseline() -> dict:
+    try:
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def machine() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(terse=True),
+        "machine": platform.machine(),
+    }
+
+
+def relative_time(result: dict, base: dict) -> float:
+    """Case time vs baseline, both normalized by their calibration time."""
+    return (result["seconds"] / result["calibration_seconds"]) / (base["seconds"] / base["calibration_seconds"])
+
+
+def compare(name: str, result: dict, base: dict | None, time_threshold: float, memory_threshold: float) -> list:
+    """Regression messages for one case (empty if within thresholds)."""
+    if not base:
+        return []
+    failures = []
+    time_ratio = relative_time(result, base)
+    if time_ratio > 1 + time_threshold:
+        failures.append(f"{name}: {time_ratio:.2f}x baseline time")
+    allowed_bytes = base["peak_bytes"] * (1 + memory_threshold) + MEMORY_SLACK_BYTES
+    if result["peak_bytes"] > allowed_bytes:
+        failures.append(f"{name}: peak memory {result['peak_bytes']} B vs baseline {base['peak_bytes']} B")
+    return failures
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--update-baseline", action="store_true", help="record results as the new baseline")
+    parser.add_argument("--only", default="", help="run cases whose name contains this text")
+    parser.add_argument("--time-threshold", type=float, default=DEFAULT_TIME_THRESHOLD)
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD)
+    args = parser.parse_args()
+
+    baseline = load_baseline()
+    base_cases = baseline.get("cases", {})
+    if baseline and not args.update_baseline and baseline.get("machine") != machine():
+        print(f"note: baseline was recorded on {baseline.get('machine')}; timings may not be comparable")
+
+    cases = {name: fn for name, fn in build_cases().items() if args.only in name}
+    results = {}
+    for name, fn in cases.items():
+        result = measure(fn)
+        if not args.update_baseline:
+            # A busy host produces one-off slow measurements; only a case
+            # that stays slow when measured again counts as a regression
+            for _ in range(CONFIRM_RUNS):
+                if not compare(name, result, base_cases.get(name), args.time_threshold, args.memory_threshold):
+                    break
+                again = measure(fn)
+                if relative_time(again, result) < 1:
+                    result = again
+        results[name] = result
+
+    failures = []
+    print(f"{'case':<32} {'us/call':>10} {'vs base':>8} {'peak KB':>9} {'baseline':>9}")
+    for name, result in results.items():
+        base = base_cases.get(name)
+        print(f"{name:<32} {result['seconds'] * 1e6:10.2f} "
+              f"{relative_time(result, base) if base else float('nan'):7.2f}x "
+              f"{result['peak_bytes'] / 1024:9.1f} "
+              f"{base['peak_bytes'] / 1024 if base else float('nan'):9.1f}")
+        failures += compare(name, result, base, args.time_threshold, args.memory_threshold)
+
+    if args.update_baseline:
+        merged = {**base_cases, **results} if args.only else results
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"machine": machine(), "cases": merged}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {os.path.relpath(BASELINE_PATH)}")
+        return
+
+    if failures:
+        print("FAIL: regressions beyond threshold")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("OK: within thresholds" if base_cases else "No baseline yet: run with --update-baseline")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,123 @@
+"""
+Benchmark for the server-side connection-graph layout (backend/api/layout.py).
+
+Builds synthetic networks of 50 to 5,000 nodes through graph.build_graph
+(1:1 connections plus group chats whose members are partly existing
+connections), and reports per size:
+
+    cold    layout from scratch (what a user's first /graph request pays)
+    warm    re-layout after ~1% of nodes are added, seeded with the cold
+            layout (what a request pays after a few new chats)
+    moved   median distance existing nodes moved in the warm run
+    overlap node pairs closer than the sum of their radii
+    stretch median link length over its target length
+
+Times are the median over runs. Results are deterministic per size.
+
+Usage (from the repository root):
+    python -m backend.bench.bench_layout
+    python -m backend.bench.bench_layout --sizes 50 500 5000 --runs 5
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+import numpy as np
+
+from backend.api import graph, layout
+
+DEFAULT_SIZES = (50, 100, 250, 500, 1000, 2000, 5000)
+
+
+def network(size: int, seed: int = 0, extra: int = 0) -> dict:
+    """
+    About size nodes: 60% direct connections, the rest group chats and
+    group-only members. extra adds that many more direct connections.
+    """
+    rnd = random.Random(seed)
+    me = "u-me"
+    users = [{"id": me, "name": "Me"}]
+    chats, participants = [], []
+
+    def chat(guid: str, members: list[str]):
+        chats.append({"chat_guid": guid, "member_count": len(members) + 1, "display_name": None})
+        participants.extend({"chat_guid": guid, "user_id": uid} for uid in [me] + members)
+
+    direct = [f"u-d{i}" for i in range(int(size * 0.6))]
+    for uid in direct + [f"u-x{i}" for i in range(extra)]:
+        users.append({"id": uid, "name": f"Connection {uid}"})
+        chat(f"c-{uid}", [uid])
+
+    nodes, group = len(direct) + 1, 0
+    while nodes < size:
+        members = []
+        for m in range(rnd.randint(3, 12)):
+            if rnd.random() < 0.5:
+                members.append(rnd.choice(direct))
+            else:
+                uid = f"u-g{group}-{m}"
+                users.append({"id": uid, "name": f"Member {uid}"})
+                members.append(uid)
+                nodes += 1
+        chat(f"g-{group}", sorted(set(members)))
+        nodes += 1
+        group += 1
+
+    return graph.build_graph({"chats": chats, "participants": participants, "users": users}, me)
+
+
+def quality(built: dict, positions: dict) -> tuple[int, float]:
+    """(overlapping node pairs, median link stretch)."""
+    ids = [node["id"] for node in built["nodes"]]
+    pos = np.array([positions[node_id] for node_id in ids])
+    radii = np.array([layout.RADIUS["me" if node_id == layout.ME else node["type"]]
+                      for node_id, node in zip(ids, built["nodes"])])
+    overlaps = 0
+    for start in range(0, len(ids), 512):
+        block = pos[start:start + 512]
+        dist = np.sqrt(((block[:, None, :] - pos[None, :, :]) ** 2).sum(axis=2))
+        close = dist < radii[start:start + 512, None] + radii[None, :]
+        close[np.arange(len(block)), np.arange(start, start + len(block))] = False
+        overlaps += int(close.sum())
+    index = {node_id: i for i, node_id in enumerate(ids)}
+    stretch = [
+        np.hypot(*(pos[index[link["source"]]] - pos[index[link["target"]]])) / layout.LINK_DISTANCE[link["type"]]
+        for link in built["links"]
+    ]
+    return overlaps // 2, float(np.median(stretch)) if stretch else 0.0
+
+
+def timed(fn, runs: int):
+    times, result = [], None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times), result
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="node counts to lay out")
+    parser.add_argument("--runs", type=int, default=3, help="timing runs per case")
+    args = parser.parse_args()
+
+    print(f"{'nodes':>6} {'links':>6} {'cold ms':>9} {'warm ms':>9} {'moved px':>9} {'overlap':>8} {'stretch':>8}")
+    for size in args.sizes:
+        built = network(size)
+        cold_seconds, cold = timed(lambda: layout.layout_graph(built["nodes"], built["links"]), args.runs)
+
+        grown = network(size, extra=max(1, size // 100))
+        warm_seconds, warm = timed(lambda: layout.layout_graph(grown["nodes"], grown["links"], cold), args.runs)
+        moved = statistics.median(
+            float(np.hypot(*(np.array(warm[node_id]) - cold[node_id]))) for node_id in cold
+        )
+        overlaps, stretch = quality(built, cold)
+        print(f"{len(built['nodes']):6d} {len(built['links']):6d} {cold_seconds * 1000:9.1f} "
+              f"{warm_seconds * 1000:9.1f} {moved:9.1f} {overlaps:8d} {stretch:8.2f}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,115 @@
+"""
+Cold-start import benchmark for the Vercel entry point, with a budget check.
+
+Imports the entry module (``api.index`` by default) in fresh interpreters
+under ``python -X importtime``, and reports:
+
+    total import time of the entry module (median over runs)
+    self time per top-level package, largest first
+
+Fails if the median total exceeds the budget, or if any module that is
+meant to load on first use (Supabase, Google OAuth, httpx, dotenv, NumPy) was
+imported at startup.
+
+Usage (from the repository root):
+    python -m backend.bench.bench_startup
+    python -m backend.bench.bench_startup --runs 9 --budget-ms 900 --top 20
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_ENTRY = "api.index"
+DEFAULT_RUNS = 5
+# Median import time of the entry module. Most of it is FastAPI/pydantic,
+# which every request needs; the deferred modules below must stay out of it.
+DEFAULT_BUDGET_MS = 1000
+# Imported by the app on first use only
+DEFERRED_MODULES = ("google_auth_oauthlib", "supabase", "postgrest", "gotrue", "httpx", "dotenv", "requests",
+                    "numpy")
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_times(entry: str) -> list[tuple[str, int, int, int]]:
+    """(module, self us, cumulative us, depth) for one fresh import of entry."""
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONIMPORTTIME"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {entry}"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"importing {entry} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def summarize(rows: list) -> dict:
+    packages = defaultdict(int)
+    for module, self_us, _, _ in rows:
+        packages[module.split(".")[0]] += self_us
+    return {
+        "modules": {module for module, _, _, _ in rows},
+        "packages": dict(packages),
+    }
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entry", default=DEFAULT_ENTRY, help="module to import (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="fresh interpreters to measure")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="fail if the median import time exceeds this")
+    parser.add_argument("--top", type=int, default=15, help="packages to list")
+    args = parser.parse_args()
+
+    totals, package_runs, imported = [], defaultdict(list), set()
+    for _ in range(args.runs):
+        rows = import_times(args.entry)
+        total = next(cumulative for module, _, cumulative, _ in rows if module == args.entry)
+        totals.append(total / 1000)
+        summary = summarize(rows)
+        imported |= summary["modules"]
+        for package, self_us in summary["packages"].items():
+            package_runs[package].append(self_us / 1000)
+
+    median_total = statistics.median(totals)
+    print(f"{args.entry}: {median_total:.1f} ms median over {args.runs} runs "
+          f"(min {min(totals):.1f}, max {max(totals):.1f})")
+    print(f"\n{'package':<28} {'self ms':>9} {'share':>7}")
+    package_medians = sorted(
+        ((package, statistics.median(times + [0.0] * (args.runs - len(times))))
+         for package, times in package_runs.items()),
+        key=lambda item: item[1], reverse=True,
+    )
+    for package, ms in package_medians[:args.top]:
+        print(f"{package:<28} {ms:9.1f} {ms / median_total:7.1%}")
+
+    failures = []
+    eager = sorted(m for m in DEFERRED_MODULES if m in imported)
+    if eager:
+        failures.append(f"imported at startup but should load on first use: {', '.join(eager)}")
+    if median_total > args.budget_ms:
+        failures.append(f"import time {median_total:.1f} ms is over the {args.budget_ms:g} ms budget")
+
+    if failures:
+        print("\nFAIL:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"\nOK: within {args.budget_ms:g} ms budget, no deferred modules imported at startup")
+
+
+if __name__ == "__main__":
+    main_cli()
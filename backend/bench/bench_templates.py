@@ -0,0 +1,87 @@
+"""
+Micro-benchmark: precompiled templates vs. per-call f-string rendering.
+
+The f-string baseline is the frozen copy of the old renderers in
+``fstring_pages``: every call formats the whole document as a ``str`` and
+encodes it to UTF-8 (what ``HTMLResponse`` did with it), with conversation
+bubbles accumulated via ``+=``. Edits to templates.py change only the
+"template" numbers.
+
+Usage (from the repository root):
+    python -m backend.bench.bench_templates [--number N]
+"""
+
+import argparse
+import html
+import logging
+import timeit
+
+logging.disable(logging.WARNING)
+
+from backend.api import main, templates  # noqa: E402
+from backend.bench import fstring_pages  # noqa: E402
+
+
+def fstring_conversation(turns: list, teaser: str) -> bytes:
+    return fstring_pages.render_conversation_page({"turns": turns, "teaser_summary": teaser})
+
+
+def template_conversation(turns: list, teaser: str) -> bytes:
+    return main.render_conversation_html({"turns": turns, "teaser_summary": teaser})
+
+
+def sample_turns(count: int) -> list:
+    return [
+        {
+            "speaker_name": "Ada's Agent" if i % 2 == 0 else "Grace's Agent",
+            "content": f"Turn {i}: both of them are into <systems> & compilers. " * 3,
+        }
+        for i in range(count)
+    ]
+
+
+def _bench(label: str, fn, number: int) -> float:
+    per_call = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f"  {label:<10} {per_call * 1e6:10.1f} us/call")
+    return per_call
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2000, help="calls per timing run")
+    args = parser.parse_args()
+
+    # Sanity check: both paths render the same content (the markup has
+    # moved on since the baseline was frozen, so not byte-for-byte)
+    turns = sample_turns(20)
+    for document in (fstring_conversation(turns, "t"), template_conversation(turns, "t")):
+        assert html.escape("Why Ada & Grace should connect").encode() in document
+        assert all(html.escape(turn["content"]).encode() in document for turn in turns)
+    for document in (fstring_pages.render_success_page("a@b.co"), main.SUCCESS_PAGE.render(email="a@b.co")):
+        assert b"a@b.co" in document
+
+    cases = [
+        ("success page", args.number, lambda: fstring_pages.render_success_page("student@example.edu"),
+         lambda: main.SUCCESS_PAGE.render(email="student@example.edu")),
+        ("error page", args.number,
+         lambda: fstring_pages.render_error_page("Authorization Failed", "Something went wrong"),
+         lambda: templates.ERROR_PAGE.render(title="Authorization Failed", message="Something went wrong")),
+    ]
+    for n in (10, 100, 1000):
+        turns = sample_turns(n)
+        cases.append((
+            f"conversation ({n} turns)",
+            max(args.number // n, 10),
+            lambda turns=turns: fstring_conversation(turns, "teaser"),
+            lambda turns=turns: template_conversation(turns, "teaser"),
+        ))
+
+    for label, number, baseline, candidate in cases:
+        print(label)
+        before = _bench("f-string", baseline, number)
+        after = _bench("template", candidate, number)
+        print(f"  speedup    {before / after:10.2f}x")
+
+
+if __name__ == "__main__":
+    main_cli()
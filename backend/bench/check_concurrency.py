@@ -0,0 +1,109 @@
+"""
+Check that concurrent requests overlap instead of serializing on the event loop.
+
+Replaces the Supabase client with a stand-in whose ``execute()`` blocks for
+a fixed delay (like a real network round trip), fires N concurrent
+``/c/{slug}`` requests at the ASGI app and compares the wall time with the
+fully-serialized time (N x delay). Exits non-zero if the requests did not
+overlap.
+
+Usage (from the repository root):
+    python -m backend.bench.check_concurrency [--requests N] [--delay SECONDS]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+
+import httpx
+
+logging.disable(logging.WARNING)
+
+from backend.api import main  # noqa: E402
+
+
+class _SlowResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class _SlowQuery:
+    """Minimal postgrest query-builder stand-in with a blocking execute()."""
+
+    def __init__(self, delay: float):
+        self._delay = delay
+        self._slug = None
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def eq(self, column, value):
+        if column == "slug":
+            self._slug = value
+        return self
+
+    def limit(self, *args, **kwargs):
+        return self
+
+    def maybe_single(self):
+        return self
+
+    def execute(self):
+        time.sleep(self._delay)
+        return _SlowResponse({
+            "slug": self._slug,
+            "teaser_summary": "Concurrency check",
+            "turns": [{"speaker_name": "Ada's Agent", "content": "hello"}],
+        })
+
+
+class _SlowSupabase:
+    def __init__(self, delay: float):
+        self._delay = delay
+
+    def table(self, name):
+        return _SlowQuery(self._delay)
+
+
+async def run(requests: int, delay: float) -> float:
+    slow_supabase = _SlowSupabase(delay)
+    main.get_supabase = lambda: slow_supabase
+    main.conversation_cache.clear()
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://check") as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(
+            client.get(f"/c/check{i}") for i in range(requests)
+        ))
+        elapsed = time.perf_counter() - started
+
+    assert all(r.status_code == 200 for r in responses), [r.status_code for r in responses]
+    return elapsed
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=8)
+    parser.add_argument("--delay", type=float, default=0.2, help="simulated Supabase round trip (s)")
+    args = parser.parse_args()
+
+    requests = min(args.requests, main.db.BLOCKING_IO_THREADS)
+    elapsed = asyncio.run(run(requests, args.delay))
+    serialized = requests * args.delay
+
+    print(f"{requests} concurrent requests, {args.delay * 1000:.0f} ms simulated round trip")
+    print(f"  wall time:       {elapsed * 1000:8.1f} ms")
+    print(f"  if serialized:   {serialized * 1000:8.1f} ms")
+
+    # Fully overlapped requests take ~1 round trip; allow generous slack
+    if elapsed > max(serialized / 2, args.delay * 2):
+        print("FAIL: requests serialized on the event loop")
+        sys.exit(1)
+    print("OK: requests overlapped")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,77 @@
+"""
+Check that the OAuth callback rejects bad ``state`` values cleanly.
+
+Sends forged, garbage and non-ASCII states to ``/oauth/google/callback``
+on the ASGI app and expects every one to get the invalid-state page
+("Authorization Expired") rather than the generic error page. A valid
+signed state must get past the check, and replaying it must not. Exits
+non-zero on any mismatch.
+
+Usage (from the repository root):
+    python -m backend.bench.check_oauth_state
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+
+import httpx
+
+logging.disable(logging.ERROR)
+
+from backend.api import main, oauth_state  # noqa: E402
+
+INVALID_PAGE = "Authorization Expired"
+BAD_STATES = [
+    "x",
+    ".",
+    "é.é",
+    "abc.ÿÿ",
+    "%ff%fe.%00",
+    "eyJ1IjoxfQ.☃",
+    "\u200b" * 64 + "." + "A" * 43,
+]
+
+
+async def callback(client, state: str) -> str:
+    response = await client.get("/oauth/google/callback", params={"code": "check", "state": state})
+    return response.text
+
+
+async def run() -> list[str]:
+    # No Supabase: a state that passes verification ends on the generic page
+    main.get_supabase = lambda: None
+    failures = []
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://check") as client:
+        for state in BAD_STATES:
+            if INVALID_PAGE not in await callback(client, state):
+                failures.append(f"bad state {state!r} was not rejected as invalid")
+
+        valid = oauth_state.sign_state("check-user", main.OAUTH_STATE_SECRET)
+        forged = valid[:-1] + ("A" if valid[-1] != "A" else "B")
+        if INVALID_PAGE not in await callback(client, forged):
+            failures.append("state with a forged signature was not rejected")
+        if INVALID_PAGE in await callback(client, valid):
+            failures.append("valid state was rejected")
+        if main.OAUTH_STATE_REPLAY_CHECK and INVALID_PAGE not in await callback(client, valid):
+            failures.append("replayed state was not rejected")
+    return failures
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    failures = asyncio.run(run())
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"OK: {len(BAD_STATES) + 1} bad states rejected, valid state accepted once")
+
+
+if __name__ == "__main__":
+    main_cli()
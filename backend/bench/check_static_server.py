@@ -0,0 +1,184 @@
+"""
+Check server.py's production handler against a slow client and private paths.
+
+Starts the production server on a temporary site directory and:
+
+  - downloads a large file through a socket with a small receive buffer
+    that reads slowly at first, so the server's send buffer fills up.
+    The body must arrive complete and byte-identical.
+  - requests source-tree paths (.git/, backend/, *.py, *.log, ...), which
+    must all be 404, while ordinary pages still load.
+  - leaves more idle keep-alive connections open than there are workers;
+    a new client must still be answered at once. Sequential and pipelined
+    requests on one keep-alive connection must all be answered.
+
+Exits non-zero on any failure.
+
+Usage (from the repository root):
+    python -m backend.bench.check_static_server [--size-mb N]
+"""
+
+import argparse
+import hashlib
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+import server
+
+PRIVATE_PATHS = [
+    "/.git/config",
+    "/.env",
+    "/backend/.env.example",
+    "/backend/api/main.py",
+    "/backend/",
+    "/supabase/account.sql",
+    "/build/images/manifest.json",
+    "/build.py",
+    "/api.log",
+]
+PUBLIC_PATHS = ["/", "/index.html", "/assets/big.bin"]
+
+
+def make_site(root: str, size: int) -> bytes:
+    files = {p: b"private" for p in PRIVATE_PATHS if not p.endswith("/")}
+    files["/index.html"] = b"<!doctype html><title>check</title>"
+    body = os.urandom(size)
+    files["/assets/big.bin"] = body
+    for rel, data in files.items():
+        path = os.path.join(root, rel.lstrip("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+    return body
+
+
+def read_response(reader) -> tuple[int, dict, bytes]:
+    """(status, headers, body) of one response with a Content-Length, from sock.makefile("rb")."""
+    status_line = reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed before headers")
+    status = int(status_line.split()[1])
+    headers = {}
+    while (line := reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    body = reader.read(int(headers.get("content-length", 0)))
+    return status, headers, body
+
+
+def request(port: int, path: str) -> int:
+    with socket.create_connection(("127.0.0.1", port), timeout=10) as sock:
+        sock.sendall(f"GET {path} HTTP/1.1\r\nHost: check\r\nConnection: close\r\n\r\n".encode())
+        with sock.makefile("rb") as reader:
+            return read_response(reader)[0]
+
+
+def check_keepalive(port: int, workers: int) -> list[str]:
+    failures = []
+    idle = []
+    try:
+        # More idle keep-alive connections than workers
+        for _ in range(workers * 2):
+            sock = socket.create_connection(("127.0.0.1", port), timeout=10)
+            reader = sock.makefile("rb")
+            idle.append((sock, reader))
+            sock.sendall(b"GET /index.html HTTP/1.1\r\nHost: check\r\n\r\n")
+            read_response(reader)
+        started = time.perf_counter()
+        status = request(port, "/index.html")
+        waited = time.perf_counter() - started
+        if status != 200 or waited > 1.0:
+            failures.append(f"with {len(idle)} idle keep-alive connections a new request took "
+                            f"{waited:.1f}s (status {status})")
+
+        # Reuse, then two pipelined requests in one write
+        sock, reader = idle[0]
+        sock.sendall(b"GET /index.html HTTP/1.1\r\nHost: check\r\n\r\n")
+        if read_response(reader)[0] != 200:
+            failures.append("second request on a keep-alive connection failed")
+        sock.sendall(b"GET /index.html HTTP/1.1\r\nHost: check\r\n\r\n" * 2)
+        statuses = [read_response(reader)[0], read_response(reader)[0]]
+        if statuses != [200, 200]:
+            failures.append(f"pipelined requests returned {statuses}")
+    except OSError as e:
+        failures.append(f"keep-alive check failed: {e!r}")
+    finally:
+        for sock, reader in idle:
+            reader.close()
+            sock.close()
+    return failures
+
+
+def slow_download(port: int, path: str, slow_seconds: float) -> bytes:
+    """Read slowly through a small receive buffer, then drain the rest."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.settimeout(30)
+    sock.connect(("127.0.0.1", port))
+    with sock:
+        sock.sendall(f"GET {path} HTTP/1.1\r\nHost: check\r\nConnection: close\r\n\r\n".encode())
+        data = b""
+        deadline = time.monotonic() + slow_seconds
+        while time.monotonic() < deadline:
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            data += chunk
+            time.sleep(0.01)
+        while True:
+            chunk = sock.recv(256 * 1024)
+            if not chunk:
+                break
+            data += chunk
+    return data.partition(b"\r\n\r\n")[2]
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=20, help="size of the slow download")
+    parser.add_argument("--slow-seconds", type=float, default=2.0, help="how long the client reads slowly")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as root:
+        body = make_site(root, args.size_mb * 1024 * 1024)
+        server.DIRECTORY = root
+        server.ProductionHTTPRequestHandler.hot_cache = server.HotFileCache()
+        workers = 2
+        httpd = server.ThreadPoolHTTPServer(("127.0.0.1", 0), server.ProductionHTTPRequestHandler, workers)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        port = httpd.server_address[1]
+        try:
+            for path in PRIVATE_PATHS:
+                status = request(port, path)
+                if status != 404:
+                    failures.append(f"{path} returned {status}, expected 404")
+            for path in PUBLIC_PATHS:
+                status = request(port, path)
+                if status != 200:
+                    failures.append(f"{path} returned {status}, expected 200")
+
+            failures += check_keepalive(port, workers)
+
+            received = slow_download(port, "/assets/big.bin", args.slow_seconds)
+            if hashlib.sha256(received).digest() != hashlib.sha256(body).digest():
+                failures.append(f"slow client received {len(received)} of {len(body)} bytes"
+                                f"{' (corrupted)' if len(received) == len(body) else ''}")
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"OK: {len(PRIVATE_PATHS)} private paths 404, idle keep-alive connections hold no worker, "
+          f"{args.size_mb} MB slow download complete")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,327 @@
+"""
+Local stand-ins for Supabase and Google's token endpoint, for load tests.
+
+FakeSupabase answers the PostgREST and Admin API calls the API makes:
+
+    GET  /rest/v1/discovery_conversations?slug=eq.<slug>   (maybe_single)
+    GET  /rest/v1/users?or=(phone_number.eq.<v>,email.eq.<v>)
+    GET  /rest/v1/users?phone_number=eq.<v> | phone_number=in.(...) | email=in.(...)
+                       (rows carry id, phone_number, email; select= picks columns)
+    POST /rest/v1/rpc/complete_google_oauth
+    POST /auth/v1/admin/users
+
+FakeGoogle answers ``POST /token`` with a token response whose ``id_token``
+is a well-formed (but unverifiable) JWT carrying the user's email.
+
+Both are threaded http.server instances on 127.0.0.1 with keep-alive and
+injectable faults (latency, jitter, error rate). The data set is generated
+deterministically from a seed count, so the load generator can build valid
+requests without talking to the fakes.
+"""
+
+import base64
+import http.server
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from urllib.parse import parse_qs, urlsplit
+
+_NAMESPACE = uuid.UUID("6f1c1d3e-8d0e-4f0a-9a53-3f8f0b8c2a11")
+
+
+# ------------------------------------------------------------
+# Data set
+# ------------------------------------------------------------
+
+def user_id(n: int) -> str:
+    return str(uuid.uuid5(_NAMESPACE, f"user-{n}"))
+
+
+def user_phone(n: int) -> str:
+    return f"+1555{n:07d}"
+
+
+def user_email(n: int) -> str:
+    return f"student{n}@example.edu"
+
+
+def conversation_slug(n: int) -> str:
+    return f"bench{n:05d}"  # the API only accepts alphanumeric slugs
+
+
+def conversation_row(n: int, turns: int) -> dict:
+    return {
+        "slug": conversation_slug(n),
+        "teaser_summary": f"Conversation {n}: two founders who should meet",
+        "turns": [
+            {
+                "speaker_name": "Ada's Agent" if i % 2 == 0 else "Grace's Agent",
+                "content": f"Turn {i}: both of them are building <compilers> & tooling. " * 2,
+            }
+            for i in range(turns)
+        ],
+    }
+
+
+@dataclass
+class Faults:
+    """Injected behavior for one fake service."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+
+    def apply(self, handler) -> bool:
+        """Sleep for the configured latency; return True if the request should fail."""
+        delay = self.latency_ms + (random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay > 0:
+            time.sleep(delay / 1000)
+        if self.error_rate and random.random() < self.error_rate:
+            handler.send_json(self.error_status, {"message": "injected failure", "code": "fake"})
+            return True
+        return False
+
+
+class _JSONHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    faults: Faults = Faults()
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status: int, body) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+
+# ------------------------------------------------------------
+# Supabase
+# ------------------------------------------------------------
+
+_OR_EQ_RE = re.compile(r'(\w+)\.eq\.(?:"((?:[^"\\]|\\.)*)"|([^,()]*))')
+_IN_RE = re.compile(r'^in\.\((.*)\)$')
+
+
+def _postgrest_values(raw: str) -> list:
+    values = []
+    for match in re.finditer(r'"((?:[^"\\]|\\.)*)"|([^,]+)', raw):
+        quoted, bare = match.groups()
+        values.append(re.sub(r"\\(.)", r"\1", quoted) if quoted is not None else bare)
+    return values
+
+
+class _SupabaseHandler(_JSONHandler):
+    store = None  # FakeSupabase
+
+    def do_GET(self):
+        if self.faults.apply(self):
+            return
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/rest/v1/discovery_conversations":
+            self._get_conversation(query)
+        elif url.path == "/rest/v1/users":
+            self._get_users(query)
+        else:
+            self.send_json(404, {"message": f"no route for {url.path}"})
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        body = self.read_body()
+        if self.faults.apply(self):
+            return
+        url = urlsplit(self.path)
+        if url.path == "/rest/v1/rpc/complete_google_oauth":
+            params = json.loads(body or b"{}")
+            self.send_json(200, True if self.store.has_user_id(params.get("p_user_id")) else None)
+        elif url.path == "/auth/v1/admin/users":
+            self._create_auth_user(json.loads(body or b"{}"))
+        else:
+            self.send_json(404, {"message": f"no route for {url.path}"})
+
+    def _get_conversation(self, query):
+        slug = query.get("slug", [""])[0].removeprefix("eq.")
+        row = self.store.conversation(slug)
+        if "vnd.pgrst.object" in (self.headers.get("Accept") or ""):
+            if row is None:
+                self.send_json(406, {
+                    "code": "PGRST116",
+                    "details": "The result contains 0 rows",
+                    "hint": None,
+                    "message": "JSON object requested, multiple (or no) rows returned",
+                })
+            else:
+                self.send_json(200, row)
+            return
+        self.send_json(200, [row] if row else [])
+
+    def _get_users(self, query):
+        select = query.get("select", ["*"])[0]
+        rows = []
+        if "or" in query:
+            for column, quoted, bare in _OR_EQ_RE.findall(query["or"][0]):
+                value = re.sub(r"\\(.)", r"\1", quoted) if quoted else bare
+                rows += self.store.users_by(column, [value], select)
+        for column in ("phone_number", "email"):
+            for condition in query.get(column, []):
+                match = _IN_RE.match(condition)
+                values = _postgrest_values(match.group(1)) if match else [condition.removeprefix("eq.")]
+                rows += self.store.users_by(column, values, select)
+        self.send_json(200, rows)
+
+    def _create_auth_user(self, params):
+        if not self.store.has_user_id(params.get("id")):
+            self.send_json(404, {"msg": "User not found"})
+        elif not self.store.claim_auth_user(params["id"]):
+            self.send_json(422, {"msg": "A user with this email address has already been registered"})
+        else:
+            self.send_json(200, {"id": params["id"], "email": params.get("email")})
+
+
+class FakeSupabase:
+    """PostgREST + Admin API stand-in over a generated data set."""
+
+    def __init__(self, users: int = 1000, conversations: int = 200, turns: int = 40, faults: Faults | None = None):
+        self._by_phone = {user_phone(n): n for n in range(users)}
+        self._by_email = {user_email(n): n for n in range(users)}
+        self._ids = {user_id(n) for n in range(users)}
+        self._conversations = {conversation_slug(n): n for n in range(conversations)}
+        self._turns = turns
+        self._auth_users = set()
+        self._lock = threading.Lock()
+        handler = type("SupabaseHandler", (_SupabaseHandler,), {"store": self, "faults": faults or Faults()})
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def conversation(self, slug: str) -> dict | None:
+        n = self._conversations.get(slug)
+        return None if n is None else conversation_row(n, self._turns)
+
+    def users_by(self, column: str, values: list, select: str = "*") -> list:
+        """Rows whose column matches one of values, with only the selected columns."""
+        index = self._by_phone if column == "phone_number" else self._by_email
+        columns = None if select.strip() == "*" else [c.strip() for c in select.split(",")]
+        rows = []
+        for v in values:
+            if v not in index:
+                continue
+            n = index[v]
+            row = {"id": user_id(n), "phone_number": user_phone(n), "email": user_email(n)}
+            rows.append(row if columns is None else {c: row[c] for c in columns if c in row})
+        return rows
+
+    def has_user_id(self, value) -> bool:
+        return value in self._ids
+
+    def claim_auth_user(self, value: str) -> bool:
+        with self._lock:
+            if value in self._auth_users:
+                return False
+            self._auth_users.add(value)
+            return True
+
+    def start(self) -> "FakeSupabase":
+        threading.Thread(target=self.server.serve_forever, daemon=True, name="fake-supabase").start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# ------------------------------------------------------------
+# Google
+# ------------------------------------------------------------
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def fake_id_token(email: str, client_id: str) -> str:
+    """A JWT-shaped token: real header/payload, random 'RS256' signature."""
+    now = int(time.time())
+    header = {"alg": "RS256", "kid": "fake-key", "typ": "JWT"}
+    payload = {
+        "iss": "https://accounts.google.com",
+        "aud": client_id,
+        "sub": str(abs(hash(email))),
+        "email": email,
+        "email_verified": True,
+        "iat": now,
+        "exp": now + 3600,
+    }
+    return ".".join([
+        _b64url(json.dumps(header).encode()),
+        _b64url(json.dumps(payload).encode()),
+        _b64url(os.urandom(256)),
+    ])
+
+
+class _GoogleHandler(_JSONHandler):
+    def do_POST(self):
+        form = parse_qs(self.read_body().decode("utf-8"))
+        if self.faults.apply(self):
+            return
+        if urlsplit(self.path).path != "/token":
+            self.send_json(404, {"error": "not_found"})
+            return
+        code = form.get("code", [""])[0]
+        if not code:
+            self.send_json(400, {"error": "invalid_grant", "error_description": "Missing code"})
+            return
+        # The code doubles as the account: "code-<n>" signs in student<n>
+        n = code.rpartition("-")[2]
+        self.send_json(200, {
+            "access_token": "ya29.fake-" + _b64url(os.urandom(24)),
+            "expires_in": 3599,
+            "refresh_token": "1//fake-" + _b64url(os.urandom(24)),
+            "scope": "openid https://www.googleapis.com/auth/userinfo.email",
+            "token_type": "Bearer",
+            "id_token": fake_id_token(
+                user_email(int(n)) if n.isdigit() else "student@example.edu",
+                form.get("client_id", ["fake-client"])[0],
+            ),
+        })
+
+
+class FakeGoogle:
+    """Google OAuth token endpoint stand-in."""
+
+    def __init__(self, faults: Faults | None = None):
+        handler = type("GoogleHandler", (_GoogleHandler,), {"faults": faults or Faults()})
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+
+    @property
+    def token_uri(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/token"
+
+    def start(self) -> "FakeGoogle":
+        threading.Thread(target=self.server.serve_forever, daemon=True, name="fake-google").start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,618 @@
+"""
+Frozen copy of the f-string page renderers that templates.py replaced.
+
+bench_templates compares the precompiled templates against these, so the
+"before" numbers stay fixed however the templates evolve. Kept verbatim
+(markup, per-call f-string formatting, ``+=`` bubble accumulation), except
+that each renderer returns the UTF-8 bytes HTMLResponse used to produce
+instead of the response itself. Do not edit: this is the baseline.
+"""
+
+import html
+
+from backend.api.main import LOGO_URL
+
+
+def render_success_page(email: str) -> bytes:
+    """Render Franklink success page with logo pattern background and iMessage redirect"""
+    # iMessage redirect URL
+    imessage_url = "sms:+13027242007"
+
+    html_content = f"""
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Authorization Successful - Franklink</title>
+        <link href="https://fonts.googleapis.com/css2?family=Figtree:ital,wght@0,300..900;1,300..900&display=swap" rel="stylesheet">
+        <style>
+            * {{
+                margin: 0;
+                padding: 0;
+                box-sizing: border-box;
+            }}
+
+            body {{
+                font-family: 'Figtree', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+                background: #FAFBFC;
+                min-height: 100vh;
+                display: flex;
+                flex-direction: column;
+                color: #1a1a1a;
+                position: relative;
+                overflow-x: hidden;
+            }}
+
+            /* Decorative background with logo patterns */
+            .bg-pattern {{
+                position: fixed;
+                top: 0;
+                left: 0;
+                width: 100%;
+                height: 100%;
+                pointer-events: none;
+                z-index: 0;
+            }}
+
+            .bg-logo {{
+                position: absolute;
+                opacity: 0.08;
+                background-size: contain;
+                background-repeat: no-repeat;
+                background-position: center;
+                background-image: url('{LOGO_URL}');
+                transition: opacity 0.3s ease;
+            }}
+
+            /* Large logos for corners */
+            .bg-logo.large-1 {{
+                width: 400px;
+                height: 400px;
+                top: -5%;
+                right: -5%;
+                opacity: 0.12;
+                transform: rotate(-15deg);
+            }}
+
+            .bg-logo.large-2 {{
+                width: 450px;
+                height: 450px;
+                bottom: -8%;
+                left: -8%;
+                opacity: 0.10;
+                transform: rotate(20deg);
+            }}
+
+            .bg-logo.large-3 {{
+                width: 380px;
+                height: 380px;
+                top: 50%;
+                right: -10%;
+                opacity: 0.06;
+                transform: translateY(-50%) rotate(-25deg);
+            }}
+
+            /* Medium logos for mid-sections */
+            .bg-logo.medium-1 {{
+                width: 280px;
+                height: 280px;
+                top: 15%;
+                left: 20%;
+                opacity: 0.09;
+                transform: rotate(10deg);
+            }}
+
+            .bg-logo.medium-2 {{
+                width: 250px;
+                height: 250px;
+                bottom: 20%;
+                right: 25%;
+                opacity: 0.08;
+                transform: rotate(-12deg);
+            }}
+
+            .bg-logo.medium-3 {{
+                width: 260px;
+                height: 260px;
+                top: 45%;
+                left: 5%;
+                opacity: 0.07;
+                transform: rotate(18deg);
+            }}
+
+            /* Small logos for scattered effect */
+            .bg-logo.small-1 {{
+                width: 150px;
+                height: 150px;
+                top: 25%;
+                right: 40%;
+                opacity: 0.10;
+            }}
+
+            .bg-logo.small-2 {{
+                width: 140px;
+                height: 140px;
+                top: 70%;
+                left: 35%;
+                opacity: 0.08;
+                transform: rotate(-8deg);
+            }}
+
+            .bg-logo.small-3 {{
+                width: 160px;
+                height: 160px;
+                bottom: 35%;
+                right: 15%;
+                opacity: 0.09;
+                transform: rotate(15deg);
+            }}
+
+            .bg-logo.small-4 {{
+                width: 130px;
+                height: 130px;
+                top: 55%;
+                right: 50%;
+                opacity: 0.06;
+                transform: rotate(-20deg);
+            }}
+
+            .header {{
+                padding: 20px 40px;
+                background: white;
+                border-bottom: 1px solid #F0F0F0;
+                position: relative;
+                z-index: 10;
+            }}
+
+            .logo-container {{
+                display: flex;
+                align-items: center;
+                gap: 12px;
+            }}
+
+            .logo {{
+                width: 45px;
+                height: 45px;
+                position: relative;
+            }}
+
+            .logo img {{
+                width: 100%;
+                height: 100%;
+                object-fit: contain;
+            }}
+
+            .logo-text {{
+                font-size: 24px;
+                font-weight: 700;
+                color: #0A1F44;
+                letter-spacing: -0.5px;
+            }}
+
+            .main-content {{
+                flex: 1;
+                display: flex;
+                align-items: center;
+                justify-content: center;
+                padding: 48px 24px;
+                position: relative;
+                z-index: 1;
+            }}
+
+            .container {{
+                background: white;
+                border-radius: 16px;
+                border: 1px solid #E5E7EB;
+                box-shadow: 0 1px 3px rgba(0, 0, 0, 0.05);
+                max-width: 480px;
+                width: 100%;
+                padding: 48px 40px;
+                text-align: center;
+            }}
+
+            .success-icon {{
+                width: 72px;
+                height: 72px;
+                margin: 0 auto 24px;
+                background: linear-gradient(135deg, #0066FF 0%, #6B8EFF 100%);
+                border-radius: 50%;
+                display: flex;
+                align-items: center;
+                justify-content: center;
+            }}
+
+            .success-icon svg {{
+                width: 40px;
+                height: 40px;
+                stroke: white;
+                stroke-width: 3;
+                fill: none;
+                stroke-linecap: round;
+                stroke-linejoin: round;
+            }}
+
+            h1 {{
+                font-size: 28px;
+                font-weight: 700;
+                color: #1a1a1a;
+                margin-bottom: 12px;
+                letter-spacing: -0.5px;
+            }}
+
+            .subtitle {{
+                font-size: 16px;
+                color: #6B7280;
+                line-height: 1.6;
+                margin-bottom: 24px;
+            }}
+
+            .email-badge {{
+                display: inline-block;
+                background: #F3F4F6;
+                color: #374151;
+                padding: 12px 20px;
+                border-radius: 10px;
+                font-size: 15px;
+                font-weight: 500;
+                margin: 8px 0 24px;
+                word-break: break-all;
+            }}
+
+            .redirect-message {{
+                font-size: 14px;
+                color: #0066FF;
+                margin-top: 20px;
+                font-weight: 500;
+            }}
+
+            .footer {{
+                padding: 24px 32px;
+                background: white;
+                border-top: 1px solid #E5E7EB;
+                text-align: center;
+                position: relative;
+                z-index: 10;
+            }}
+
+            .footer-links {{
+                font-size: 13px;
+                color: #6B7280;
+                display: flex;
+                align-items: center;
+                justify-content: center;
+                gap: 12px;
+                flex-wrap: wrap;
+            }}
+
+            .footer-links a {{
+                color: #0066FF;
+                text-decoration: none;
+                transition: color 0.2s;
+            }}
+
+            .footer-links a:hover {{
+                color: #1E48D9;
+            }}
+
+            .footer-links .separator {{
+                color: #D1D5DB;
+            }}
+
+            @media (max-width: 640px) {{
+                .header, .footer {{
+                    padding: 20px 24px;
+                }}
+
+                .container {{
+                    padding: 36px 28px;
+                }}
+
+                h1 {{
+                    font-size: 24px;
+                }}
+
+                .subtitle {{
+                    font-size: 15px;
+                }}
+            }}
+        </style>
+    </head>
+    <body>
+        <!-- Background decorative pattern with logos -->
+        <div class="bg-pattern">
+            <div class="bg-logo large-1"></div>
+            <div class="bg-logo large-2"></div>
+            <div class="bg-logo large-3"></div>
+            <div class="bg-logo medium-1"></div>
+            <div class="bg-logo medium-2"></div>
+            <div class="bg-logo medium-3"></div>
+            <div class="bg-logo small-1"></div>
+            <div class="bg-logo small-2"></div>
+            <div class="bg-logo small-3"></div>
+            <div class="bg-logo small-4"></div>
+        </div>
+
+        <header class="header">
+            <div class="logo-container">
+                <div class="logo">
+                    <img src="{LOGO_URL}" alt="Franklink Logo">
+                </div>
+                <div class="logo-text">Franklink</div>
+            </div>
+        </header>
+
+        <div class="main-content">
+            <div class="container">
+                <div class="success-icon">
+                    <svg viewBox="0 0 24 24">
+                        <polyline points="20 6 9 17 4 12"></polyline>
+                    </svg>
+                </div>
+                <h1>Great! You're all set!</h1>
+                <p class="subtitle">We've successfully and securely connected your account.</p>
+                <div class="email-badge">{email}</div>
+                <p class="redirect-message" id="redirect-message">
+                    Redirecting to iMessage in <span id="countdown">2</span> seconds...
+                </p>
+            </div>
+        </div>
+
+        <footer class="footer">
+            <div class="footer-links">
+                <a href="https://franklink.ai">franklink.ai</a>
+                <span class="separator">•</span>
+                <a href="https://franklink.ai/privacy">Privacy</a>
+                <span class="separator">•</span>
+                <a href="https://franklink.ai/terms.html">Terms of Service</a>
+            </div>
+        </footer>
+
+        <script>
+            // Auto-redirect to iMessage after 2 seconds
+            let countdown = 2;
+            const redirectMessage = document.getElementById('redirect-message');
+            const countdownSpan = document.getElementById('countdown');
+
+            const interval = setInterval(() => {{
+                countdown--;
+                countdownSpan.textContent = countdown;
+
+                if (countdown === 0) {{
+                    clearInterval(interval);
+                    redirectMessage.textContent = 'Redirecting now...';
+                    window.location.href = '{imessage_url}';
+                }}
+            }}, 1000);
+        </script>
+    </body>
+    </html>
+    """
+    return html_content.encode("utf-8")
+
+
+def render_error_page(title: str, message: str) -> bytes:
+    """Render error page with white background"""
+    html_content = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>{title}</title>
+        <meta name="viewport" content="width=device-width, initial-scale=1">
+        <style>
+            body {{
+                font-family: 'Figtree', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+                display: flex;
+                justify-content: center;
+                align-items: center;
+                min-height: 100vh;
+                margin: 0;
+                background: #f0f2f5;
+            }}
+            .container {{
+                background: white;
+                padding: 40px;
+                border-radius: 12px;
+                box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+                max-width: 400px;
+                text-align: center;
+            }}
+            .error-icon {{
+                width: 80px;
+                height: 80px;
+                margin: 0 auto 20px;
+                background: #f44336;
+                border-radius: 50%;
+                display: flex;
+                align-items: center;
+                justify-content: center;
+                font-size: 50px;
+                color: white;
+            }}
+            h1 {{
+                color: #333;
+                font-size: 24px;
+                margin-bottom: 10px;
+            }}
+            p {{
+                color: #666;
+                line-height: 1.6;
+            }}
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <div class="error-icon">✕</div>
+            <h1>{title}</h1>
+            <p>{message}</p>
+            <p>You can close this page and try again.</p>
+        </div>
+    </body>
+    </html>
+    """
+    return html_content.encode("utf-8")
+
+
+def render_conversation_page(conversation: dict) -> bytes:
+    """Render a discovery conversation as a mobile-friendly chat page."""
+    turns = conversation.get("turns") or []
+    if not isinstance(turns, list):
+        turns = []
+
+    teaser = conversation.get("teaser_summary") or ""
+    if not isinstance(teaser, str):
+        teaser = str(teaser) if teaser else ""
+
+    # Build speaker list (order of appearance)
+    speakers = []
+    speaker_indices = {}
+    for turn in turns:
+        name = turn.get("speaker_name", "Agent")
+        if name not in speaker_indices:
+            speaker_indices[name] = len(speakers)
+            speakers.append(name)
+
+    # Extract display names (strip "'s Agent" suffix)
+    display_names = [s.replace("'s Agent", "") for s in speakers]
+
+    # Format header title
+    if len(display_names) == 2:
+        title_names = f"{display_names[0]} & {display_names[1]}"
+    elif len(display_names) > 2:
+        title_names = f"{', '.join(display_names[:-1])} & {display_names[-1]}"
+    else:
+        title_names = display_names[0] if display_names else "Agents"
+
+    # Color palette
+    colors = [
+        ("#E8F0FE", "#1A73E8"),  # Blue
+        ("#FEF3E8", "#E87A1A"),  # Orange
+        ("#E8FEF0", "#1AE87A"),  # Green
+        ("#F3E8FE", "#7A1AE8"),  # Purple
+        ("#FEE8E8", "#E81A1A"),  # Red
+        ("#E8FEFE", "#1AE8E8"),  # Teal
+    ]
+
+    # Build chat bubbles HTML
+    bubbles_html = ""
+    for turn in turns:
+        name = turn.get("speaker_name", "Agent")
+        raw_content = turn.get("content", "")
+        # Skip empty messages
+        if not raw_content or not str(raw_content).strip():
+            continue
+        content = html.escape(str(raw_content))
+        idx = speaker_indices.get(name, 0)
+        bg, accent = colors[idx % len(colors)]
+        align = "left" if idx % 2 == 0 else "right"
+        margin = "margin-right: 40px;" if align == "left" else "margin-left: 40px;"
+
+        bubbles_html += f'''
+        <div class="bubble" style="text-align: {align};">
+            <div class="bubble-inner" style="background: {bg}; border-left: 3px solid {accent}; {margin}">
+                <div class="speaker" style="color: {accent};">{html.escape(name)}</div>
+                <div class="content">{content}</div>
+            </div>
+        </div>
+        '''
+
+    # Escape teaser for both HTML and OG tag
+    teaser_escaped = html.escape(teaser)
+    title_escaped = html.escape(f"Why {title_names} should connect")
+
+    html_content = f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no">
+    <title>{title_escaped}</title>
+    <meta property="og:title" content="{title_escaped}">
+    <meta property="og:description" content="{teaser_escaped}">
+    <meta property="og:type" content="article">
+    <style>
+        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+        body {{
+            font-family: -apple-system, BlinkMacSystemFont, 'SF Pro Text', 'Helvetica Neue', sans-serif;
+            background: #f5f5f7;
+            color: #1a1a1a;
+            -webkit-font-smoothing: antialiased;
+        }}
+        .header {{
+            background: linear-gradient(135deg, #1a1a2e 0%, #16213e 100%);
+            padding: 24px 20px 20px;
+            text-align: center;
+        }}
+        .header-logo {{
+            font-size: 13px;
+            font-weight: 700;
+            letter-spacing: 1.5px;
+            text-transform: uppercase;
+            color: rgba(255,255,255,0.5);
+            margin-bottom: 8px;
+        }}
+        .header-title {{
+            font-size: 20px;
+            font-weight: 700;
+            color: #fff;
+            line-height: 1.3;
+        }}
+        .teaser {{
+            background: #fff;
+            padding: 16px 20px;
+            font-size: 14px;
+            line-height: 1.5;
+            color: #555;
+            border-bottom: 1px solid #e5e5e7;
+        }}
+        .conversation {{
+            max-width: 600px;
+            margin: 0 auto;
+            padding: 20px 16px 40px;
+        }}
+        .bubble {{
+            margin-bottom: 16px;
+        }}
+        .bubble-inner {{
+            display: inline-block;
+            max-width: 85%;
+            padding: 12px 16px;
+            border-radius: 16px;
+        }}
+        .speaker {{
+            font-size: 12px;
+            font-weight: 600;
+            margin-bottom: 4px;
+        }}
+        .content {{
+            font-size: 15px;
+            line-height: 1.5;
+            white-space: pre-wrap;
+        }}
+        .footer {{
+            text-align: center;
+            padding: 20px;
+            font-size: 12px;
+            color: #999;
+        }}
+        .footer a {{
+            color: #1A73E8;
+            text-decoration: none;
+        }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <div class="header-logo">FRANKLINK</div>
+        <h1 class="header-title">{title_escaped}</h1>
+    </div>
+    <div class="teaser">{teaser_escaped}</div>
+    <div class="conversation">
+        {bubbles_html}
+    </div>
+    <footer class="footer">
+        Conversation generated by <a href="https://franklink.ai">Franklink</a> AI agents
+    </footer>
+</body>
+</html>'''
+
+    return html_content.encode("utf-8")
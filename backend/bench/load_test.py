@@ -0,0 +1,307 @@
+"""
+End-to-end load test against local Supabase and Google stand-ins.
+
+Starts the fakes from ``backend.bench.fakes``, launches the API under
+uvicorn in a subprocess pointed at them, and drives a weighted mix of
+
+    GET  /c/{slug}
+    GET  /oauth/google/start
+    GET  /oauth/google/callback   (signed state + fake authorization code)
+    POST /account/provision
+    POST /account/provision/batch (phones and emails of known users)
+
+at a fixed arrival rate. Requests are sent on schedule whether or not
+earlier ones finished (open loop), and latency is measured from the
+scheduled send time, so a slow server shows up as latency rather than as
+a quietly reduced request rate. Reports throughput, error counts and
+p50/p95/p99 latency per endpoint. A batch only counts as a success when
+every NDJSON row in it was provisioned or already existed; otherwise its
+status is reported as e.g. ``200/error``.
+
+Usage (from the repository root):
+    python -m backend.bench.load_test --rps 200 --duration 20
+    python -m backend.bench.load_test --supabase-latency-ms 80 --supabase-error-rate 0.02
+    python -m backend.bench.load_test --mix c=1 --conversations 5000   # cache-miss heavy
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+from backend.api import oauth_state
+from backend.bench import fakes
+
+STATE_SECRET = b"load-test-state-secret"
+PRESET_PASSWORD = "franklinkuser"
+ENDPOINTS = ("c", "start", "callback", "provision", "batch")
+# Statuses that count as success for each endpoint
+EXPECTED_STATUS = {
+    "c": {200, 304},
+    "start": {200},
+    "callback": {200},
+    "provision": {200},
+    "batch": {200},
+}
+BATCH_ROW_OK = {"provisioned", "already_exists"}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown endpoint {name!r} (choose from {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    k = (len(sorted_values) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+class Scenario:
+    """Builds one request per endpoint from the fakes' deterministic data set."""
+
+    def __init__(self, users: int, conversations: int, batch_size: int = 20):
+        self.users = users
+        self.conversations = conversations
+        self.batch_size = batch_size
+
+    def request(self, endpoint: str) -> tuple[str, str, dict]:
+        n = random.randrange(self.users)
+        if endpoint == "c":
+            return "GET", f"/c/{fakes.conversation_slug(random.randrange(self.conversations))}", {}
+        if endpoint == "start":
+            return "GET", "/oauth/google/start", {"params": {"user_id": fakes.user_id(n)}}
+        if endpoint == "callback":
+            state = oauth_state.sign_state(fakes.user_id(n), STATE_SECRET)
+            return "GET", "/oauth/google/callback", {"params": {"code": f"code-{n}", "state": state}}
+        if endpoint == "batch":
+            # Half by email, so the email-column lookup is exercised too
+            members = random.sample(range(self.users), min(self.batch_size, self.users))
+            identities = [fakes.user_email(m) if i % 2 else fakes.user_phone(m) for i, m in enumerate(members)]
+            return "POST", "/account/provision/batch", {
+                "json": {"identities": identities, "password": PRESET_PASSWORD},
+            }
+        return "POST", "/account/provision", {
+            "json": {"identity": fakes.user_phone(n), "password": PRESET_PASSWORD},
+        }
+
+
+def batch_outcome(response: httpx.Response, expected_rows: int):
+    """The HTTP status, or "<status>/<row status>" if any row failed."""
+    if response.status_code != 200:
+        return response.status_code
+    rows = [json.loads(line) for line in response.text.splitlines() if line.strip()]
+    failed = [row.get("status") for row in rows if row.get("status") not in BATCH_ROW_OK]
+    if failed:
+        return f"200/{failed[0]}"
+    if len(rows) != expected_rows:
+        return "200/missing_rows"
+    return 200
+
+
+async def run_load(base_url: str, scenario: Scenario, mix: dict, rps: float, duration: float,
+                   timeout: float) -> dict:
+    """Send requests at `rps` for `duration` seconds; per-endpoint results."""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    results = defaultdict(lambda: {"latencies": [], "statuses": Counter()})
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=256)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+
+        async def one(endpoint: str, scheduled: float):
+            method, path, kwargs = scenario.request(endpoint)
+            try:
+                response = await client.request(method, path, **kwargs)
+                if endpoint == "batch":
+                    outcome = batch_outcome(response, len(kwargs["json"]["identities"]))
+                else:
+                    outcome = response.status_code
+            except httpx.TimeoutException:
+                outcome = "timeout"
+            except httpx.HTTPError as e:
+                outcome = type(e).__name__
+            result = results[endpoint]
+            result["latencies"].append(time.perf_counter() - scheduled)
+            result["statuses"][outcome] += 1
+
+        total = int(rps * duration)
+        tasks = []
+        started = time.perf_counter()
+        for i in range(total):
+            scheduled = started + i / rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            endpoint = random.choices(names, weights)[0]
+            tasks.append(asyncio.create_task(one(endpoint, scheduled)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    return {"elapsed": elapsed, "endpoints": dict(results)}
+
+
+def report(result: dict) -> float:
+    """Print the results table and return the overall error rate."""
+    elapsed = result["elapsed"]
+    print(f"\n{'endpoint':<10} {'reqs':>7} {'ok/s':>8} {'errors':>7} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}  statuses")
+    totals = {"reqs": 0, "ok": 0, "latencies": []}
+    for endpoint in ENDPOINTS:
+        data = result["endpoints"].get(endpoint)
+        if not data:
+            continue
+        latencies = sorted(data["latencies"])
+        ok = sum(count for status, count in data["statuses"].items() if status in EXPECTED_STATUS[endpoint])
+        errors = len(latencies) - ok
+        totals["reqs"] += len(latencies)
+        totals["ok"] += ok
+        totals["latencies"] += latencies
+        statuses = " ".join(f"{status}:{count}" for status, count in sorted(data["statuses"].items(), key=str))
+        print(f"{endpoint:<10} {len(latencies):>7} {ok / elapsed:>8.1f} {errors:>7} "
+              f"{percentile(latencies, 50) * 1000:>8.1f} {percentile(latencies, 95) * 1000:>8.1f} "
+              f"{percentile(latencies, 99) * 1000:>8.1f} {latencies[-1] * 1000:>8.1f}  {statuses}")
+
+    latencies = sorted(totals["latencies"])
+    print(f"{'total':<10} {totals['reqs']:>7} {totals['ok'] / elapsed:>8.1f} {totals['reqs'] - totals['ok']:>7} "
+          f"{percentile(latencies, 50) * 1000:>8.1f} {percentile(latencies, 95) * 1000:>8.1f} "
+          f"{percentile(latencies, 99) * 1000:>8.1f} {latencies[-1] * 1000 if latencies else float('nan'):>8.1f}")
+    return (totals["reqs"] - totals["ok"]) / totals["reqs"] if totals["reqs"] else 0.0
+
+
+def start_app(port: int, supabase_url: str, token_uri: str, workers: int, log_file) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "SUPABASE_URL": supabase_url,
+        "SUPABASE_KEY": "fake-service-role-key",
+        "SUPABASE_SERVICE_KEY": "fake-service-role-key",
+        "GOOGLE_CLIENT_ID": "load-test.apps.googleusercontent.com",
+        "GOOGLE_CLIENT_SECRET": "load-test-secret",
+        "GOOGLE_TOKEN_URI": token_uri,
+        "REDIRECT_URI": f"http://127.0.0.1:{port}/oauth/google/callback",
+        "OAUTH_STATE_SECRET": STATE_SECRET.decode(),
+        # The fake token endpoint is plain HTTP
+        "OAUTHLIB_INSECURE_TRANSPORT": "1",
+        # Every simulated client shares 127.0.0.1; per-IP limits would
+        # throttle the generator itself (per-identity limits still apply)
+        "ADMISSION_IP_RATE": "1000000",
+        "ADMISSION_IP_BURST": "1000000",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.api.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+    )
+
+
+def wait_until_up(base_url: str, process: subprocess.Popen, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"API exited during startup with status {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health/live", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit("API did not become healthy in time")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rps", type=float, default=100, help="target arrival rate (requests/s)")
+    parser.add_argument("--duration", type=float, default=15, help="seconds of load")
+    parser.add_argument("--warmup", type=float, default=2, help="seconds of load before measuring")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("c=60,start=15,callback=15,provision=8,batch=2"),
+                        help="endpoint weights, e.g. c=60,start=15,callback=15,provision=8,batch=2")
+    parser.add_argument("--timeout", type=float, default=30, help="client timeout per request (s)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--users", type=int, default=5000, help="users in the fake data set")
+    parser.add_argument("--conversations", type=int, default=200, help="conversation slugs in rotation")
+    parser.add_argument("--turns", type=int, default=40, help="turns per fake conversation")
+    parser.add_argument("--batch-size", type=int, default=20, help="identities per batch-provision request")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--max-error-rate", type=float, default=0.0,
+                        help="exit non-zero above this fraction of failed requests")
+    parser.add_argument("--app-log", default=os.path.join(tempfile.gettempdir(), "load_test_app.log"),
+                        help="where the API's output goes")
+    for service, latency in (("supabase", 20.0), ("google", 120.0)):
+        parser.add_argument(f"--{service}-latency-ms", type=float, default=latency)
+        parser.add_argument(f"--{service}-jitter-ms", type=float, default=latency / 4)
+        parser.add_argument(f"--{service}-error-rate", type=float, default=0.0)
+        parser.add_argument(f"--{service}-error-status", type=int, default=503)
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    supabase = fakes.FakeSupabase(
+        users=args.users, conversations=args.conversations, turns=args.turns,
+        faults=fakes.Faults(args.supabase_latency_ms, args.supabase_jitter_ms,
+                            args.supabase_error_rate, args.supabase_error_status),
+    ).start()
+    google = fakes.FakeGoogle(
+        faults=fakes.Faults(args.google_latency_ms, args.google_jitter_ms,
+                            args.google_error_rate, args.google_error_status),
+    ).start()
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    log_file = open(args.app_log, "w")
+    app = start_app(port, supabase.url, google.token_uri, args.workers, log_file)
+    try:
+        wait_until_up(base_url, app)
+        scenario = Scenario(args.users, args.conversations, args.batch_size)
+        print(f"Load: {args.rps:g} req/s for {args.duration:g}s, mix "
+              + ", ".join(f"{k}={v:g}" for k, v in args.mix.items()))
+        print(f"Supabase stand-in: {args.supabase_latency_ms:g}±{args.supabase_jitter_ms:g} ms, "
+              f"{args.supabase_error_rate:.1%} errors; Google stand-in: "
+              f"{args.google_latency_ms:g}±{args.google_jitter_ms:g} ms, {args.google_error_rate:.1%} errors")
+        if args.warmup > 0:
+            asyncio.run(run_load(base_url, scenario, args.mix, args.rps, args.warmup, args.timeout))
+        result = asyncio.run(run_load(base_url, scenario, args.mix, args.rps, args.duration, args.timeout))
+    finally:
+        app.terminate()
+        try:
+            app.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            app.kill()
+        supabase.stop()
+        google.stop()
+        log_file.close()
+
+    error_rate = report(result)
+    print(f"API log: {args.app_log}")
+    if error_rate > args.max_error_rate:
+        print(f"FAIL: {error_rate:.1%} of requests failed (allowed {args.max_error_rate:.1%})")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,558 @@
+#!/usr/bin/env python3
+"""
+Static build for the Franklink marketing website.
+
+Writes a deployable copy of the site to dist/:
+  - the nav partial (partials/nav.html) is inlined into every page that has a
+    ``data-nav-active`` slot, so the nav no longer waits on a runtime fetch
+  - CSS and JS are minified and written under content-hashed names
+    (css/main.3f9a0c1d2e.css) that can be cached forever
+  - <link>/<script> references in the pages are rewritten to the hashed names
+  - <img> tags with responsive variants (see build_images.py) become
+    <picture> elements with AVIF/WebP srcsets
+  - other site files (images, fonts, agreements/*.md, ...) are copied as-is;
+    only the types in SITE_EXTENSIONS are published
+  - dist/manifest.json maps source paths to outputs and records input hashes
+
+Builds are incremental: an asset is only re-minified when its source changed
+and a page is only re-rendered when the page, the nav partial or one of the
+assets or images it references changed.
+
+Usage:
+    python build.py              # build into dist/
+    python build.py --clean      # discard the previous build first
+    python build.py --out DIR
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUT = os.path.join(ROOT, "dist")
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+NAV_PARTIAL = "partials/nav.html"
+
+# Written by build_images.py
+IMAGE_CACHE_DIR = os.path.join(ROOT, "build", "images")
+IMAGE_MANIFEST = os.path.join(IMAGE_CACHE_DIR, "manifest.json")
+IMAGE_MANIFEST_VERSION = 1
+IMAGE_MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+
+# Source trees that are not part of the static site
+SKIP_DIRS = {
+    ".git", "__pycache__", "node_modules", "dist", "build",
+    "api", "backend", "supabase", "archive", "example_from_poke", "google-oauth-node",
+}
+SKIP_FILES = {
+    "build.py", "server.py", "requirements.txt", "requirements-build.txt",
+    "start-server.bat",
+    "vercel.json", "google-oauth-node",
+}
+# Only these file types are published; anything else (logs, patches, scripts,
+# backups, notes) stays out of dist/
+SITE_EXTENSIONS = {
+    ".html", ".css", ".js", ".json", ".svg", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif",
+    ".ico", ".txt", ".xml", ".webmanifest", ".pdf", ".mp4", ".webm", ".woff", ".woff2", ".ttf",
+}
+# Markdown is published only where pages fetch it: the legal pages load agreements/*.md
+MARKDOWN_DIRS = {"agreements"}
+
+HASH_LENGTH = 10
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{%d}\.(?:css|js|avif|webp)$" % HASH_LENGTH)
+
+_NAV_SLOT_RE = re.compile(
+    r'(?P<indent>[ \t]*)<div\b[^>]*\bdata-nav-active="(?P<key>[^"]*)"[^>]*>\s*</div>'
+)
+_ASSET_REF_RE = re.compile(
+    r'(?P<prefix><(?:link|script)\b[^>]*?\b(?:href|src)=")(?P<url>[^"]+)(?P<suffix>")'
+)
+_IMG_RE = re.compile(r"<picture\b|</picture\s*>|<img\b[^>]*>", re.IGNORECASE)
+_SRC_ATTR_RE = re.compile(r'\bsrc="([^"]+)"')
+_NAV_SCRIPT_RE = re.compile(r'[ \t]*<script\b[^>]*\bsrc="[^"]*\bjs/nav\.js"[^>]*>\s*</script>\n?')
+
+
+# ------------------------------------------------------------
+# Minifiers
+# ------------------------------------------------------------
+# Deliberately conservative: comments and layout whitespace go, anything
+# that could change meaning (spaces inside selectors, calc(), strings,
+# regex literals, newlines that ASI depends on) stays.
+
+def minify_css(source: str) -> str:
+    out = []
+    i, n = 0, len(source)
+    while i < n:
+        c = source[i]
+        if c in "\"'":
+            end = _string_end(source, i)
+            out.append(source[i:end])
+            i = end
+        elif source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+        elif c.isspace():
+            while i < n and source[i].isspace():
+                i += 1
+            out.append(" ")
+        else:
+            out.append(c)
+            i += 1
+
+    css = "".join(out)
+    # Drop the spaces around structural punctuation, outside of strings
+    parts = re.split(r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')", css)
+    for k in range(0, len(parts), 2):
+        text = re.sub(r"\s*([{};,])\s*", r"\1", parts[k])
+        parts[k] = text.replace(";}", "}")
+    return "".join(parts).strip()
+
+
+# Characters after which a "/" starts a regex literal rather than a division
+_REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^\n")
+_REGEX_KEYWORDS = ("return", "typeof", "case", "do", "else", "in", "of", "void", "yield", "await")
+
+
+def minify_js(source: str) -> str:
+    out = []
+    i, n = 0, len(source)
+    while i < n:
+        c = source[i]
+        if c in "\"'":
+            end = _string_end(source, i)
+            out.append(source[i:end])
+            i = end
+        elif c == "`":
+            end = _template_end(source, i)
+            out.append(source[i:end])
+            i = end
+        elif source.startswith("//", i):
+            while i < n and source[i] != "\n":
+                i += 1
+        elif source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            out.append(" ")
+        elif c == "/" and _regex_allowed(out):
+            end = _regex_end(source, i)
+            out.append(source[i:end])
+            i = end
+        elif c.isspace():
+            newline = False
+            while i < n and source[i].isspace():
+                newline = newline or source[i] == "\n"
+                i += 1
+            # Keep line breaks: automatic semicolon insertion may rely on them
+            out.append("\n" if newline else " ")
+        else:
+            out.append(c)
+            i += 1
+
+    js = "".join(out)
+    js = re.sub(r"[ \t]*\n[ \t\n]*", "\n", js)
+    return js.strip() + "\n"
+
+
+def _string_end(source: str, start: int) -> int:
+    quote = source[start]
+    i = start + 1
+    while i < len(source):
+        c = source[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == quote or c == "\n":
+            return i + 1
+        i += 1
+    return len(source)
+
+
+def _template_end(source: str, start: int) -> int:
+    i, depth = start + 1, 0
+    while i < len(source):
+        c = source[i]
+        if c == "\\":
+            i += 2
+            continue
+        if depth == 0 and c == "`":
+            return i + 1
+        if source.startswith("${", i):
+            depth += 1
+            i += 2
+            continue
+        if depth and c == "}":
+            depth -= 1
+        elif depth and c in "\"'":
+            i = _string_end(source, i)
+            continue
+        elif depth and c == "`":
+            i = _template_end(source, i)
+            continue
+        i += 1
+    return len(source)
+
+
+def _regex_allowed(out: list) -> bool:
+    tail = "".join(out[-12:]).rstrip(" ")
+    if not tail:
+        return True
+    if tail[-1] in _REGEX_PRECEDERS:
+        return True
+    word = re.search(r"([A-Za-z_$][\w$]*)$", tail)
+    return bool(word) and word.group(1) in _REGEX_KEYWORDS
+
+
+def _regex_end(source: str, start: int) -> int:
+    i, in_class = start + 1, False
+    while i < len(source):
+        c = source[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "\n":
+            break
+        if c == "[":
+            in_class = True
+        elif c == "]":
+            in_class = False
+        elif c == "/" and not in_class:
+            i += 1
+            while i < len(source) and (source[i].isalnum() or source[i] == "_"):
+                i += 1
+            return i
+        i += 1
+    return i
+
+
+MINIFIERS = {".css": minify_css, ".js": minify_js}
+
+
+# ------------------------------------------------------------
+# Pages
+# ------------------------------------------------------------
+
+def render_nav(nav_html: str, active_key: str, indent: str) -> str:
+    """The nav partial with the active link marked, indented to fit the slot."""
+    if active_key and active_key != "none":
+        def mark_active(match):
+            tag = match.group(0)
+            if 'class="' in tag:
+                return tag.replace('class="', 'class="active ', 1)
+            return tag.replace("<a ", '<a class="active" ', 1)
+
+        nav_html = re.sub(
+            r'<a\b[^>]*\bdata-nav="%s"[^>]*>' % re.escape(active_key),
+            mark_active, nav_html, count=1,
+        )
+    lines = nav_html.strip().splitlines()
+    return "\n".join(indent + line if line.strip() else line for line in lines)
+
+
+def resolve_url(url: str, page_dir: str) -> str | None:
+    """Site-relative path for a local URL in a page, None for external ones."""
+    if "://" in url or url.startswith(("//", "data:", "#", "mailto:", "sms:")):
+        return None
+    path_part = url.partition("?")[0].partition("#")[0]
+    if path_part.startswith("/"):
+        return path_part.lstrip("/")
+    return os.path.normpath(os.path.join(page_dir, path_part)).replace(os.sep, "/")
+
+
+def render_picture(img_tag: str, image: dict) -> str:
+    """Wrap an <img> in a <picture> offering its AVIF/WebP variants."""
+    sizes_match = re.search(r'\sdata-sizes="([^"]*)"', img_tag)
+    if sizes_match:
+        sizes = sizes_match.group(1)
+        img_tag = img_tag.replace(sizes_match.group(0), "", 1)
+    else:
+        # Without a hint, assume it renders up to its natural width
+        sizes = f"(max-width: {image['width']}px) 100vw, {image['width']}px"
+
+    sources = []
+    for ext, mime in IMAGE_MIME_TYPES.items():
+        srcset = ", ".join(
+            f"/{v['path']} {v['width']}w"
+            for v in sorted(image["variants"], key=lambda v: v["width"]) if v["format"] == ext
+        )
+        if srcset:
+            sources.append(f'<source type="{mime}" srcset="{srcset}" sizes="{sizes}">')
+    return "<picture>" + "".join(sources) + img_tag + "</picture>"
+
+
+def render_page(html: str, page_path: str, nav_html: str, asset_map: dict,
+                images: dict | None = None) -> tuple[str, list, dict]:
+    """
+    Inline the nav, point asset references at hashed outputs and add
+    responsive image sources.
+
+    Returns the new HTML, the source paths of the assets it references and
+    the content hash (None if there are no variants) of every local image.
+    """
+    inlined = False
+
+    def inline_nav(match):
+        nonlocal inlined
+        inlined = True
+        return render_nav(nav_html, match.group("key"), match.group("indent"))
+
+    html = _NAV_SLOT_RE.sub(inline_nav, html)
+    if inlined:
+        html = _NAV_SCRIPT_RE.sub("", html)
+
+    referenced = []
+    page_dir = os.path.dirname(page_path)
+
+    def rewrite(match):
+        url = match.group("url")
+        source = resolve_url(url, page_dir)
+        output = asset_map.get(source) if source else None
+        if output is None:
+            return match.group(0)
+        referenced.append(source)
+        path_part, sep, query = url.partition("?")
+        hashed_url = path_part[: len(path_part) - len(os.path.basename(path_part))] + os.path.basename(output)
+        return match.group("prefix") + hashed_url + sep + query + match.group("suffix")
+
+    html = _ASSET_REF_RE.sub(rewrite, html)
+
+    images = images or {}
+    used_images = {}
+    picture_depth = 0
+
+    def add_sources(match):
+        nonlocal picture_depth
+        tag = match.group(0)
+        lowered = tag.lower()
+        if lowered.startswith("<picture"):
+            picture_depth += 1
+            return tag
+        if lowered.startswith("</picture"):
+            picture_depth = max(0, picture_depth - 1)
+            return tag
+        src = _SRC_ATTR_RE.search(tag)
+        source = resolve_url(src.group(1), page_dir) if src else None
+        if source is None:
+            return tag
+        image = images.get(source)
+        used_images[source] = image["source"] if image else None
+        # Author-written <picture> elements and explicit srcsets are left alone
+        if image is None or picture_depth or "srcset=" in tag:
+            return tag
+        return render_picture(tag, image)
+
+    html = _IMG_RE.sub(add_sources, html)
+    return html, referenced, used_images
+
+
+# ------------------------------------------------------------
+# Build
+# ------------------------------------------------------------
+
+def sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def iter_site_files(root: str, out_dir: str):
+    """Yield site-relative paths of every file that belongs to the static site."""
+    out_dir = os.path.abspath(out_dir)
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(
+            d for d in dirnames
+            if d not in SKIP_DIRS and not d.startswith(".")
+            and os.path.abspath(os.path.join(dirpath, d)) != out_dir
+        )
+        for name in sorted(filenames):
+            if name in SKIP_FILES or name.startswith("."):
+                continue
+            rel = os.path.relpath(os.path.join(dirpath, name), root).replace(os.sep, "/")
+            ext = os.path.splitext(name)[1].lower()
+            if ext == ".md":
+                if os.path.dirname(rel) not in MARKDOWN_DIRS:
+                    continue
+            elif ext not in SITE_EXTENSIONS:
+                continue
+            yield rel
+
+
+def hashed_name(rel: str, content: bytes) -> str:
+    stem, ext = os.path.splitext(rel)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:HASH_LENGTH]}{ext}"
+
+
+def load_image_manifest() -> dict:
+    """Source path -> variants entry, or {} before build_images.py has run."""
+    try:
+        with open(IMAGE_MANIFEST, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != IMAGE_MANIFEST_VERSION:
+        return {}
+    return manifest.get("images", {})
+
+
+def load_manifest(out_dir: str) -> dict:
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def write_output(out_dir: str, rel: str, data: bytes) -> None:
+    path = os.path.join(out_dir, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def build(root: str = ROOT, out_dir: str = DEFAULT_OUT, clean: bool = False) -> dict:
+    """Build the site into out_dir and return the new manifest."""
+    if clean and os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+
+    previous = load_manifest(out_dir)
+    old_assets = previous.get("assets", {})
+    old_pages = previous.get("pages", {})
+    old_files = previous.get("files", {})
+    old_variants = previous.get("variants", {})
+
+    def exists(rel):
+        return os.path.isfile(os.path.join(out_dir, rel))
+
+    stats = {"minified": 0, "rendered": 0, "copied": 0, "unchanged": 0, "removed": 0}
+    assets, pages, files, variants = {}, {}, {}, {}
+    page_sources = []
+
+    # Assets first: pages need their hashed names
+    for rel in iter_site_files(root, out_dir):
+        ext = os.path.splitext(rel)[1].lower()
+        src = os.path.join(root, rel)
+        if ext == ".html":
+            page_sources.append(rel)
+        elif ext in MINIFIERS and rel != NAV_PARTIAL:
+            digest = sha256_file(src)
+            old = old_assets.get(rel)
+            if old and old["source"] == digest and exists(old["output"]):
+                assets[rel] = old
+                stats["unchanged"] += 1
+                continue
+            with open(src, encoding="utf-8") as f:
+                minified = MINIFIERS[ext](f.read()).encode("utf-8")
+            output = hashed_name(rel, minified)
+            write_output(out_dir, output, minified)
+            assets[rel] = {"source": digest, "output": output, "bytes": len(minified)}
+            stats["minified"] += 1
+        else:
+            st = os.stat(src)
+            stamp = [st.st_mtime_ns, st.st_size]
+            if old_files.get(rel) == stamp and exists(rel):
+                files[rel] = stamp
+                stats["unchanged"] += 1
+                continue
+            dest = os.path.join(out_dir, rel)
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            shutil.copy2(src, dest)
+            files[rel] = stamp
+            stats["copied"] += 1
+
+    images = load_image_manifest()
+    for image in images.values():
+        for variant in image["variants"]:
+            rel = variant["path"]
+            variants[rel] = image["source"]
+            if old_variants.get(rel) == image["source"] and exists(rel):
+                continue
+            dest = os.path.join(out_dir, rel)
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            shutil.copyfile(os.path.join(IMAGE_CACHE_DIR, rel), dest)
+            stats["copied"] += 1
+
+    asset_map = {rel: entry["output"] for rel, entry in assets.items()}
+    nav_path = os.path.join(root, NAV_PARTIAL)
+    with open(nav_path, encoding="utf-8") as f:
+        nav_html = f.read()
+    nav_digest = sha256_file(nav_path)
+
+    for rel in page_sources:
+        src_digest = sha256_file(os.path.join(root, rel))
+        old = old_pages.get(rel)
+        if old and exists(rel):
+            deps = {dep: asset_map.get(dep) for dep in old.get("assets", {})}
+            image_deps = {
+                src: images[src]["source"] if src in images else None
+                for src in old.get("images", {})
+            }
+            if (old["source"] == src_digest and old.get("nav") in (None, nav_digest)
+                    and deps == old.get("assets", {}) and image_deps == old.get("images", {})):
+                pages[rel] = old
+                stats["unchanged"] += 1
+                continue
+
+        with open(os.path.join(root, rel), encoding="utf-8") as f:
+            html = f.read()
+        has_nav = bool(_NAV_SLOT_RE.search(html))
+        html, referenced, used_images = render_page(html, rel, nav_html, asset_map, images)
+        write_output(out_dir, rel, html.encode("utf-8"))
+        pages[rel] = {
+            "source": src_digest,
+            "nav": nav_digest if has_nav else None,
+            "assets": {dep: asset_map[dep] for dep in referenced},
+            "images": used_images,
+        }
+        stats["rendered"] += 1
+
+    # Anything the previous build wrote that this one didn't is stale
+    current = set(files) | set(pages) | set(variants) | {entry["output"] for entry in assets.values()}
+    stale = (set(old_files) | set(old_pages) | set(old_variants)
+             | {entry["output"] for entry in old_assets.values()})
+    for rel in stale - current:
+        try:
+            os.remove(os.path.join(out_dir, rel))
+            stats["removed"] += 1
+        except OSError:
+            pass
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "built_at": int(time.time()),
+        "assets": assets,
+        "pages": pages,
+        "files": files,
+        "variants": variants,
+    }
+    write_output(out_dir, MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+    manifest["stats"] = stats
+    return manifest
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the static site into dist/.")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="output directory (default: dist/)")
+    parser.add_argument("--clean", action="store_true", help="remove the previous build first")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    started = time.perf_counter()
+    manifest = build(ROOT, os.path.abspath(args.out), clean=args.clean)
+    stats = manifest["stats"]
+    print(f"Built {args.out} in {time.perf_counter() - started:.2f}s: "
+          f"{stats['rendered']} pages rendered, {stats['minified']} assets minified, "
+          f"{stats['copied']} files copied, {stats['unchanged']} unchanged, {stats['removed']} removed")
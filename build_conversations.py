@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Pre-render discovery conversations to static pages.
+
+Pages through the discovery_conversations table and writes each row as
+c/<slug>/index.html in the built site (dist/ by default), with the same
+markup the API's /c/{slug} route renders. Vercel's filesystem handler
+(and server.py --production) then serves a conversation link as a plain
+file; the API route remains the fallback for conversations created since
+the last run.
+
+Runs are incremental. build/conversations/manifest.json records:
+  - a high-water mark: the last (created_at, slug) seen. The next run only
+    fetches rows after it, minus an overlap window for late-committed rows.
+  - a content hash per page. Rows whose hash (row plus page template) is
+    unchanged are not re-rendered.
+
+--full rescans every row: it re-renders only the changed ones and removes
+pages whose row is gone. A change to the page template forces a full
+rescan, and so does a page the manifest lists but the output directory
+no longer has (dist/ wiped by build.py --clean or a fresh checkout while
+build/ survived): the high-water mark only holds while every page it
+covers is still on disk. Rendering runs on a process pool while the next page of rows is
+fetched.
+
+Needs the API's Supabase settings (SUPABASE_URL/SUPABASE_KEY, or
+backend/.env). With --if-configured, a missing configuration skips the
+run instead of failing it, so deploys without database access still build.
+
+Usage:
+    python build.py && python build_conversations.py [--full] [--workers N] [--out DIR]
+
+Run it after build.py: the pages are not in build.py's manifest, so a
+later incremental build leaves them alone; after build.py --clean the next
+run renders them all again. vercel.json runs both as the deploy's build
+command.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from backend.api import main
+from build import DEFAULT_OUT
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATE_DIR = os.path.join(ROOT, "build", "conversations")
+STATE_MANIFEST = os.path.join(STATE_DIR, "manifest.json")
+STATE_VERSION = 1
+
+TABLE = "discovery_conversations"
+ORDER_COLUMN = "created_at"
+PAGE_FIELDS = ("slug", "turns", "teaser_summary")  # what /c/{slug} reads
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_OVERLAP_SECONDS = 300
+# Rows per process-pool job; small batches render inline
+RENDER_CHUNK = 50
+TEMPLATE_VERSION = main.CONVERSATION_TEMPLATE_VERSION.hex()
+
+
+def page_path(out_dir: str, slug: str) -> str:
+    return os.path.join(out_dir, "c", slug, "index.html")
+
+
+def valid_slug(slug) -> bool:
+    # Same rule as the /c/{slug} route; also keeps paths inside c/
+    return isinstance(slug, str) and 0 < len(slug) <= 100 and slug.isalnum()
+
+
+def content_hash(conversation: dict) -> str:
+    """The API's ETag for this row, without quotes."""
+    return main.conversation_etag(conversation).strip('"')
+
+
+def render_rows(out_dir: str, rows: list) -> int:
+    """Render and write a batch of pages. Runs in a worker process."""
+    for conversation in rows:
+        path = page_path(out_dir, conversation["slug"])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(main.render_conversation_html(conversation))
+        os.replace(tmp, path)
+    return len(rows)
+
+
+def load_state(out_dir: str) -> dict:
+    try:
+        with open(STATE_MANIFEST, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if state.get("version") != STATE_VERSION or state.get("out") != out_dir:
+        return {}
+    return state
+
+
+def save_state(state: dict) -> None:
+    os.makedirs(STATE_DIR, exist_ok=True)
+    with open(STATE_MANIFEST + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(STATE_MANIFEST + ".tmp", STATE_MANIFEST)
+
+
+def start_cursor(high_water: dict | None, overlap_seconds: float) -> tuple | None:
+    """Keyset cursor to resume from: the high-water mark minus the overlap window."""
+    if not high_water:
+        return None
+    value = high_water["value"]
+    try:
+        resumed = datetime.fromisoformat(value) - timedelta(seconds=overlap_seconds)
+    except (TypeError, ValueError):
+        return value, high_water["slug"]
+    # Empty slug: every row at exactly this timestamp comes after the cursor
+    return resumed.isoformat(), ""
+
+
+def fetch_rows(client, cursor: tuple | None, page_size: int):
+    """Yield pages of rows ordered by (created_at, slug), after cursor."""
+    columns = ",".join(PAGE_FIELDS + (ORDER_COLUMN,))
+    while True:
+        query = (
+            client.table(TABLE)
+            .select(columns)
+            .order(ORDER_COLUMN)
+            .order("slug")
+            .limit(page_size)
+        )
+        if cursor is not None:
+            value, slug = (main.postgrest_quote(str(part)) for part in cursor)
+            query = query.or_(f"{ORDER_COLUMN}.gt.{value},and({ORDER_COLUMN}.eq.{value},slug.gt.{slug})")
+        rows = query.execute().data or []
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        cursor = (rows[-1][ORDER_COLUMN], rows[-1]["slug"])
+
+
+def build_conversations(out_dir: str, full: bool = False, workers: int | None = None,
+                        page_size: int = DEFAULT_PAGE_SIZE,
+                        overlap_seconds: float = DEFAULT_OVERLAP_SECONDS,
+                        if_configured: bool = False) -> dict | None:
+    client = main.get_supabase()
+    if client is None:
+        if if_configured:
+            return None
+        raise SystemExit("Supabase is not configured (set SUPABASE_URL and SUPABASE_KEY)")
+
+    state = load_state(out_dir)
+    if state.get("template") != TEMPLATE_VERSION:
+        # New markup: every page is stale
+        full = True
+        state["pages"] = {}
+    pages = dict(state.get("pages") or {})
+    if not full and any(not os.path.isfile(page_path(out_dir, slug)) for slug in pages):
+        # The output was wiped or pruned: rows behind the high-water mark
+        # would never be fetched again
+        full = True
+    high_water = None if full else state.get("high_water")
+
+    stats = {"fetched": 0, "rendered": 0, "unchanged": 0, "invalid": 0, "removed": 0}
+    seen = set()
+    pending = []
+    futures = []
+    pool = ProcessPoolExecutor(max_workers=workers) if workers != 1 else None
+
+    def flush(force: bool = False):
+        while pending and (force or len(pending) >= RENDER_CHUNK):
+            batch = pending[:RENDER_CHUNK]
+            del pending[:RENDER_CHUNK]
+            if pool is None:
+                stats["rendered"] += render_rows(out_dir, batch)
+            else:
+                futures.append(pool.submit(render_rows, out_dir, batch))
+
+    try:
+        for rows in fetch_rows(client, start_cursor(high_water, overlap_seconds), page_size):
+            for row in rows:
+                stats["fetched"] += 1
+                slug = row.get("slug")
+                if not valid_slug(slug):
+                    stats["invalid"] += 1
+                    continue
+                seen.add(slug)
+                conversation = {field: row.get(field) for field in PAGE_FIELDS}
+                digest = content_hash(conversation)
+                if pages.get(slug) == digest and os.path.isfile(page_path(out_dir, slug)):
+                    stats["unchanged"] += 1
+                else:
+                    pending.append(conversation)
+                    pages[slug] = digest
+            last = rows[-1]
+            if high_water is None or (last[ORDER_COLUMN], last["slug"]) > (high_water["value"], high_water["slug"]):
+                high_water = {"value": last[ORDER_COLUMN], "slug": last["slug"]}
+            flush()
+        flush(force=True)
+        for future in futures:
+            stats["rendered"] += future.result()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    if full:
+        for slug in [s for s in pages if s not in seen]:
+            shutil.rmtree(os.path.dirname(page_path(out_dir, slug)), ignore_errors=True)
+            del pages[slug]
+            stats["removed"] += 1
+
+    save_state({
+        "version": STATE_VERSION,
+        "out": out_dir,
+        "template": TEMPLATE_VERSION,
+        "high_water": high_water,
+        "pages": pages,
+    })
+    return {"stats": stats, "high_water": high_water, "pages": len(pages)}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Pre-render discovery conversations to c/<slug>/index.html.")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="built site to write c/ into (default: dist/)")
+    parser.add_argument("--full", action="store_true", help="rescan every row and remove pages of deleted rows")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: CPU count; 1 = inline)")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="rows per Supabase request")
+    parser.add_argument("--overlap-seconds", type=float, default=DEFAULT_OVERLAP_SECONDS,
+                        help="re-read rows this far behind the high-water mark")
+    parser.add_argument("--if-configured", action="store_true",
+                        help="skip quietly when Supabase is not configured")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    started = time.perf_counter()
+    result = build_conversations(os.path.abspath(args.out), args.full, args.workers,
+                                 args.page_size, args.overlap_seconds, args.if_configured)
+    if result is None:
+        print("Conversations skipped: Supabase is not configured")
+        sys.exit(0)
+    stats = result["stats"]
+    print(f"Conversations in {time.perf_counter() - started:.1f}s: {stats['fetched']} fetched, "
+          f"{stats['rendered']} rendered, {stats['unchanged']} unchanged, {stats['invalid']} invalid slugs, "
+          f"{stats['removed']} removed; {result['pages']} pages, high-water mark {result['high_water']}",
+          file=sys.stdout)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Responsive image variants for the Franklink marketing website.
+
+Resizes every PNG/JPEG in the site to a set of widths and encodes each one
+as AVIF and WebP, under content-hashed names next to the original's URL:
+
+    assets/images/frank_new.png
+      -> assets/images/frank_new.640w.3f9a0c1d2e.avif
+      -> assets/images/frank_new.640w.3f9a0c1d2e.webp   (etc.)
+
+Variants and build/images/manifest.json are written to build/images/, which
+is kept between runs: a source whose content hash and encoder settings are
+unchanged is skipped. Sources are encoded in parallel on a process pool.
+
+build.py reads the manifest, copies the variants into dist/ and wraps the
+matching <img> tags in <picture> elements with srcset.
+
+Requires Pillow (with AVIF support, Pillow >= 11.3), listed in
+requirements-build.txt:
+    pip install -r requirements-build.txt
+
+vercel.json runs it before build.py on every deploy; build/ does not
+survive between Vercel builds, so each deploy encodes every image.
+
+Usage:
+    python build_images.py [--workers N] [--force]
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import build
+
+IMAGE_CACHE_DIR = build.IMAGE_CACHE_DIR
+IMAGE_MANIFEST = build.IMAGE_MANIFEST
+
+SOURCE_EXTENSIONS = {".png", ".jpg", ".jpeg"}
+VARIANT_WIDTHS = (320, 640, 960, 1280, 1920)
+# Pillow format name, file extension, save options
+VARIANT_FORMATS = (
+    ("AVIF", "avif", {"quality": 55, "speed": 6}),
+    ("WEBP", "webp", {"quality": 78, "method": 6}),
+)
+# Images this narrow are icons; variants would not save anything meaningful
+MIN_SOURCE_WIDTH = 200
+
+# Part of every cache key, so changing widths/quality re-encodes everything
+SETTINGS_DIGEST = hashlib.sha256(
+    json.dumps([VARIANT_WIDTHS, VARIANT_FORMATS], sort_keys=True).encode("utf-8")
+).hexdigest()[:build.HASH_LENGTH]
+
+
+def variant_widths(source_width: int) -> list[int]:
+    """Widths to generate: every step narrower than the source, plus the source width."""
+    widths = [w for w in VARIANT_WIDTHS if w < source_width]
+    if source_width <= VARIANT_WIDTHS[-1]:
+        widths.append(source_width)
+    return widths
+
+
+def encode_source(rel: str, digest: str) -> dict:
+    """Encode all variants of one source image. Runs in a worker process."""
+    from PIL import Image, ImageOps
+
+    with Image.open(os.path.join(build.ROOT, rel)) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+        width, height = image.size
+
+        stem = os.path.splitext(rel)[0]
+        variants = []
+        for target_width in variant_widths(width):
+            if target_width == width:
+                resized = image
+            else:
+                target_height = max(1, round(height * target_width / width))
+                resized = image.resize((target_width, target_height), Image.LANCZOS)
+            for pil_format, ext, options in VARIANT_FORMATS:
+                out_rel = f"{stem}.{target_width}w.{digest[:build.HASH_LENGTH]}.{ext}"
+                out_path = os.path.join(IMAGE_CACHE_DIR, out_rel)
+                os.makedirs(os.path.dirname(out_path), exist_ok=True)
+                tmp = out_path + ".tmp"
+                resized.save(tmp, pil_format, **options)
+                os.replace(tmp, out_path)
+                variants.append({
+                    "format": ext,
+                    "width": target_width,
+                    "path": out_rel,
+                    "bytes": os.path.getsize(out_path),
+                })
+
+    return {
+        "source": digest,
+        "settings": SETTINGS_DIGEST,
+        "width": width,
+        "height": height,
+        "bytes": os.path.getsize(os.path.join(build.ROOT, rel)),
+        "variants": variants,
+    }
+
+
+def is_current(entry: dict | None, digest: str) -> bool:
+    if not entry or entry.get("source") != digest or entry.get("settings") != SETTINGS_DIGEST:
+        return False
+    return all(os.path.isfile(os.path.join(IMAGE_CACHE_DIR, v["path"])) for v in entry["variants"])
+
+
+def source_width(rel: str) -> int:
+    from PIL import Image
+
+    with Image.open(os.path.join(build.ROOT, rel)) as image:
+        return image.size[0]
+
+
+def build_images(workers: int | None = None, force: bool = False) -> dict:
+    """Generate missing/outdated variants and rewrite the manifest."""
+    previous = {} if force else build.load_image_manifest()
+    images, pending = {}, {}
+    stats = {"encoded": 0, "unchanged": 0, "skipped": 0, "removed": 0}
+
+    for rel in build.iter_site_files(build.ROOT, build.DEFAULT_OUT):
+        if os.path.splitext(rel)[1].lower() not in SOURCE_EXTENSIONS:
+            continue
+        digest = build.sha256_file(os.path.join(build.ROOT, rel))
+        if is_current(previous.get(rel), digest):
+            images[rel] = previous[rel]
+            stats["unchanged"] += 1
+        elif source_width(rel) < MIN_SOURCE_WIDTH:
+            stats["skipped"] += 1
+        else:
+            pending[rel] = digest
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(encode_source, rel, digest): rel for rel, digest in pending.items()}
+            for future in as_completed(futures):
+                rel = futures[future]
+                images[rel] = future.result()
+                stats["encoded"] += 1
+
+    # Variants of sources that changed or disappeared
+    keep = {v["path"] for entry in images.values() for v in entry["variants"]}
+    for entry in build.load_image_manifest().values():
+        for variant in entry["variants"]:
+            if variant["path"] not in keep:
+                try:
+                    os.remove(os.path.join(IMAGE_CACHE_DIR, variant["path"]))
+                    stats["removed"] += 1
+                except OSError:
+                    pass
+
+    os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+    with open(IMAGE_MANIFEST + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"version": build.IMAGE_MANIFEST_VERSION, "images": images}, f, indent=2, sort_keys=True)
+    os.replace(IMAGE_MANIFEST + ".tmp", IMAGE_MANIFEST)
+    return {"images": images, "stats": stats}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate responsive AVIF/WebP image variants.")
+    parser.add_argument("--workers", type=int, default=None, help="encoder processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="re-encode every image")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if importlib.util.find_spec("PIL") is None:
+        sys.exit("build_images.py needs Pillow: pip install Pillow")
+    started = time.perf_counter()
+    result = build_images(args.workers, args.force)
+    stats = result["stats"]
+    original = sum(entry["bytes"] for entry in result["images"].values())
+    full_width_webp = sum(
+        max((v for v in entry["variants"] if v["format"] == "webp"), key=lambda v: v["width"])["bytes"]
+        for entry in result["images"].values()
+    )
+    print(f"Images in {time.perf_counter() - started:.1f}s: {stats['encoded']} encoded, "
+          f"{stats['unchanged']} unchanged, {stats['skipped']} too small, {stats['removed']} stale variants removed")
+    print(f"  originals: {original / 1024:.0f} KB, widest WebP variants: {full_width_webp / 1024:.0f} KB")
@@ -261,6 +261,16 @@ function renderGraph(nodes, links) {
     centerNode.fy = height / 2;
   }
 
+  // Positions laid out by the API are relative to the center node; start
+  // there and let the simulation only settle
+  const hasLayout = nodes.length > 1 && nodes.every((d) => d.x != null && d.y != null);
+  if (hasLayout) {
+    for (const d of nodes) {
+      d.x += width / 2;
+      d.y += height / 2;
+    }
+  }
+
   // Franklink-style SVG definitions (matching logo aesthetic)
   const defs = svg.append("defs");
 
@@ -331,6 +341,7 @@ function renderGraph(nodes, links) {
     .force("charge", d3.forceManyBody().strength(-450))
     .force("center", d3.forceCenter(width / 2, height / 2))
     .force("collide", d3.forceCollide().radius((d) => d.radius + 35).strength(0.8))
+    .alpha(hasLayout ? 0.05 : 1)
     .alphaDecay(0.012)
     .velocityDecay(0.32);
 
@@ -649,89 +660,30 @@ function normalizeParticipant(participant) {
 }
 
 async function loadGraphData() {
-  const groupChatsTable = state.config?.tables?.groupChats || "group_chats";
-  const usersTable = state.config?.tables?.users || "users";
-
-  const { data: userData } = await state.supabase.auth.getUser();
-  const authUserId = userData?.user?.id;
-  if (!authUserId) throw new Error("No authenticated user found.");
-
-  // Prioritize name over phone number for center label
-  const centerLabel = state.profile?.name || state.profile?.phone_number || "You";
-
-  // Fetch chats where user is user_a
-  const { data: chatsAsA, error: errorA } = await state.supabase
-    .from(groupChatsTable)
-    .select("user_a_id, user_b_id")
-    .eq("user_a_id", authUserId)
-    .limit(250);
-
-  // Fetch chats where user is user_b
-  const { data: chatsAsB, error: errorB } = await state.supabase
-    .from(groupChatsTable)
-    .select("user_a_id, user_b_id")
-    .eq("user_b_id", authUserId)
-    .limit(250);
-
-  if (errorA) console.warn("Error loading chats as user_a:", errorA);
-  if (errorB) console.warn("Error loading chats as user_b:", errorB);
-
-  // Combine results and extract unique connection IDs
-  const chats = [...(chatsAsA || []), ...(chatsAsB || [])];
-  const connectionIds = new Set();
-
-  for (const row of chats) {
-    const otherId = row.user_a_id === authUserId ? row.user_b_id : row.user_a_id;
-    if (otherId && otherId !== authUserId) {
-      connectionIds.add(otherId);
-    }
-  }
-
-  const ids = [...connectionIds].slice(0, 120);
+  const { data: sessionData } = await state.supabase.auth.getSession();
+  const accessToken = sessionData?.session?.access_token;
+  if (!accessToken) throw new Error("No authenticated user found.");
 
-  // Fetch names for all connection IDs
-  let connectionUsers = [];
-  if (ids.length > 0) {
-    const { data, error } = await state.supabase
-      .from(usersTable)
-      .select("id, name, phone_number")
-      .in("id", ids);
-    if (error) console.warn("Error loading user names:", error);
-    connectionUsers = data || [];
-  }
-
-  // Create a map of id -> display name
-  const nameMap = new Map();
-  for (const user of connectionUsers) {
-    const displayName = user.name || formatPhoneDisplay(user.phone_number) || "Unknown";
-    nameMap.set(user.id, displayName);
+  // Built (and cached per user) server-side: one request, no truncation
+  const res = await fetch("/graph", {
+    headers: { Authorization: `Bearer ${accessToken}` },
+  });
+  if (!res.ok) {
+    const body = await res.json().catch(() => ({}));
+    throw new Error(body.detail || body.error || `Failed to load connections (${res.status}).`);
   }
+  const graph = await res.json();
 
-  const nodes = [
-    { id: "me", label: centerLabel, shortLabel: centerLabel, radius: 44 },
-    ...ids.map((id) => ({
-      id: String(id),
-      label: nameMap.get(id) || "Unknown",
-      shortLabel: nameMap.get(id) || "?",
-      radius: 34,
-    })),
-  ];
-
-  const links = ids.map((id) => ({
-    source: "me",
-    target: String(id),
-  }));
+  // Prioritize name over phone number for center label
+  const centerLabel = state.profile?.name || state.profile?.phone_number || null;
 
-  return { nodes, links, count: ids.length };
-}
+  const nodes = graph.nodes.map((node) => {
+    const label = node.id === "me" ? centerLabel || node.label : node.label;
+    const radius = node.id === "me" ? 44 : node.type === "group" ? 28 : 34;
+    return { ...node, label, shortLabel: label, radius };
+  });
 
-function formatPhoneDisplay(phone) {
-  if (!phone) return null;
-  const digits = phone.replace(/[^\d]/g, "");
-  if (digits.length === 11 && digits.startsWith("1")) {
-    return `(${digits.slice(1, 4)}) ${digits.slice(4, 7)}-${digits.slice(7)}`;
-  }
-  return phone;
+  return { nodes, links: graph.links, count: graph.stats.directCount };
 }
 
 async function ensureGraph() {
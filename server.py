@@ -2,17 +2,77 @@
 """
 Simple HTTP server for Franklink Marketing Website
 Automatically opens the browser when started
+
+Usage:
+    python server.py                  # development: no caching, opens a browser
+    python server.py --production     # concurrent serving for containers/proxies
 """
 
+import argparse
+import email.utils
+import gzip
+import hashlib
 import http.server
-import socketserver
-import webbrowser
+import mimetypes
 import os
+import re
+import selectors
+import socket
+import socketserver
 import threading
 import time
+import webbrowser
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import brotli
+except ImportError:  # optional: gzip-only without it
+    brotli = None
 
 PORT = 8000
 DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+# Production serves the build output (see build.py), not the source tree
+DIST_DIRECTORY = os.path.join(DIRECTORY, "dist")
+
+# Production defaults
+PRODUCTION_THREADS = 64
+# Idle keep-alive connections wait in the server's selector, not on a worker
+KEEPALIVE_TIMEOUT = 15  # seconds an idle keep-alive connection is kept open
+MAX_IDLE_CONNECTIONS = 4096  # the oldest idle connections are closed beyond this
+REQUEST_TIMEOUT = 15  # socket timeout while a worker reads a request or writes a response
+PRODUCTION_CACHE_CONTROL = "public, max-age=300"
+HTML_CACHE_CONTROL = "public, no-cache"  # always revalidate; 304s keep it cheap
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Content-hashed build outputs (see build.py) never change under their name
+_HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{10}\.(?:css|js|avif|webp)$")
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# Hot-file cache: text assets kept in memory with precompressed variants
+COMPRESSIBLE_EXTENSIONS = {
+    ".html", ".css", ".js", ".json", ".svg", ".txt", ".xml", ".webmanifest",
+}
+HOT_CACHE_MAX_FILE_BYTES = 2 * 1024 * 1024
+HOT_CACHE_MAX_TOTAL_BYTES = 64 * 1024 * 1024
+HOT_CACHE_SKIP_DIRS = {".git", "backend", "node_modules", "__pycache__", "archive"}
+
+# Never served in production, even when --root points at the source tree
+PRIVATE_DIRS = {"backend", "supabase", "build", "api", "node_modules", "__pycache__", "archive"}
+PRIVATE_EXTENSIONS = {
+    ".py", ".pyc", ".sql", ".log", ".patch", ".jsonl", ".env", ".bak", ".csv", ".bat", ".sh",
+}
+
+
+def is_private_path(rel_path):
+    """True for source-tree files that must not be served: dot-paths, backend code, logs..."""
+    parts = [part for part in rel_path.replace(os.sep, "/").split("/") if part not in ("", ".")]
+    if any(part.startswith(".") and part != ".well-known" for part in parts):
+        return True
+    if any(part in PRIVATE_DIRS for part in parts):
+        return True
+    return bool(parts) and os.path.splitext(parts[-1])[1].lower() in PRIVATE_EXTENSIONS
+
 
 class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
@@ -24,6 +84,517 @@ class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         self.send_header('Expires', '0')
         super().end_headers()
 
+
+class _FileRange:
+    """An open file plus the byte range of it to send."""
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.start = start
+        self.length = length
+
+    def close(self):
+        self.file.close()
+
+
+class _MemoryBody:
+    """A cached response body; close() is a no-op for the shared bytes."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data
+
+    def close(self):
+        pass
+
+
+class CachedFile:
+    """A text asset held in memory with its compressed variants and validators."""
+
+    __slots__ = ("mtime_ns", "size", "etag", "last_modified", "content_type", "variants")
+
+    def __init__(self, path, st, content_type):
+        with open(path, "rb") as f:
+            body = f.read()
+        self.mtime_ns = st.st_mtime_ns
+        self.size = st.st_size
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:20] + '"'
+        self.last_modified = email.utils.formatdate(st.st_mtime, usegmt=True)
+        self.content_type = content_type
+
+        # Only keep an encoding when it actually saves bytes
+        self.variants = {"identity": body}
+        gz = gzip.compress(body, compresslevel=9, mtime=0)
+        if len(gz) < len(body):
+            self.variants["gzip"] = gz
+        if brotli is not None:
+            br = brotli.compress(body, quality=11)
+            if len(br) < len(body):
+                self.variants["br"] = br
+
+    @property
+    def memory(self):
+        return sum(len(v) for v in self.variants.values())
+
+    def etag_for(self, encoding):
+        # Strong validators must differ between representations
+        if encoding == "identity":
+            return self.etag
+        return self.etag[:-1] + "-" + encoding + '"'
+
+
+class HotFileCache:
+    """
+    In-memory cache of compressible files, keyed by filesystem path.
+
+    Entries are checked against the file's mtime/size on every lookup and
+    rebuilt when the file changes, so edits show up without a restart.
+    Files that don't fit the budget are remembered by mtime/size so they
+    are served from disk without being read and compressed again.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._rejected = {}
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+
+    @staticmethod
+    def is_cacheable(path):
+        return os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+    def warm(self, root):
+        """Load and compress every cacheable file under root."""
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in HOT_CACHE_SKIP_DIRS and not d.startswith(".")]
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if self.is_cacheable(path):
+                    try:
+                        self.get(path, os.stat(path))
+                    except OSError:
+                        pass
+        return len(self._entries)
+
+    def get(self, path, st):
+        """Return the CachedFile for path, or None if it shouldn't be cached."""
+        entry = self._entries.get(path)
+        if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+            return entry
+        if self._rejected.get(path) == (st.st_mtime_ns, st.st_size):
+            return None
+
+        with self._lock:
+            if entry is not None:
+                self._evict(path)
+            # The identity body alone needs st_size bytes
+            if st.st_size > HOT_CACHE_MAX_FILE_BYTES or self.total_bytes + st.st_size > HOT_CACHE_MAX_TOTAL_BYTES:
+                self._rejected[path] = (st.st_mtime_ns, st.st_size)
+                return None
+
+        new_entry = CachedFile(path, st, mimetypes.guess_type(path)[0] or "application/octet-stream")
+        with self._lock:
+            self._evict(path)
+            if self.total_bytes + new_entry.memory > HOT_CACHE_MAX_TOTAL_BYTES:
+                self._rejected[path] = (st.st_mtime_ns, st.st_size)
+                return None
+            self._entries[path] = new_entry
+            self.total_bytes += new_entry.memory
+        return new_entry
+
+    def _evict(self, path):
+        """Drop path's entry; the freed budget may now fit earlier rejects. Needs the lock."""
+        old = self._entries.pop(path, None)
+        if old is not None:
+            self.total_bytes -= old.memory
+            self._rejected.clear()
+
+
+def cache_control_for(path, content_type):
+    if _HASHED_NAME_RE.search(path):
+        return IMMUTABLE_CACHE_CONTROL
+    if content_type.startswith("text/html"):
+        return HTML_CACHE_CONTROL
+    return PRODUCTION_CACHE_CONTROL
+
+
+def preferred_encoding(accept_encoding, available):
+    """Pick br > gzip > identity among the encodings the client accepts."""
+    if not accept_encoding:
+        return "identity"
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    for encoding in ("br", "gzip"):
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if encoding in available and q > 0:
+            return encoding
+    return "identity"
+
+
+def etag_matches(if_none_match, etags):
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return any(etag in candidates for etag in etags)
+
+
+class ProductionHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """
+    Static file handler for production serving.
+
+    Speaks HTTP/1.1 with keep-alive, answers single-range requests with 206
+    (for the large images/videos in assets/), honors If-Modified-Since, and
+    sends file bodies with socket.sendfile (os.sendfile underneath) so they
+    never pass through Python buffers. Text assets (HTML/CSS/JS/...) are
+    served from ``hot_cache`` with precompressed gzip/brotli bodies and
+    strong ETags. Dot-paths, backend code, logs and other source-tree files
+    (``is_private_path``) are always 404.
+    """
+
+    protocol_version = "HTTP/1.1"
+    timeout = REQUEST_TIMEOUT
+    hot_cache = None  # HotFileCache, set by start_production_server
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=DIRECTORY, **kwargs)
+
+    def log_message(self, format, *args):
+        # Access logs belong to the proxy in front of us
+        pass
+
+    def handle(self):
+        # One request per dispatch: between requests ThreadPoolHTTPServer
+        # parks the connection in its selector instead of blocking a worker
+        self.handle_one_request()
+
+    def finish(self):
+        # Keep rfile/wfile open while the connection is parked; rfile may
+        # already hold the next (pipelined) request
+        if self.close_connection:
+            super().finish()
+
+    def has_buffered_request(self):
+        """True if the next request's bytes are already buffered (pipelining)."""
+        self.connection.settimeout(0)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if is_private_path(os.path.relpath(path, self.directory)):
+            self.send_error(404, "File not found")
+            return None
+        if os.path.isdir(path):
+            index = os.path.join(path, "index.html")
+            if not self.path.split("?", 1)[0].endswith("/") or not os.path.isfile(index):
+                # Directory redirects and listings
+                return super().send_head()
+            path = index
+
+        if path.endswith("/"):
+            self.send_error(404, "File not found")
+            return None
+        try:
+            f = open(path, "rb")
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+
+        try:
+            st = os.fstat(f.fileno())
+            size = st.st_size
+            last_modified = self.date_time_string(st.st_mtime)
+
+            cached = None
+            if self.hot_cache is not None and self.hot_cache.is_cacheable(path) and "Range" not in self.headers:
+                cached = self.hot_cache.get(path, st)
+            if cached is not None:
+                f.close()
+                return self._send_cached(path, cached)
+
+            content_type = self.guess_type(path)
+            cache_control = cache_control_for(path, content_type)
+            etag = f'"{st.st_mtime_ns:x}-{size:x}"'
+            if self._not_modified(etag, st.st_mtime):
+                f.close()
+                self._send_not_modified(etag, last_modified, cache_control)
+                return None
+
+            byte_range = self._requested_range(size, last_modified)
+            if byte_range == "unsatisfiable":
+                f.close()
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return None
+
+            if byte_range is None:
+                start, length = 0, size
+                self.send_response(200)
+            else:
+                start, end = byte_range
+                length = end - start + 1
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(length))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Cache-Control", cache_control)
+            self.end_headers()
+            return _FileRange(f, start, length)
+        except Exception:
+            f.close()
+            raise
+
+    def _send_cached(self, path, cached):
+        """Answer from the hot-file cache: 304, or the best-encoded body."""
+        encoding = preferred_encoding(self.headers.get("Accept-Encoding"), cached.variants)
+        etag = cached.etag_for(encoding)
+        cache_control = cache_control_for(path, cached.content_type)
+
+        # Any representation's tag validates: the content behind them is the same
+        if self._not_modified(etag, cached.mtime_ns / 1e9, [cached.etag_for(e) for e in cached.variants]):
+            self._send_not_modified(etag, cached.last_modified, cache_control, vary=len(cached.variants) > 1)
+            return None
+
+        body = cached.variants[encoding]
+        self.send_response(200)
+        self.send_header("Content-Type", cached.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if encoding != "identity":
+            self.send_header("Content-Encoding", encoding)
+        if len(cached.variants) > 1:
+            self.send_header("Vary", "Accept-Encoding")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", cached.last_modified)
+        self.send_header("Cache-Control", cache_control)
+        self.end_headers()
+        return _MemoryBody(body)
+
+    def _send_not_modified(self, etag, last_modified, cache_control, vary=False):
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.send_header("Cache-Control", cache_control)
+        if vary:
+            self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+
+    def _not_modified(self, etag, mtime, etags=None):
+        """If-None-Match takes precedence; If-Modified-Since is the fallback."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            return etag_matches(if_none_match, etags or [etag])
+        return self._not_modified_since(mtime)
+
+    def _not_modified_since(self, mtime):
+        header = self.headers.get("If-Modified-Since")
+        if not header:
+            return False
+        try:
+            since = email.utils.parsedate_to_datetime(header)
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+        if since is None:
+            return False
+        return int(mtime) <= since.timestamp()
+
+    def _requested_range(self, size, last_modified):
+        """
+        Parse a single-range Range header into (start, end) inclusive.
+
+        Returns None to send the whole file (no/unsupported Range header, or
+        a stale If-Range) and "unsatisfiable" for a range past the end.
+        """
+        header = self.headers.get("Range")
+        if not header:
+            return None
+        if_range = self.headers.get("If-Range")
+        if if_range and if_range != last_modified:
+            return None
+
+        match = _RANGE_RE.match(header.strip())
+        if not match:
+            # Multiple ranges or other units: serving the full body is valid
+            return None
+
+        first, last = match.groups()
+        if not first and not last:
+            return None
+        if not first:
+            # Suffix range: the last N bytes
+            suffix = int(last)
+            if suffix == 0:
+                return "unsatisfiable"
+            return max(0, size - suffix), size - 1
+
+        start = int(first)
+        end = int(last) if last else size - 1
+        if start >= size or end < start:
+            return "unsatisfiable"
+        return start, min(end, size - 1)
+
+    def copyfile(self, source, outputfile):
+        if isinstance(source, _MemoryBody):
+            outputfile.write(source.data)
+            return
+        if not isinstance(source, _FileRange):
+            return super().copyfile(source, outputfile)
+
+        # Zero-copy where the platform has sendfile. The connection has a
+        # timeout, so the socket is non-blocking underneath: socket.sendfile
+        # waits for it to drain where a bare os.sendfile would hit EAGAIN
+        self.connection.sendfile(source.file, source.start, source.length)
+
+
+class ThreadPoolHTTPServer(http.server.HTTPServer):
+    """
+    HTTPServer that handles requests on a bounded worker pool.
+
+    A worker only ever holds a connection while a request is being read and
+    answered. New and idle keep-alive connections wait in a selector on one
+    watcher thread and are handed to the pool when bytes arrive, so idle
+    browsers cannot tie up the workers. Idle connections are closed after
+    KEEPALIVE_TIMEOUT, oldest first beyond MAX_IDLE_CONNECTIONS.
+    """
+
+    allow_reuse_address = True
+
+    def __init__(self, server_address, handler_class, max_workers):
+        super().__init__(server_address, handler_class)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="http")
+        self._selector = selectors.DefaultSelector()
+        # socket -> (client_address, handler or None, parked at); insertion
+        # order is park order, so the oldest idle connections come first
+        self._idle = {}
+        self._pending = []  # parked sockets the watcher has yet to register
+        self._idle_lock = threading.Lock()
+        self._closing = False
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_recv.setblocking(False)
+        self._selector.register(self._wakeup_recv, selectors.EVENT_READ)
+        self._watcher = threading.Thread(target=self._watch_idle, daemon=True, name="http-idle")
+        self._watcher.start()
+
+    def process_request(self, request, client_address):
+        self._park(request, client_address, None)
+
+    def _park(self, request, client_address, handler):
+        with self._idle_lock:
+            if self._closing:
+                self._close(request, handler)
+                return
+            self._idle[request] = (client_address, handler, time.monotonic())
+            self._pending.append(request)
+        self._wakeup_send.send(b"\0")
+
+    def _close(self, request, handler):
+        if handler is not None:
+            handler.close_connection = True
+            handler.finish()
+        self.shutdown_request(request)
+
+    def _watch_idle(self):
+        next_sweep = time.monotonic() + 1.0
+        while not self._closing:
+            with self._idle_lock:
+                pending, self._pending = self._pending, []
+                pending = [request for request in pending if request in self._idle]
+            for request in pending:
+                self._selector.register(request, selectors.EVENT_READ)
+
+            for key, _ in self._selector.select(timeout=max(0.0, next_sweep - time.monotonic())):
+                request = key.fileobj
+                if request is self._wakeup_recv:
+                    try:
+                        while request.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    continue
+                self._selector.unregister(request)
+                with self._idle_lock:
+                    client_address, handler, _ = self._idle.pop(request)
+                self._pool.submit(self._serve, request, client_address, handler)
+
+            if time.monotonic() >= next_sweep or len(self._idle) > MAX_IDLE_CONNECTIONS:
+                self._expire_idle()
+                next_sweep = time.monotonic() + 1.0
+
+    def _expire_idle(self):
+        now = time.monotonic()
+        expired = []
+        with self._idle_lock:
+            excess = len(self._idle) - MAX_IDLE_CONNECTIONS
+            for request, (_, handler, parked_at) in self._idle.items():
+                if excess <= 0 and now - parked_at <= KEEPALIVE_TIMEOUT:
+                    break
+                expired.append((request, handler))
+                excess -= 1
+            for request, _ in expired:
+                del self._idle[request]
+        for request, handler in expired:
+            try:
+                self._selector.unregister(request)
+            except KeyError:
+                pass  # parked after the watcher's last registration pass
+            self._close(request, handler)
+
+    def _serve(self, request, client_address, handler):
+        """Answer the request(s) waiting on a connection, then park it again or close it."""
+        try:
+            if handler is None:
+                handler = self.RequestHandlerClass(request, client_address, self)
+            else:
+                handler.handle()
+                handler.finish()
+            # Pipelined requests are already in rfile, where the selector can't see them
+            while not handler.close_connection and handler.has_buffered_request():
+                handler.handle()
+                handler.finish()
+        except Exception:
+            self.handle_error(request, client_address)
+            self._close(request, handler)
+            return
+        if handler.close_connection:
+            self.shutdown_request(request)
+        else:
+            self._park(request, client_address, handler)
+
+    def server_close(self):
+        with self._idle_lock:
+            self._closing = True
+            idle = [(request, handler) for request, (_, handler, _) in self._idle.items()]
+            self._idle.clear()
+        self._wakeup_send.send(b"\0")
+        self._watcher.join(timeout=5)
+        for request, handler in idle:
+            self._close(request, handler)
+        self._selector.close()
+        self._wakeup_recv.close()
+        self._wakeup_send.close()
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
 def open_browser():
     """Open the browser after a short delay"""
     time.sleep(1)
@@ -55,5 +626,46 @@ def start_server():
             print("Server stopped. Thanks for using Franklink!")
             print("=" * 50)
 
+def start_production_server(host, port, threads):
+    """Start the concurrent production server (no browser, caching allowed)"""
+    if not os.path.isdir(DIRECTORY):
+        raise SystemExit(f"{DIRECTORY} does not exist: run python build.py first, or pass --root")
+    os.chdir(DIRECTORY)
+
+    cache = HotFileCache()
+    warmed = cache.warm(DIRECTORY)
+    ProductionHTTPRequestHandler.hot_cache = cache
+
+    with ThreadPoolHTTPServer((host, port), ProductionHTTPRequestHandler, threads) as httpd:
+        print(f"Franklink static server (production) on http://{host or '0.0.0.0'}:{port} "
+              f"with {threads} worker threads, serving {DIRECTORY}")
+        print(f"Hot-file cache: {warmed} files, {cache.total_bytes / 1024:.0f} KB "
+              f"(gzip{', brotli' if brotli is not None else ''})")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serve the Franklink marketing website.")
+    parser.add_argument("--production", action="store_true",
+                        help="serve concurrently with keep-alive, Range and sendfile support")
+    parser.add_argument("--host", default="", help="bind address (default: all interfaces)")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", PORT)))
+    parser.add_argument("--threads", type=int, default=PRODUCTION_THREADS,
+                        help="worker threads in production mode")
+    parser.add_argument("--root", default=None,
+                        help="directory to serve (default: dist/ in production, the repository otherwise)")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    start_server()
\ No newline at end of file
+    args = parse_args()
+    if args.root is not None:
+        DIRECTORY = os.path.abspath(args.root)
+    elif args.production:
+        DIRECTORY = DIST_DIRECTORY
+    if args.production:
+        start_production_server(args.host, args.port, args.threads)
+    else:
+        PORT = args.port
+        start_server()
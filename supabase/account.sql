@@ -193,3 +193,153 @@ BEGIN
     ADD CONSTRAINT users_email_unique UNIQUE (email);
   END IF;
 END $$;
+
+-- ------------------------------------------------------------
+-- 8. Server-side connection graph (API /graph endpoint)
+-- ------------------------------------------------------------
+
+-- 8a. Version stamp per user, bumped whenever anything drawn in that user's
+--     graph changes. The API caches each user's graph and compares stamps
+--     (one primary-key read) instead of rebuilding it on every request.
+CREATE TABLE IF NOT EXISTS public.connection_graph_versions (
+  user_id uuid PRIMARY KEY,
+  version bigint NOT NULL DEFAULT 1,
+  updated_at timestamptz NOT NULL DEFAULT now()
+);
+ALTER TABLE public.connection_graph_versions ENABLE ROW LEVEL SECURITY;
+-- No policies: only the service role (the API) reads it
+
+CREATE OR REPLACE FUNCTION public.bump_connection_graph_versions(p_chat_guids text[], p_user_ids uuid[])
+RETURNS void
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  INSERT INTO connection_graph_versions (user_id)
+  SELECT DISTINCT user_id FROM (
+    SELECT gcp.user_id FROM group_chat_participants gcp WHERE gcp.chat_guid::text = ANY (p_chat_guids)
+    UNION
+    SELECT unnest(p_user_ids)
+  ) affected
+  WHERE user_id IS NOT NULL
+  ON CONFLICT (user_id) DO UPDATE
+    SET version = connection_graph_versions.version + 1, updated_at = now();
+$$;
+
+-- Participants: everyone in the chat sees the member join/leave
+CREATE OR REPLACE FUNCTION public.group_chat_participants_bump_graph()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM bump_connection_graph_versions(ARRAY[OLD.chat_guid::text], ARRAY[OLD.user_id]);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM bump_connection_graph_versions(ARRAY[NEW.chat_guid::text], ARRAY[NEW.user_id]);
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS bump_connection_graph ON public.group_chat_participants;
+CREATE TRIGGER bump_connection_graph
+  AFTER INSERT OR UPDATE OR DELETE ON public.group_chat_participants
+  FOR EACH ROW EXECUTE FUNCTION public.group_chat_participants_bump_graph();
+
+-- Chats: member count and display name are drawn
+CREATE OR REPLACE FUNCTION public.group_chats_bump_graph()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  IF TG_OP = 'UPDATE'
+     AND NEW.member_count IS NOT DISTINCT FROM OLD.member_count
+     AND NEW.display_name IS NOT DISTINCT FROM OLD.display_name THEN
+    RETURN NULL;
+  END IF;
+  PERFORM bump_connection_graph_versions(
+    ARRAY[COALESCE(NEW.chat_guid, OLD.chat_guid)::text], ARRAY[]::uuid[]
+  );
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS bump_connection_graph ON public.group_chats;
+CREATE TRIGGER bump_connection_graph
+  AFTER INSERT OR UPDATE OR DELETE ON public.group_chats
+  FOR EACH ROW EXECUTE FUNCTION public.group_chats_bump_graph();
+
+-- Users: names and phone numbers label the nodes of everyone sharing a chat
+CREATE OR REPLACE FUNCTION public.users_bump_graph()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  IF NEW.name IS NOT DISTINCT FROM OLD.name
+     AND NEW.phone_number IS NOT DISTINCT FROM OLD.phone_number THEN
+    RETURN NULL;
+  END IF;
+  PERFORM bump_connection_graph_versions(
+    ARRAY(SELECT chat_guid::text FROM group_chat_participants WHERE user_id = NEW.id),
+    ARRAY[NEW.id]
+  );
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS bump_connection_graph ON public.users;
+CREATE TRIGGER bump_connection_graph
+  AFTER UPDATE ON public.users
+  FOR EACH ROW EXECUTE FUNCTION public.users_bump_graph();
+
+-- 8b. Graph data for any user, with the version stamp read in the same
+--     snapshot. Service role only: the API authenticates the caller.
+CREATE OR REPLACE FUNCTION public.get_connection_graph_for(p_user_id uuid)
+RETURNS json
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  result json;
+BEGIN
+  WITH my_chats AS (
+    SELECT DISTINCT chat_guid
+    FROM group_chat_participants
+    WHERE user_id = p_user_id
+  ),
+  chat_info AS (
+    SELECT gc.chat_guid, gc.member_count, gc.display_name
+    FROM group_chats gc
+    JOIN my_chats mc ON gc.chat_guid = mc.chat_guid
+  ),
+  all_participants AS (
+    SELECT gcp.chat_guid, gcp.user_id
+    FROM group_chat_participants gcp
+    JOIN my_chats mc ON gcp.chat_guid = mc.chat_guid
+  ),
+  user_profiles AS (
+    SELECT DISTINCT u.id, u.name, u.phone_number
+    FROM users u
+    WHERE u.id = p_user_id OR u.id IN (SELECT DISTINCT user_id FROM all_participants)
+  )
+  SELECT json_build_object(
+    'version', COALESCE((SELECT version FROM connection_graph_versions WHERE user_id = p_user_id), 0),
+    'chats', (SELECT COALESCE(json_agg(row_to_json(ci)), '[]'::json) FROM chat_info ci),
+    'participants', (SELECT COALESCE(json_agg(row_to_json(ap)), '[]'::json) FROM all_participants ap),
+    'users', (SELECT COALESCE(json_agg(row_to_json(up)), '[]'::json) FROM user_profiles up)
+  ) INTO result;
+
+  RETURN result;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.get_connection_graph_for(uuid) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.bump_connection_graph_versions(text[], uuid[]) FROM PUBLIC, anon, authenticated;
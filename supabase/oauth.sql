@@ -0,0 +1,49 @@
+-- Franklink API – OAuth helper functions
+--
+-- Run this in the Supabase SQL editor for the project that owns your `users` table.
+-- Prerequisites: public.users table must exist (see dashboard.sql).
+-- These functions are called by the FastAPI backend with the service role key.
+
+-- ------------------------------------------------------------
+-- 1. Store Google credentials for /oauth/google/callback
+-- ------------------------------------------------------------
+--    One UPDATE that stores the credentials in gmail_authentication_access,
+--    strips every OAuth bookkeeping key from personal_facts (including the
+--    oauth_state* keys older deployments wrote) and records the connected
+--    email there. Returns true if the user exists, null otherwise.
+CREATE OR REPLACE FUNCTION public.complete_google_oauth(
+  p_user_id uuid,
+  p_credentials jsonb,
+  p_email text
+)
+RETURNS boolean
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  UPDATE public.users
+     SET gmail_authentication_access = p_credentials,
+         updated_at = now(),
+         personal_facts = (
+           COALESCE(personal_facts, '{}'::jsonb) - ARRAY[
+             'oauth_state',
+             'oauth_state_created_at',
+             'oauth_scopes',
+             'google_oauth_token',
+             'google_oauth_refresh_token',
+             'google_oauth_completed'
+           ]
+         ) || jsonb_build_object('google_oauth_email', p_email)
+   WHERE id = p_user_id
+  RETURNING true;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.complete_google_oauth(uuid, jsonb, text) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.complete_google_oauth(uuid, jsonb, text) TO service_role;
+
+-- ------------------------------------------------------------
+-- 2. Cleanup
+-- ------------------------------------------------------------
+--    OAuth state is now a signed token verified by the API itself, so the
+--    state is no longer stored in personal_facts.
+DROP FUNCTION IF EXISTS public.set_oauth_state(uuid, text, jsonb);